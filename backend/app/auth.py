@@ -7,7 +7,10 @@ from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.cache import content_cache
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
@@ -46,9 +49,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
     """Authenticate a user by username and password."""
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
     if not user:
         return None
     if not verify_password(password, user.hashed_password):
@@ -58,9 +61,27 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     return user
 
 
+def load_principal(db: Session, username: str) -> Optional[dict]:
+    """
+    Load the columns of a user needed to authorize requests (no password hash).
+    Takes a sync Session; get_current_user calls it through run_sync().
+
+    Returns:
+        Column values keyed by name, or None if the user does not exist
+    """
+    user = db.scalar(select(User).where(User.username == username))
+    if user is None:
+        return None
+    return {
+        column.name: getattr(user, column.name)
+        for column in User.__table__.columns
+        if column.name != "hashed_password"
+    }
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get the current authenticated user from JWT token."""
     credentials_exception = HTTPException(
@@ -76,9 +97,16 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+    # Principals are cached briefly so admin requests skip the user lookup
+    principal = (await content_cache.aget_or_load(
+        "users",
+        {"username": username},
+        lambda: db.run_sync(load_principal, username),
+        ttl=settings.AUTH_CACHE_TTL_SECONDS
+    )).value
+    if principal is None:
         raise credentials_exception
+    user = User(**principal)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
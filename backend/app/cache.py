@@ -0,0 +1,451 @@
+"""
+Read-through cache for public content, auth principals and page bundles.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.cache_backends import CacheBackend, MemoryBackend, create_backend
+from app.config import settings
+from app.database import async_engine
+from app.models.about import AboutContent
+from app.models.blog import BlogPost
+from app.models.carousel import CarouselSlide
+from app.models.contact import ContactInfo
+from app.models.content_version import ContentVersion
+from app.models.faq import FAQ
+from app.models.license import License
+from app.models.partner import Partner
+from app.models.portfolio import PortfolioProject
+from app.models.service import Service
+from app.models.statistic import Statistic
+from app.models.user import User
+
+# Model -> cache namespace its writes invalidate
+CONTENT_MODELS: Dict[type, str] = {
+    CarouselSlide: "carousel",
+    Service: "services",
+    PortfolioProject: "portfolio",
+    BlogPost: "blog",
+    AboutContent: "about",
+    Partner: "partners",
+    License: "licenses",
+    FAQ: "faqs",
+    Statistic: "statistics",
+    ContactInfo: "contact_info",
+    User: "users",
+}
+
+
+class ContentVersions:
+    """
+    Cross-worker generation counters stored in the content_versions table.
+
+    Every write to a content model bumps its namespace's row in the same
+    transaction (see record_content_writes), and every worker polls the
+    table for versions that moved since it last looked, so a write handled
+    by one uvicorn worker invalidates all of them.
+    """
+
+    async def read(self) -> Dict[str, int]:
+        """Return the current version of every namespace (from the primary, not a replica)."""
+        async with async_engine.connect() as conn:
+            rows = (await conn.execute(select(ContentVersion.namespace, ContentVersion.version))).all()
+        return {namespace: version for namespace, version in rows}
+
+    def bump(self, conn: Connection, *namespaces: str) -> None:
+        """Increment the version of each namespace within conn's transaction, creating rows as needed."""
+        dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+        # Sorted, so transactions bumping several namespaces lock rows in one order
+        statement = dialect.insert(ContentVersion).values(
+            [{"namespace": namespace, "version": 1} for namespace in sorted(namespaces)]
+        )
+        conn.execute(statement.on_conflict_do_update(
+            index_elements=[ContentVersion.namespace],
+            set_={"version": ContentVersion.version + 1, "updated_at": func.now()}
+        ))
+
+
+class CacheResult(NamedTuple):
+    """A value served from the cache, with its age and freshness."""
+    value: Any
+    age: float
+    stale: bool = False
+    # True when the value stands in for a failed database load
+    error: bool = False
+
+
+# Seconds a failed backend is bypassed before it is tried again
+BACKEND_RETRY_INTERVAL = 5.0
+
+# Floor for check_interval, so a zero setting doesn't poll in a busy loop
+MIN_CHECK_INTERVAL = 0.1
+
+# Stored per key: (value, ((tag, version), ...), stored_at wall-clock time)
+Record = Tuple[Any, Tuple[Tuple[str, int], ...], float]
+
+
+class ContentCache:
+    """
+    Read-through cache keyed by content namespace and query parameters.
+
+    Public GET handlers load their data through get_or_load(); admin write
+    handlers call invalidate() with the same namespace after committing.
+    Entries built from several namespaces (e.g. page bundles) list them as
+    tags and are dropped when any of them is invalidated. With a
+    ContentVersions source, writes committed by other workers are picked
+    up by watch_versions(), which runs sync() every check_interval seconds
+    in the background; lookups never wait on the database.
+
+    Storage is delegated to a CacheBackend (see app.cache_backends). Each
+    record carries the versions its tags had when it was loaded, and is
+    valid only while they are unchanged; with a shared backend (disk or
+    Redis) the tag versions are shared too, and ContentVersions isn't used.
+
+    Backend failures (a Redis outage, an unreadable record) are treated as
+    misses, so the database answers instead, and the backend is bypassed
+    for BACKEND_RETRY_INTERVAL seconds. Async callers reach a blocking
+    backend (disk, Redis) from a worker thread, never on the event loop.
+
+    Invalidated entries are kept as a last-known-good copy: they are never
+    served normally, but stand in when reloading fails (stale-if-error).
+    Valid entries older than fresh_seconds are still served while a single
+    background refresh runs (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        versions: Optional[ContentVersions] = None,
+        check_interval: float = 1.0,
+        fresh_seconds: float = 300.0,
+        ttl: Optional[float] = None
+    ):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.versions = versions
+        self.check_interval = check_interval
+        self.fresh_seconds = fresh_seconds
+        self.ttl = ttl
+        self._seen_versions: Dict[str, int] = {}
+        self._refreshing: Set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._listeners: List[Callable[..., None]] = []
+        self._lock = threading.Lock()
+        self._backend_failing = False
+        self._retry_at = 0.0
+        # Tag bumps not yet applied because the backend was failing
+        self._missed_bumps: Set[str] = set()
+
+    @staticmethod
+    def make_key(namespace: str, params: dict) -> str:
+        """Build a cache key from a namespace and query parameters."""
+        return f"{namespace}:{tuple(sorted(params.items()))!r}"
+
+    def _guarded(self, call: Callable[[], Any], default: Any = None) -> Any:
+        """
+        Run a backend call, or return default if the backend is failing.
+
+        Tag bumps missed during an outage are applied first, so entries
+        invalidated meanwhile aren't served once the backend is back (if
+        this process is still running by then).
+        """
+        if self._backend_failing and time.monotonic() < self._retry_at:
+            return default
+        try:
+            with self._lock:
+                missed = set(self._missed_bumps)
+            if missed:
+                self.backend.bump_tags(*missed)
+                with self._lock:
+                    self._missed_bumps -= missed
+            result = call()
+        except self.backend.errors as e:
+            if not self._backend_failing:
+                print(f"⚠ Warning: Content cache backend failed, bypassing it until it recovers: {e}")
+            self._backend_failing = True
+            self._retry_at = time.monotonic() + BACKEND_RETRY_INTERVAL
+            return default
+        self._backend_failing = False
+        return result
+
+    async def _off_loop(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Call function, in a worker thread if the backend blocks on I/O."""
+        if self.backend.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    def _is_current(self, record: Record) -> bool:
+        tag_versions = dict(record[1])
+        return self.backend.tag_versions(tag_versions) == tag_versions
+
+    def _tag_versions(self, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        """Current versions of tags, or None if the backend failed (the value then isn't stored)."""
+        return self._guarded(lambda: self.backend.tag_versions(sorted(set(tags))))
+
+    def _store(self, key: str, value: Any, tag_versions: Optional[Dict[str, int]], ttl: Optional[float]) -> None:
+        if tag_versions is None:
+            return
+        record = (value, tuple(sorted(tag_versions.items())), time.time())
+        self._guarded(lambda: self.backend.set(key, record, ttl if ttl is not None else self.ttl))
+
+    async def sync(self) -> None:
+        """Invalidate entries whose namespace was bumped by another worker."""
+        if self.versions is None:
+            return
+        try:
+            current = await self.versions.read()
+        except SQLAlchemyError:
+            # Keep serving what we have; the next check retries
+            return
+        with self._lock:
+            changed = [ns for ns, version in current.items() if self._seen_versions.get(ns) != version]
+            self._seen_versions.update(current)
+        if changed:
+            await self._off_loop(self.bump, *changed)
+
+    async def watch_versions(self) -> None:
+        """Run sync() every check_interval seconds until cancelled (the first run after one interval)."""
+        while True:
+            await asyncio.sleep(max(self.check_interval, MIN_CHECK_INTERVAL))
+            await self.sync()
+
+    def lookup(
+        self,
+        namespace: str,
+        params: dict,
+        refresh: Optional[Callable[[], Any]] = None,
+        ttl: Optional[float] = None
+    ) -> Optional[CacheResult]:
+        """
+        Return the valid cached value for namespace/params, or None on a miss.
+
+        Args:
+            namespace: Content namespace
+            params: Query parameters that shape the result
+            refresh: Callable reloading the value from a background thread;
+                it must open its own database session. Run once when the
+                entry is past its freshness window.
+            ttl: Expiry for the refreshed record (defaults to self.ttl)
+        """
+        key = self.make_key(namespace, params)
+        record = self._guarded(lambda: self.backend.get(key))
+        if record is None or not self._guarded(lambda: self._is_current(record), False):
+            return None
+        value, tag_versions, stored_at = record
+        age = max(time.time() - stored_at, 0.0)
+        stale = age >= self.fresh_seconds
+        if stale and refresh is not None:
+            with self._lock:
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._submit(key, [tag for tag, _ in tag_versions], refresh, ttl)
+        return CacheResult(value, age, stale)
+
+    async def alookup(
+        self,
+        namespace: str,
+        params: dict,
+        refresh: Optional[Callable[[], Any]] = None,
+        ttl: Optional[float] = None
+    ) -> Optional[CacheResult]:
+        """lookup() for async callers."""
+        return await self._off_loop(self.lookup, namespace, params, refresh, ttl)
+
+    def fallback(self, namespace: str, params: dict) -> Optional[CacheResult]:
+        """Return the last-known-good value for namespace/params, valid or not."""
+        key = self.make_key(namespace, params)
+        record = self._guarded(lambda: self.backend.get(key))
+        if record is None:
+            return None
+        value, _, stored_at = record
+        return CacheResult(value, max(time.time() - stored_at, 0.0), True, True)
+
+    async def afallback(self, namespace: str, params: dict) -> Optional[CacheResult]:
+        """fallback() for async callers."""
+        return await self._off_loop(self.fallback, namespace, params)
+
+    def get(self, namespace: str, params: dict) -> Optional[Any]:
+        """Return the cached value for namespace/params, or None on a miss."""
+        result = self.lookup(namespace, params)
+        return result.value if result is not None else None
+
+    def get_or_load(
+        self,
+        namespace: str,
+        params: dict,
+        loader: Callable[[], Any],
+        tags: Iterable[str] = (),
+        refresh: Optional[Callable[[], Any]] = None,
+        ttl: Optional[float] = None
+    ) -> CacheResult:
+        """
+        Return the cached value for namespace/params, calling loader on a miss.
+
+        If the loader raises a database error and a last-known-good copy
+        exists, that copy is returned with error=True instead.
+
+        Args:
+            namespace: Content namespace (usually the router name)
+            params: Query parameters that shape the result
+            loader: Callable producing the value from the database
+            tags: Additional namespaces whose invalidation drops this entry
+            refresh: Background reload callable (see lookup())
+            ttl: Seconds before the backend expires the entry
+                (defaults to settings.CACHE_TTL_SECONDS)
+
+        Returns:
+            CacheResult with the cached or freshly loaded value
+        """
+        result = self.lookup(namespace, params, refresh, ttl)
+        if result is not None:
+            return result
+
+        key = self.make_key(namespace, params)
+        # Versions are read before loading, so a write that lands while the
+        # loader runs leaves the stored record already invalid
+        tag_versions = self._tag_versions({*tags, namespace})
+
+        try:
+            value = loader()
+        except SQLAlchemyError:
+            result = self.fallback(namespace, params)
+            if result is None:
+                raise
+            return result
+
+        self._store(key, value, tag_versions, ttl)
+        return CacheResult(value, 0.0)
+
+    async def aget_or_load(
+        self,
+        namespace: str,
+        params: dict,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = (),
+        refresh: Optional[Callable[[], Any]] = None,
+        ttl: Optional[float] = None
+    ) -> CacheResult:
+        """Async variant of get_or_load() for loaders using an AsyncSession."""
+        result = await self.alookup(namespace, params, refresh, ttl)
+        if result is not None:
+            return result
+
+        key = self.make_key(namespace, params)
+        tag_versions = await self._off_loop(self._tag_versions, {*tags, namespace})
+
+        try:
+            value = await loader()
+        except SQLAlchemyError:
+            result = await self.afallback(namespace, params)
+            if result is None:
+                raise
+            return result
+
+        await self._off_loop(self._store, key, value, tag_versions, ttl)
+        return CacheResult(value, 0.0)
+
+    def _submit(self, key, tags, refresh, ttl) -> None:
+        """Run a background refresh (lock held)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        self._executor.submit(self._run_refresh, key, tags, refresh, ttl)
+
+    def _run_refresh(self, key, tags, refresh, ttl) -> None:
+        try:
+            tag_versions = self._tag_versions(tags)
+            self._store(key, refresh(), tag_versions, ttl)
+        except Exception:
+            # Keep serving the stale copy; a later request retries
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def bump(self, *namespaces: str) -> None:
+        """Invalidate the entries of the given namespaces without notifying listeners."""
+        # Queued, then applied by _guarded now or once a failing backend is back
+        with self._lock:
+            self._missed_bumps.update(namespaces)
+        self._guarded(lambda: None)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Invalidate every cached entry belonging to or tagged with the given namespaces.
+
+        Other workers learn of the write from content_versions or the shared
+        backend, which the write's own commit already updated (see
+        record_content_writes).
+        """
+        self.bump(*namespaces)
+        for listener in self._listeners:
+            listener(*namespaces)
+
+    def subscribe(self, listener: Callable[..., None]) -> None:
+        """Register a callback invoked with the namespaces of every invalidation."""
+        self._listeners.append(listener)
+
+    def clear(self) -> None:
+        """Drop all cached entries, including last-known-good copies."""
+        self.backend.clear()
+
+
+cache_backend = create_backend(settings.CACHE_BACKEND)
+content_cache = ContentCache(
+    backend=cache_backend,
+    # A shared backend's tag versions already reach every worker
+    versions=ContentVersions() if settings.CACHE_SHARED_VERSIONS and not cache_backend.shared else None,
+    check_interval=settings.CACHE_VERSION_CHECK_INTERVAL,
+    fresh_seconds=settings.CACHE_FRESH_SECONDS,
+    ttl=settings.CACHE_TTL_SECONDS
+)
+
+
+@event.listens_for(Session, "after_flush")
+def record_content_writes(session: Session, flush_context) -> None:
+    """
+    Note the namespaces a flush wrote, so writes made anywhere invalidate the cache.
+
+    With ContentVersions, their counters are bumped in the flush's own
+    transaction: they commit or roll back with the write, and a failed bump
+    fails the write instead of leaving other workers serving the old
+    content. Otherwise (shared backends, or CACHE_SHARED_VERSIONS off) the
+    backend's tags are bumped once the write commits. Either way scripts
+    writing through SessionLocal, which never call invalidate(), are
+    covered. Each namespace is bumped once per transaction.
+    """
+    written = {
+        CONTENT_MODELS[type(obj)]
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if type(obj) in CONTENT_MODELS and (obj not in session.dirty or session.is_modified(obj))
+    }
+    if not written:
+        return
+    if content_cache.versions is None:
+        session.info.setdefault("written_namespaces", set()).update(written)
+        return
+    bumped = session.info.setdefault("bumped_versions", set())
+    if written - bumped:
+        content_cache.versions.bump(session.connection(), *(written - bumped))
+        bumped |= written
+
+
+@event.listens_for(Session, "after_commit")
+def bump_committed_tags(session: Session) -> None:
+    """Invalidate the entries of namespaces the committed transaction wrote, if not done by content_versions."""
+    session.info.pop("bumped_versions", None)
+    namespaces = session.info.pop("written_namespaces", None)
+    if namespaces:
+        content_cache.bump(*namespaces)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_content_writes(session: Session) -> None:
+    session.info.pop("bumped_versions", None)
+    session.info.pop("written_namespaces", None)
@@ -0,0 +1,402 @@
+"""
+Storage backends for the content cache.
+
+Every backend stores opaque records under string keys with an optional TTL,
+and keeps a version counter per tag. ContentCache stamps each record with
+the versions of its tags and treats it as invalid once any of them moves,
+which gives tag-based invalidation on every backend (and across processes
+for the shared ones).
+
+Backends that store outside the process hold records as tagged JSON (see
+encode_record) rather than pickle, so write access to the cache file or the
+Redis server doesn't give code execution in the workers.
+"""
+import base64
+import fnmatch
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+
+# NamedTuple types records may contain, by name (see register_record_type)
+RECORD_TYPES: Dict[str, type] = {}
+
+
+def register_record_type(cls: type) -> type:
+    """Allow a NamedTuple type in records stored outside the process (usable as a decorator)."""
+    RECORD_TYPES[cls.__name__] = cls
+    return cls
+
+
+def pack(value: Any) -> Any:
+    """Convert a record to JSON-compatible values, tagging the types JSON lacks."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        return [pack(item) for item in value]
+    if isinstance(value, bytes):
+        return {"t": "bytes", "v": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        return {"t": "datetime", "v": value.isoformat()}
+    if isinstance(value, dict):
+        return {"t": "dict", "v": [[pack(key), pack(item)] for key, item in value.items()]}
+    if type(value) is tuple:
+        return {"t": "tuple", "v": [pack(item) for item in value]}
+    if isinstance(value, tuple) and RECORD_TYPES.get(type(value).__name__) is type(value):
+        return {"t": type(value).__name__, "v": [pack(item) for item in value]}
+    raise TypeError(f"Cannot store {type(value).__name__} in the cache")
+
+
+def unpack(value: Any) -> Any:
+    """Inverse of pack()."""
+    if isinstance(value, list):
+        return [unpack(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    tag, payload = value["t"], value["v"]
+    if tag == "bytes":
+        return base64.b64decode(payload)
+    if tag == "datetime":
+        return datetime.fromisoformat(payload)
+    if tag == "dict":
+        return {unpack(key): unpack(item) for key, item in payload}
+    if tag == "tuple":
+        return tuple(unpack(item) for item in payload)
+    return RECORD_TYPES[tag](*(unpack(item) for item in payload))
+
+
+def encode_record(record: Any) -> bytes:
+    """Serialize a record for a backend that stores bytes."""
+    return json.dumps(pack(record), separators=(",", ":")).encode("utf-8")
+
+
+def decode_record(raw: bytes) -> Any:
+    """
+    Deserialize a record stored by encode_record.
+
+    Returns None (a miss, overwritten on the next store) for bytes that
+    aren't a record, e.g. pickles from an older version.
+    """
+    try:
+        return unpack(json.loads(raw))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class CacheBackend:
+    """Interface implemented by every cache storage backend."""
+
+    # Whether every worker sees the same records and tag versions, so a
+    # bump_tags() by one needs no content_versions to reach the others
+    shared = False
+    # Whether calls wait on I/O, so async callers run them in a thread
+    blocking = False
+    # Exceptions meaning the storage is unavailable; callers treat them as a miss
+    errors: Tuple[type, ...] = ()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the record stored under key, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a record, expiring after ttl seconds if given."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a record."""
+        raise NotImplementedError
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Return the current version of each tag (0 if never bumped)."""
+        raise NotImplementedError
+
+    def bump_tags(self, *tags: str) -> None:
+        """Increment the version of each tag."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every record (tag versions are kept)."""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU backend (per worker)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._tags: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            return {tag: self._tags.get(tag, 0) for tag in tags}
+
+    def bump_tags(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend(CacheBackend):
+    """
+    On-disk backend shared by every worker on the host.
+
+    Records live in a small SQLite file in WAL mode, so concurrent workers
+    can read while one writes. Size is bounded by max_entries (oldest
+    first), enforced every evict_every writes.
+    """
+
+    shared = True
+    blocking = True
+    errors = (sqlite3.Error,)
+    evict_every = 32
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._writes = itertools.count(1)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, stored_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_stored_at ON cache_entries (stored_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and time.time() >= expires_at:
+            self.delete(key)
+            return None
+        return decode_record(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, stored_at) VALUES (?, ?, ?, ?)",
+            (key, encode_record(value), now + ttl if ttl else None, now)
+        )
+        if next(self._writes) % self.evict_every:
+            return
+        conn.execute(
+            "DELETE FROM cache_entries WHERE key IN ("
+            "SELECT key FROM cache_entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        placeholders = ",".join("?" * len(tags))
+        rows = self._conn().execute(
+            f"SELECT tag, version FROM cache_tags WHERE tag IN ({placeholders})", tags
+        ).fetchall()
+        versions = dict(rows)
+        return {tag: versions.get(tag, 0) for tag in tags}
+
+    def bump_tags(self, *tags: str) -> None:
+        conn = self._conn()
+        for tag in tags:
+            conn.execute(
+                "INSERT INTO cache_tags (tag, version) VALUES (?, 1) "
+                "ON CONFLICT(tag) DO UPDATE SET version = version + 1",
+                (tag,)
+            )
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache_entries")
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend for any Redis-protocol server, shared by every worker and node.
+
+    Eviction is left to the server's maxmemory-policy; records still get a TTL.
+    Pass shared=False for a client whose state is per process (FakeRedis),
+    and the client's exception types as errors.
+    """
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "geoline:", shared: bool = True, errors: Tuple[type, ...] = ()):
+        self.client = client
+        self.prefix = prefix
+        self.shared = shared
+        self.errors = errors
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}entry:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self._key(key))
+        return decode_record(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.client.set(
+            self._key(key),
+            encode_record(value),
+            px=int(ttl * 1000) if ttl else None
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        values = self.client.mget([self._tag(tag) for tag in tags])
+        return {tag: int(value) if value is not None else 0 for tag, value in zip(tags, values)}
+
+    def bump_tags(self, *tags: str) -> None:
+        for tag in tags:
+            self.client.incr(self._tag(tag))
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}entry:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class FakeRedis:
+    """
+    In-process stand-in implementing the Redis commands RedisBackend uses.
+
+    Lets the Redis code path run locally and in development without a server
+    (CACHE_BACKEND=fakeredis). State is per process.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name: str) -> Optional[bytes]:
+        item = self._data.get(name)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and time.time() >= expires_at:
+            del self._data[name]
+            return None
+        return value
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(name)
+
+    def mget(self, names: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._live(name) for name in names]
+
+    def set(self, name: str, value: Any, px: Optional[int] = None) -> bool:
+        if not isinstance(value, bytes):
+            value = str(value).encode("utf-8")
+        with self._lock:
+            self._data[name] = (value, time.time() + px / 1000 if px else None)
+        return True
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            value = int(self._live(name) or 0) + 1
+            expires_at = self._data[name][1] if name in self._data else None
+            self._data[name] = (str(value).encode("utf-8"), expires_at)
+            return value
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            names = [name for name in self._data if fnmatch.fnmatchcase(name, match)]
+        yield from names
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+def create_backend(name: str) -> CacheBackend:
+    """
+    Create the cache backend selected by settings.CACHE_BACKEND.
+
+    Args:
+        name: One of "memory", "disk", "redis" or "fakeredis"
+
+    Raises:
+        ValueError: If the backend name is unknown
+        RuntimeError: If the redis client library is not installed
+    """
+    if name == "memory":
+        return MemoryBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    if name == "disk":
+        return DiskBackend(settings.CACHE_DISK_PATH, max_entries=settings.CACHE_MAX_ENTRIES)
+    if name == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        client = redis.Redis.from_url(
+            settings.CACHE_REDIS_URL,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT
+        )
+        return RedisBackend(client, prefix=settings.CACHE_KEY_PREFIX, errors=(redis.RedisError,))
+    if name == "fakeredis":
+        return RedisBackend(FakeRedis(), prefix=settings.CACHE_KEY_PREFIX, shared=False)
+    raise ValueError(f"Unknown CACHE_BACKEND: {name}")
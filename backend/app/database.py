@@ -1,32 +1,289 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Asyncio drivers for the sync drivers in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
 
-# Create session factory
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """Pragmas of the SQLite engine profile, skipping any left empty in settings."""
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+    return {name: value for name, value in pragmas.items() if value not in ("", None)}
+
+
+def postgresql_connect_args(driver: str, read_only: bool = False) -> Dict[str, Any]:
+    """
+    Per-connection PostgreSQL settings in the form each driver expects.
+
+    Names the connection after the app (visible in pg_stat_activity), turns
+    off JIT compilation, which only slows down short OLTP queries, bounds
+    statement run time and makes replica sessions read-only.
+    """
+    server_settings = {"jit": "off"}
+    if settings.DB_STATEMENT_TIMEOUT:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT)
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    if driver == "asyncpg":
+        return {"server_settings": {"application_name": settings.DB_APPLICATION_NAME, **server_settings}}
+    options = " ".join(f"-c {name}={value}" for name, value in server_settings.items())
+    return {"application_name": settings.DB_APPLICATION_NAME, "options": options}
+
+
+def engine_options(url: str, read_only: bool = False) -> Dict[str, Any]:
+    """
+    Connection and pool options for an engine on the given URL.
+
+    In-memory SQLite shares one connection (StaticPool) so every session sees
+    the same database; file SQLite and server databases use a bounded queue
+    pool sized by DB_POOL_SIZE / DB_MAX_OVERFLOW. Server pools hand out the
+    most recently used connection first, so surplus connections sit idle
+    long enough to be recycled.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            return {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+        return {
+            "connect_args": {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000},
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+        }
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "pool_use_lifo": True,
+    }
+    if parsed.get_backend_name() == "postgresql":
+        options["connect_args"] = postgresql_connect_args(parsed.get_driver_name(), read_only)
+    return options
+
+
+def apply_engine_profile(engine: Engine, read_only: bool = False) -> None:
+    """
+    Run the SQLite profile pragmas on every new connection of an engine.
+
+    Read-only engines leave the journal mode to the writer and additionally
+    set query_only, so a stray write fails instead of taking the write lock.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas()
+    if read_only:
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def async_database_url(url: str) -> str:
+    """Return the asyncio-driver variant of a sync database URL."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def read_database_url() -> Optional[str]:
+    """
+    URL of the read-only engine used for public GET traffic.
+
+    Returns READ_DATABASE_URL if set, otherwise the SQLite database file
+    opened with mode=ro. None (reads share the main engine) for in-memory
+    SQLite or a server database without a configured replica.
+    """
+    if settings.READ_DATABASE_URL:
+        return settings.READ_DATABASE_URL
+    parsed = make_url(settings.DATABASE_URL)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    if parsed.database.startswith("file:"):
+        return None
+    return f"{parsed.drivername}:///file:{parsed.database}?mode=ro&uri=true"
+
+
+# Create database engine (sync: scripts, migrations, background jobs)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+apply_engine_profile(engine)
+
+# Create async engine (request handlers)
+ASYNC_DATABASE_URL = async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+apply_engine_profile(async_engine.sync_engine)
+
+# Create read-only async engine (public GET handlers)
+READ_DATABASE_URL = read_database_url()
+if READ_DATABASE_URL is not None:
+    ASYNC_READ_DATABASE_URL = async_database_url(READ_DATABASE_URL)
+    read_engine = create_async_engine(
+        ASYNC_READ_DATABASE_URL,
+        **{**engine_options(ASYNC_READ_DATABASE_URL, read_only=True), "pool_size": settings.READ_DB_POOL_SIZE}
+    )
+    apply_engine_profile(read_engine.sync_engine, read_only=True)
+else:
+    read_engine = async_engine
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def utcnow() -> datetime:
+    """
+    Current UTC time, used for updated_at columns.
+
+    Set in Python rather than by the database because SQLite's
+    CURRENT_TIMESTAMP has one-second resolution. The ETags in
+    app/utils/http_cache.py must change with each edit, even two edits
+    within the same second.
+    """
+    return datetime.now(timezone.utc)
+
+
+# Pool checkouts made while serving the current request, on any engine (see get_db)
+request_checkouts: ContextVar[Optional[List[int]]] = ContextVar("request_checkouts", default=None)
+
+
+def count_checkout(dbapi_connection, connection_record, connection_proxy):
+    """Count a pool checkout against the request being served, if any."""
+    checkouts = request_checkouts.get()
+    if checkouts is not None:
+        checkouts[0] += 1
+
+
+for counted_engine in {engine, async_engine.sync_engine, read_engine.sync_engine}:
+    event.listen(counted_engine, "checkout", count_checkout)
+
+
+class LazySession:
     """
-    Dependency function to get database session.
-    Yields database session and ensures it's closed after use.
+    Request-scoped stand-in for an AsyncSession.
+
+    The session is created on first attribute access, so requests answered
+    from the cache or rejected before reaching the database never build one.
+    It checks out a connection only when it first runs a statement, and
+    close() returns that connection to the pool right away (the session can
+    still be used afterwards).
     """
-    db = SessionLocal()
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: async_sessionmaker):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    @property
+    def created(self) -> bool:
+        """Whether the underlying session was ever created."""
+        return self._session is not None
+
+    async def close(self) -> None:
+        """Close the session if it was created, releasing its connection."""
+        if self._session is not None:
+            await self._session.close()
+
+
+class SessionStats:
+    """
+    Per-worker counts of request sessions by how far they got.
+
+    Connections are counted from pool checkouts on every engine during the
+    request, not only the request session's, so a checkout made elsewhere
+    (e.g. by the sync engine) still counts against the request.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.sessions_created = 0
+        self.connections_used = 0
+        self.pool_checkouts = 0
+
+    def record(self, db: LazySession, checkouts: int) -> None:
+        self.requests += 1
+        self.sessions_created += db.created
+        self.connections_used += checkouts > 0
+        self.pool_checkouts += checkouts
+
+    def snapshot(self) -> Dict[str, int]:
+        """Counts so far, including requests that never touched the pool."""
+        return {
+            "requests": self.requests,
+            "sessions_created": self.sessions_created,
+            "connections_used": self.connections_used,
+            "pool_checkouts": self.pool_checkouts,
+            "pool_untouched": self.requests - self.connections_used,
+        }
+
+
+session_stats = SessionStats()
+
+
+async def get_db():
+    """
+    Dependency function to get an async database session.
+    Yields a lazy session and ensures it's closed after use.
+    """
+    db = LazySession(AsyncSessionLocal)
+    checkouts = [0]
+    request_checkouts.set(checkouts)
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+        session_stats.record(db, checkouts[0])
 
+
+async def get_read_db():
+    """
+    Dependency function to get a read-only async database session.
+    Used by public GET endpoints so they never contend with write locks.
+    """
+    db = LazySession(ReadSessionLocal)
+    checkouts = [0]
+    request_checkouts.set(checkouts)
+    try:
+        yield db
+    finally:
+        await db.close()
+        session_stats.record(db, checkouts[0])
@@ -2,60 +2,23 @@
 Database initialization script.
 Creates all tables and initial admin user.
 """
-import sqlite3
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 import bcrypt
-from app.database import Base, engine, SessionLocal
+import app.cache  # noqa: F401 - its flush hooks invalidate cached content for the rows written here
+from app.database import SessionLocal
+from app.migrations import run_migrations
 from app.models.user import User
 from app.config import settings
-from pathlib import Path
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 
 
-def migrate_add_images_column():
-    """Add images column to services table if it doesn't exist."""
-    try:
-        # Get database path from DATABASE_URL
-        db_url = settings.DATABASE_URL
-        if db_url.startswith('sqlite:///'):
-            db_path = db_url.replace('sqlite:///', '')
-            # Handle relative paths
-            if not Path(db_path).is_absolute():
-                db_path = Path(__file__).parent.parent / db_path
-            db_path = str(db_path)
-        else:
-            return  # Only support SQLite for now
-        
-        if not Path(db_path).exists():
-            return  # Database doesn't exist yet, will be created by create_all
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if column already exists
-        cursor.execute("PRAGMA table_info(services)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'images' not in columns:
-            # Add the column
-            cursor.execute("ALTER TABLE services ADD COLUMN images TEXT")
-            conn.commit()
-            print("✓ Added 'images' column to services table")
-        
-        conn.close()
-    except Exception as e:
-        print(f"⚠ Warning: Could not migrate images column: {e}")
-
-
 def init_db():
-    """Initialize database: create tables and default admin user."""
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Run migrations for existing databases
-    migrate_add_images_column()
+    """Initialize database: create or upgrade the schema and default admin user."""
+    # Create tables, or apply pending migrations to an existing database
+    for name in run_migrations():
+        print(f"✓ Applied migration {name}")
     
     # Create default admin user
     db = SessionLocal()
@@ -0,0 +1,81 @@
+"""
+Create responsive image variants for images uploaded before variants existed.
+With --all, every image is redone (e.g. after changing IMAGE_VARIANT_WIDTHS
+or IMAGE_VARIANT_FORMATS) and the previous variant files are deleted.
+
+Usage: python -m app.image_variants [--all]
+"""
+import sys
+from typing import Dict, Optional
+from sqlalchemy import select
+from app.cache import content_cache
+from app.config import settings
+from app.database import SessionLocal
+from app.models.about import AboutContent
+from app.models.blog import BlogPost
+from app.models.carousel import CarouselSlide
+from app.models.license import License
+from app.models.partner import Partner
+from app.models.portfolio import PortfolioProject
+from app.models.service import Service
+from app.publish import publish
+from app.utils.file_upload import delete_image_variants, image_variants_json
+
+# Model -> content cache namespace
+IMAGE_MODELS = {
+    CarouselSlide: "carousel",
+    Service: "services",
+    PortfolioProject: "portfolio",
+    BlogPost: "blog",
+    AboutContent: "about",
+    Partner: "partners",
+    License: "licenses",
+}
+
+
+def generate_image_variants(redo: bool = False) -> int:
+    """
+    Create variants for every row with an image but no variants.
+
+    Args:
+        redo: Recreate the variants of every row, not only missing ones
+
+    Returns:
+        Number of rows updated
+    """
+    updated = 0
+    # Rows sharing a stored image (see app/uploads.py) share its variants
+    done: Dict[str, Optional[str]] = {}
+    db = SessionLocal()
+    try:
+        for model, namespace in IMAGE_MODELS.items():
+            query = select(model).where(model.image_path.is_not(None))
+            if not redo:
+                query = query.where(model.image_variants.is_(None))
+            changed = 0
+            for row in db.scalars(query).all():
+                if row.image_path not in done:
+                    # Same widths and formats give the same file names, so delete first
+                    delete_image_variants(row.image_variants)
+                    done[row.image_path] = image_variants_json(row.image_path)
+                variants = done[row.image_path]
+                if variants is None and row.image_variants is None:
+                    continue
+                row.image_variants = variants
+                db.commit()
+                changed += 1
+            if changed:
+                content_cache.invalidate(namespace)
+                print(f"✓ {namespace}: {changed} images")
+            updated += changed
+    finally:
+        db.close()
+    return updated
+
+
+if __name__ == "__main__":
+    print("Creating image variants...")
+    count = generate_image_variants(redo="--all" in sys.argv)
+    if count and settings.PUBLISH_ON_WRITE:
+        publish()
+    print(f"Updated {count} images")
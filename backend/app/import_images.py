@@ -2,9 +2,11 @@
 Script to import existing images from img/ directory into the database.
 """
 import os
-import shutil
 from pathlib import Path
+from typing import Optional
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+import app.cache  # noqa: F401 - its flush hooks invalidate cached content for the rows written here
 from app.database import SessionLocal
 from app.models.carousel import CarouselSlide
 from app.models.service import Service
@@ -13,6 +15,8 @@ from app.models.blog import BlogPost
 from app.models.partner import Partner
 from app.models.license import License
 from app.config import settings
+from app.uploads import blob_path
+from app.utils.file_upload import file_digest, store_image_file
 
 # Base directory paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -20,15 +24,20 @@ IMG_DIR = PROJECT_ROOT / "img"
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 
 
-def copy_image_to_uploads(source_path: Path, subdirectory: str) -> str:
-    """Copy image to uploads directory and return relative path."""
-    upload_subdir = UPLOAD_DIR / subdirectory
-    upload_subdir.mkdir(parents=True, exist_ok=True)
-    
-    dest_path = upload_subdir / source_path.name
-    shutil.copy2(source_path, dest_path)
-    
-    return f"{subdirectory}/{source_path.name}"
+def store_new_image(db: Session, model, img_path: Path) -> Optional[str]:
+    """
+    Store an image for a new row of model and return its relative path, or
+    None if a row already shows it (the same content, or the same file name
+    from before uploads were stored by content). Checking before storing
+    means skipped images leave no unreferenced blob.
+    """
+    shown = or_(
+        model.image_path.like(blob_path(file_digest(img_path), ".%")),
+        model.image_path.like(f"%{img_path.name}")
+    )
+    if db.query(model).filter(shown).first():
+        return None
+    return store_image_file(img_path)
 
 
 def import_carousel_images(db: Session):
@@ -46,12 +55,10 @@ def import_carousel_images(db: Session):
     for img_name, title, subtitle, btn_text, btn_link, order in carousel_images:
         img_path = IMG_DIR / img_name
         if img_path.exists():
-            # Check if already exists
-            existing = db.query(CarouselSlide).filter(CarouselSlide.image_path.like(f"%{img_name}")).first()
-            if existing:
+            upload_path = store_new_image(db, CarouselSlide, img_path)
+            if not upload_path:
                 continue
             
-            upload_path = copy_image_to_uploads(img_path, "carousel")
             slide = CarouselSlide(
                 title=title,
                 subtitle=subtitle,
@@ -86,11 +93,10 @@ def import_services(db: Session):
     for img_name, title, description, order in services:
         img_path = IMG_DIR / img_name
         if img_path.exists():
-            existing = db.query(Service).filter(Service.image_path.like(f"%{img_name}")).first()
-            if existing:
+            upload_path = store_new_image(db, Service, img_path)
+            if not upload_path:
                 continue
             
-            upload_path = copy_image_to_uploads(img_path, "services")
             service = Service(
                 title=title,
                 description=description,
@@ -120,11 +126,10 @@ def import_portfolio(db: Session):
     for img_name, title, description, status, order in projects:
         img_path = IMG_DIR / img_name
         if img_path.exists():
-            existing = db.query(PortfolioProject).filter(PortfolioProject.image_path.like(f"%{img_name}")).first()
-            if existing:
+            upload_path = store_new_image(db, PortfolioProject, img_path)
+            if not upload_path:
                 continue
             
-            upload_path = copy_image_to_uploads(img_path, "portfolio")
             project = PortfolioProject(
                 title=title,
                 description=description,
@@ -152,11 +157,10 @@ def import_blog_posts(db: Session):
     for img_name, title, excerpt, author, category, is_published in posts:
         img_path = IMG_DIR / img_name
         if img_path.exists():
-            existing = db.query(BlogPost).filter(BlogPost.image_path.like(f"%{img_name}")).first()
-            if existing:
+            upload_path = store_new_image(db, BlogPost, img_path)
+            if not upload_path:
                 continue
             
-            upload_path = copy_image_to_uploads(img_path, "blog")
             from datetime import datetime, timezone
             post = BlogPost(
                 title=title,
@@ -185,11 +189,10 @@ def import_partners(db: Session):
     for img_name, name, website_url, order in partners:
         img_path = IMG_DIR / img_name
         if img_path.exists():
-            existing = db.query(Partner).filter(Partner.image_path.like(f"%{img_name}")).first()
-            if existing:
+            upload_path = store_new_image(db, Partner, img_path)
+            if not upload_path:
                 continue
             
-            upload_path = copy_image_to_uploads(img_path, "partners")
             partner = Partner(
                 name=name,
                 image_path=upload_path,
@@ -215,11 +218,10 @@ def import_licenses(db: Session):
     for img_name, title, description, order in licenses:
         img_path = IMG_DIR / img_name
         if img_path.exists():
-            existing = db.query(License).filter(License.image_path.like(f"%{img_name}")).first()
-            if existing:
+            upload_path = store_new_image(db, License, img_path)
+            if not upload_path:
                 continue
             
-            upload_path = copy_image_to_uploads(img_path, "licenses")
             license = License(
                 title=title,
                 image_path=upload_path,
@@ -308,7 +310,7 @@ def import_about_content(db: Session):
     if about_img.exists():
         existing = db.query(AboutContent).first()
         if not existing:
-            upload_path = copy_image_to_uploads(about_img, "about")
+            upload_path = store_image_file(about_img)
             about = AboutContent(
                 title="25 İllik təcrübə",
                 subtitle="GeoLine-a xoş gəlmisiniz",
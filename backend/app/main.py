@@ -1,30 +1,82 @@
 """
 FastAPI application main file.
 """
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
-from app.database import engine, Base
 from app.config import settings
+from app.database import session_stats
+from app.cache import content_cache
+from app.migrations import run_migrations
+from app.processing import processing_pool
+from app.publish import publish_scheduler
+from app.utils.compression import CompressionMiddleware
+from app.utils.upload_limits import FORM_OVERHEAD, UploadLimitMiddleware
+from app.warmup import readiness, warm_up
 
 # Import routers
 from app.routers import (
     auth, carousel, service, portfolio, blog, faq,
-    about, contact, statistic, partner, license
+    about, contact, statistic, partner, license, pages, media
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Create uploads directory if it doesn't exist
+# Create uploads and static publish directories if they don't exist
 Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+Path(settings.PUBLISH_DIR).mkdir(parents=True, exist_ok=True)
+
+# Republish static JSON after every admin write
+if settings.PUBLISH_ON_WRITE:
+    content_cache.subscribe(publish_scheduler.schedule)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup work that touches the database, run once per worker before serving."""
+    # Create or upgrade the database schema (a no-op once it is current).
+    # Workers starting together take turns on the migration lock, so only
+    # the first applies anything and the rest find the schema current.
+    run_migrations()
+
+    # Pick up content written by other workers (first check before warmup fills the cache)
+    versions_task = None
+    if content_cache.versions is not None:
+        await content_cache.sync()
+        versions_task = asyncio.create_task(content_cache.watch_versions())
+
+    # Fill the content cache in the background; /health is 503 until done
+    warmup_task = None
+    if settings.WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(warm_up(app))
+    else:
+        readiness.ready = True
+    yield
+    for task in (warmup_task, versions_task):
+        if task is not None:
+            task.cancel()
+    processing_pool.shutdown()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="GeoLine CMS API",
     description="Content Management System API for GeoLine Engineering Website",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Refuse oversized request bodies before they are read (added first so CORS
+# headers still reach the 413). Service create and /video take a video plus
+# an image; upload-images takes up to MAX_UPLOAD_FILES images.
+app.add_middleware(
+    UploadLimitMiddleware,
+    default_limit=settings.MAX_UPLOAD_SIZE + FORM_OVERHEAD,
+    limits=[
+        (r"/api/services(/\d+/video)?", settings.MAX_VIDEO_UPLOAD_SIZE + settings.MAX_UPLOAD_SIZE + FORM_OVERHEAD),
+        (r"/api/services/upload-images", settings.MAX_UPLOAD_SIZE * settings.MAX_UPLOAD_FILES + FORM_OVERHEAD),
+    ],
 )
 
 # Configure CORS
@@ -36,9 +88,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress API responses (cached collections arrive already compressed)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Mount static files for uploaded images
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
+# Mount published static JSON (see app/publish.py)
+app.mount("/static", StaticFiles(directory=settings.PUBLISH_DIR), name="static")
+
 # Register routers
 app.include_router(auth.router)
 app.include_router(carousel.router)
@@ -51,6 +109,8 @@ app.include_router(contact.router)
 app.include_router(statistic.router)
 app.include_router(partner.router)
 app.include_router(license.router)
+app.include_router(pages.router)
+app.include_router(media.router)
 
 
 @app.get("/")
@@ -66,7 +126,18 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+async def health_check(response: Response):
+    """
+    Health check endpoint (503 until the startup cache warm-up has finished).
+    Also reports how many requests this worker answered without a database connection
+    and the media processing pool's queue and per-stage timings.
+    """
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    return {
+        "status": "healthy",
+        "db_sessions": session_stats.snapshot(),
+        "processing": processing_pool.snapshot()
+    }
 
@@ -0,0 +1,163 @@
+"""
+Bounded on-disk cache of rendered media (see app/routers/media.py).
+
+Rendered files live under MEDIA_CACHE_DIR, named by the hash of their cache
+key. A small SQLite index beside them records each file's size and when it
+was last served, shared by every worker on the host, so the total stays
+under MEDIA_CACHE_MAX_BYTES by deleting the least recently used files.
+
+Lookups return the file's bytes rather than its path, so eviction by
+another request can't remove a file between lookup and response.
+Concurrent requests for the same key in one worker share a single render.
+Workers don't coordinate renders; if two render the same key at once, both
+write to temporary files and the last rename wins.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+from app.config import settings
+
+# A hit refreshes last_used at most this often, so hot files don't write on every request
+TOUCH_INTERVAL = 60.0
+# Eviction frees down to this fraction of the budget, so it doesn't run on every insert
+EVICT_TO = 0.9
+
+
+class MediaCache:
+    """Rendered files on disk with a shared LRU index and a byte budget."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._ready = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.directory / "index.db"), timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._ready:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS media_files "
+                    "(key TEXT PRIMARY KEY, name TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_media_files_last_used ON media_files (last_used)")
+                self._ready = True
+            self._local.conn = conn
+        return conn
+
+    def path_for(self, key: str, extension: str) -> Path:
+        """Location of a rendered file (two-level fan-out keeps directories small)."""
+        return self.directory / key[:2] / f"{key}{extension}"
+
+    def get(self, key: str, extension: str) -> Optional[bytes]:
+        """Return the cached file's contents for key, or None."""
+        try:
+            data = self.path_for(key, extension).read_bytes()
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        self._conn().execute(
+            "UPDATE media_files SET last_used = ? WHERE key = ? AND last_used < ?",
+            (now, key, now - TOUCH_INTERVAL)
+        )
+        return data
+
+    def store(self, key: str, extension: str, tmp_path: Path) -> bytes:
+        """
+        Move a rendered temporary file into place and record it.
+
+        Args:
+            key: Cache key (hex digest)
+            extension: File extension including the dot
+            tmp_path: The rendered file
+
+        Returns:
+            Contents of the rendered file
+        """
+        path = self.path_for(key, extension)
+        data = tmp_path.read_bytes()
+        os.replace(tmp_path, path)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO media_files (key, name, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, str(path.relative_to(self.directory)), len(data), time.time())
+        )
+        self.evict(keep=key)
+        return data
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Delete least recently used files while the total exceeds the budget.
+
+        Args:
+            keep: Key never to evict (the file that was just rendered)
+
+        Returns:
+            Bytes freed
+        """
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM media_files").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        freed = 0
+        target = total - self.max_bytes * EVICT_TO
+        for key, name, size in conn.execute("SELECT key, name, size FROM media_files ORDER BY last_used").fetchall():
+            if freed >= target:
+                break
+            if key == keep:
+                continue
+            (self.directory / name).unlink(missing_ok=True)
+            conn.execute("DELETE FROM media_files WHERE key = ?", (key,))
+            freed += size
+        return freed
+
+    async def _render(self, key: str, extension: str, render: Callable[[Path], Awaitable[None]]) -> bytes:
+        path = self.path_for(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            await render(tmp_path)
+            return await asyncio.to_thread(self.store, key, extension, tmp_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    async def get_or_render(self, key: str, extension: str, render: Callable[[Path], Awaitable[None]]) -> bytes:
+        """
+        Return the cached file's contents for key, rendering it on a miss.
+
+        render writes the file to the temporary path it is given. Requests
+        for a key that is already being rendered in this worker wait for
+        that render instead of starting another one; a failed render is
+        raised to all of them.
+        """
+        data = await asyncio.to_thread(self.get, key, extension)
+        if data is not None:
+            return data
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(key, extension, render))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A client disconnecting mustn't cancel the render others are waiting on
+        return await asyncio.shield(pending)
+
+    def clear(self) -> None:
+        """Delete every cached file."""
+        conn = self._conn()
+        for (name,) in conn.execute("SELECT name FROM media_files").fetchall():
+            (self.directory / name).unlink(missing_ok=True)
+        conn.execute("DELETE FROM media_files")
+
+
+media_cache = MediaCache(settings.MEDIA_CACHE_DIR, settings.MEDIA_CACHE_MAX_BYTES)
@@ -0,0 +1,241 @@
+"""
+Versioned schema migrations.
+
+Each module in this package named v<NNNN>_<description>.py defines
+upgrade(conn), which receives a Connection inside a transaction for schema
+changes, and/or backfill(engine) for data changes, which runs afterwards in
+bounded batches (see batched_update). Applied versions are recorded in the
+schema_migrations table, so every migration runs exactly once per database
+and startup only reads that table once the schema is current.
+
+A new database is created from the models (which already describe every
+migration) and recorded as current without running them. Migrations must
+be idempotent: a database predating schema_migrations runs all of them.
+
+Every worker calls run_migrations() at startup, so the runner holds an
+exclusive cross-process lock (see migration_lock) while it migrates, and
+re-reads the applied versions once it has the lock.
+
+Usage: python -m app.migrations
+"""
+import importlib
+import pkgutil
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Iterator, List, NamedTuple, Optional, Set
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, insert, select, text, update
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import ColumnElement
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.config import settings
+from app.database import Base, engine as default_engine
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+MODULE_PATTERN = re.compile(r"^v(\d{4})_(\w+)$")
+
+# Key of the PostgreSQL advisory lock held while migrating ("geol")
+ADVISORY_LOCK_KEY = 0x67656F6C
+
+metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+class Migration(NamedTuple):
+    """A migration module discovered in this package."""
+    version: int
+    name: str
+    upgrade: Optional[Callable[[Connection], None]] = None
+    backfill: Optional[Callable[[Engine], None]] = None
+
+
+def discover_migrations() -> List[Migration]:
+    """Return every migration in this package, ordered by version."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        match = MODULE_PATTERN.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(
+            int(match.group(1)),
+            module_info.name,
+            getattr(module, "upgrade", None),
+            getattr(module, "backfill", None)
+        ))
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    """Return the versions recorded in schema_migrations (empty if it doesn't exist)."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_migrations.name):
+            return set()
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def add_column(conn: Connection, table: str, column: str, ddl_type: str) -> None:
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    columns = {info["name"] for info in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f'ALTER TABLE {table} ADD COLUMN "{column}" {ddl_type}'))
+
+
+def batched_update(
+    engine: Engine,
+    table: Table,
+    values: dict,
+    where: ColumnElement,
+    batch_size: Optional[int] = None,
+    pause: Optional[float] = None
+) -> int:
+    """
+    Apply an UPDATE to the matching rows a batch at a time.
+
+    Each batch commits on its own, so the write lock is held for one batch
+    and other writers get in between. The update has to make rows stop
+    matching `where`, which also lets an interrupted backfill resume.
+
+    Args:
+        engine: Engine to run on
+        table: Table to update (with an id primary key)
+        values: Column values to set
+        where: Condition selecting the rows still to update
+        batch_size: Rows per transaction (default MIGRATION_BATCH_SIZE)
+        pause: Seconds to sleep between batches (default MIGRATION_BATCH_PAUSE)
+
+    Returns:
+        Number of rows updated
+    """
+    batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+    pause = settings.MIGRATION_BATCH_PAUSE if pause is None else pause
+    batch = select(table.c.id).where(where).limit(batch_size)
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(update(table).where(table.c.id.in_(batch)).values(values)).rowcount
+        total += updated
+        if updated < batch_size:
+            return total
+        time.sleep(pause)
+
+
+@contextmanager
+def sqlite_file_lock(database: str) -> Iterator[None]:
+    """Hold an exclusive flock on a lock file beside a SQLite database."""
+    lock_path = Path(f"{database}.migrate.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def postgresql_advisory_lock(engine: Engine) -> Iterator[None]:
+    """Hold a transaction-level advisory lock on a connection of its own."""
+    with engine.begin() as conn:
+        # Waiting for another process's migrations may outlast DB_STATEMENT_TIMEOUT
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        yield
+
+
+def migration_lock(engine: Engine) -> ContextManager[None]:
+    """
+    Lock that lets one process at a time migrate the database.
+
+    PostgreSQL uses an advisory lock. SQLite uses a flock on a file next to
+    the database, because migrations run on several connections and a
+    write transaction held by one of them would block the others. In-memory
+    databases are private to the process and need no lock.
+    """
+    url = make_url(str(engine.url))
+    if url.get_backend_name() == "postgresql":
+        return postgresql_advisory_lock(engine)
+    if url.get_backend_name() == "sqlite" and fcntl is not None:
+        database = url.database or ""
+        if database.startswith("file:"):
+            database = database[len("file:"):].split("?", 1)[0]
+        if database and database != ":memory:":
+            return sqlite_file_lock(database)
+    return nullcontext()
+
+
+def record(conn: Connection, migration: Migration) -> None:
+    conn.execute(insert(schema_migrations).values(version=migration.version, name=migration.name))
+
+
+def run_migrations(engine: Optional[Engine] = None) -> List[str]:
+    """
+    Bring the database schema up to date.
+
+    Returns without writing anything when every migration is recorded.
+    A database without any application tables is created from the models
+    and stamped with every version; otherwise pending migrations run in
+    order, each upgrade in its own transaction followed by its backfill.
+    Processes calling this at once wait for each other on migration_lock,
+    and those that find the work done return an empty list.
+
+    Returns:
+        Names of the migrations that were applied (or stamped)
+    """
+    engine = engine or default_engine
+    migrations = discover_migrations()
+    applied = applied_versions(engine)
+    if all(migration.version in applied for migration in migrations):
+        return []
+
+    with migration_lock(engine):
+        # Another process may have migrated while this one waited
+        applied = applied_versions(engine)
+        pending = [migration for migration in migrations if migration.version not in applied]
+        if not pending:
+            return []
+        return apply_migrations(engine, pending)
+
+
+def apply_migrations(engine: Engine, pending: List[Migration]) -> List[str]:
+    """Create or upgrade the schema with the lock held (see run_migrations)."""
+    metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        fresh = not set(inspect(conn).get_table_names()) & set(Base.metadata.tables)
+
+    if fresh:
+        with engine.begin() as conn:
+            Base.metadata.create_all(bind=conn)
+            for migration in pending:
+                record(conn, migration)
+        return [migration.name for migration in pending]
+
+    # Tables added to the models since this database was created
+    Base.metadata.create_all(bind=engine)
+    for migration in pending:
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                # Index builds may outlast DB_STATEMENT_TIMEOUT
+                conn.execute(text("SET LOCAL statement_timeout = 0"))
+            if migration.upgrade is not None:
+                migration.upgrade(conn)
+            if migration.backfill is None:
+                record(conn, migration)
+        if migration.backfill is not None:
+            migration.backfill(engine)
+            with engine.begin() as conn:
+                record(conn, migration)
+    return [migration.name for migration in pending]
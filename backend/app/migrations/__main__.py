@@ -0,0 +1,14 @@
+"""
+Apply pending schema migrations.
+
+Usage: python -m app.migrations
+"""
+from app.migrations import run_migrations
+
+if __name__ == "__main__":
+    print("Running schema migrations...")
+    applied = run_migrations()
+    for name in applied:
+        print(f"✓ Applied {name}")
+    if not applied:
+        print("✓ Schema is up to date")
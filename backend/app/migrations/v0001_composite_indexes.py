@@ -0,0 +1,30 @@
+"""
+Composite indexes matching the list endpoint query shapes: filter on
+is_active / is_published / status / is_read, order by order or created_at.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_carousel_slides_is_active_order", "carousel_slides", ("is_active", "order")),
+    ("ix_services_is_active_order", "services", ("is_active", "order")),
+    ("ix_portfolio_projects_is_active_order", "portfolio_projects", ("is_active", "order")),
+    ("ix_portfolio_projects_status_is_active_order", "portfolio_projects", ("status", "is_active", "order")),
+    ("ix_blog_posts_is_published_created_at", "blog_posts", ("is_published", "created_at")),
+    ("ix_blog_posts_created_at", "blog_posts", ("created_at",)),
+    ("ix_faqs_is_active_order", "faqs", ("is_active", "order")),
+    ("ix_about_content_is_active", "about_content", ("is_active",)),
+    ("ix_contact_info_is_active_order", "contact_info", ("is_active", "order")),
+    ("ix_contact_submissions_is_read_created_at", "contact_submissions", ("is_read", "created_at")),
+    ("ix_contact_submissions_created_at", "contact_submissions", ("created_at",)),
+    ("ix_statistics_is_active_order", "statistics", ("is_active", "order")),
+    ("ix_partners_is_active_order", "partners", ("is_active", "order")),
+    ("ix_licenses_is_active_order", "licenses", ("is_active", "order")),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for name, table, columns in INDEXES:
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column_list})"))
@@ -0,0 +1,10 @@
+"""
+Add the services.images column (JSON array of carousel image paths).
+Replaces the old migrate_add_images.py script.
+"""
+from sqlalchemy.engine import Connection
+from app.migrations import add_column
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "services", "images", "TEXT")
@@ -0,0 +1,10 @@
+"""
+Add the services.video_url column.
+Replaces the old migrate_add_video_url.py scripts.
+"""
+from sqlalchemy.engine import Connection
+from app.migrations import add_column
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "services", "video_url", "VARCHAR(500)")
@@ -0,0 +1,17 @@
+"""
+Backfill blog_posts.published_at for published posts that predate it,
+using the creation time.
+"""
+from sqlalchemy.engine import Engine
+from app.migrations import batched_update
+from app.models.blog import BlogPost
+
+
+def backfill(engine: Engine) -> None:
+    table = BlogPost.__table__
+    batched_update(
+        engine,
+        table,
+        {"published_at": table.c.created_at},
+        (table.c.is_published == True) & (table.c.published_at == None)
+    )
@@ -0,0 +1,26 @@
+"""
+Extend the created_at indexes used by keyset pagination with id, so the
+(created_at, id) ordering is served from the index on every backend
+(SQLite gets it from the rowid; PostgreSQL needs the column).
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# (old index, new index, table, columns)
+INDEXES = [
+    ("ix_blog_posts_is_published_created_at", "ix_blog_posts_is_published_created_at_id",
+     "blog_posts", ("is_published", "created_at", "id")),
+    ("ix_blog_posts_created_at", "ix_blog_posts_created_at_id",
+     "blog_posts", ("created_at", "id")),
+    ("ix_contact_submissions_is_read_created_at", "ix_contact_submissions_is_read_created_at_id",
+     "contact_submissions", ("is_read", "created_at", "id")),
+    ("ix_contact_submissions_created_at", "ix_contact_submissions_created_at_id",
+     "contact_submissions", ("created_at", "id")),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for old_name, name, table, columns in INDEXES:
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column_list})"))
+        conn.execute(text(f"DROP INDEX IF EXISTS {old_name}"))
@@ -0,0 +1,21 @@
+"""
+Add the image_variants column to every table with an uploaded image.
+Existing images get their variants from python -m app.image_variants.
+"""
+from sqlalchemy.engine import Connection
+from app.migrations import add_column
+
+TABLES = (
+    "carousel_slides",
+    "services",
+    "portfolio_projects",
+    "blog_posts",
+    "about_content",
+    "partners",
+    "licenses",
+)
+
+
+def upgrade(conn: Connection) -> None:
+    for table in TABLES:
+        add_column(conn, table, "image_variants", "TEXT")
@@ -0,0 +1,11 @@
+"""
+Add the upload_blobs and upload_refs tables for content-addressed uploads.
+Files uploaded before them keep their paths and are not tracked.
+"""
+from sqlalchemy.engine import Connection
+from app.models.upload import UploadBlob, UploadRef
+
+
+def upgrade(conn: Connection) -> None:
+    UploadBlob.__table__.create(conn, checkfirst=True)
+    UploadRef.__table__.create(conn, checkfirst=True)
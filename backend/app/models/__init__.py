@@ -12,6 +12,8 @@ from app.models.contact import ContactInfo, ContactSubmission
 from app.models.statistic import Statistic
 from app.models.partner import Partner
 from app.models.license import License
+from app.models.content_version import ContentVersion
+from app.models.upload import UploadBlob, UploadRef
 
 __all__ = [
     "User",
@@ -26,5 +28,8 @@ __all__ = [
     "Statistic",
     "Partner",
     "License",
+    "ContentVersion",
+    "UploadBlob",
+    "UploadRef",
 ]
 
@@ -1,22 +1,26 @@
 """
 About content model for about page.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class AboutContent(Base):
     """About content model for about page."""
     
     __tablename__ = "about_content"
+    __table_args__ = (
+        Index("ix_about_content_is_active", "is_active"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     subtitle = Column(String(200), nullable=True)
     description = Column(Text, nullable=True)
     image_path = Column(String(500), nullable=True)
+    image_variants = Column(Text, nullable=True)  # JSON of resized copies of image_path by format
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
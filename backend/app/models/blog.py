@@ -1,25 +1,30 @@
 """
 Blog post model for news/blog section.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class BlogPost(Base):
     """Blog post model for blog/news section."""
     
     __tablename__ = "blog_posts"
+    __table_args__ = (
+        Index("ix_blog_posts_is_published_created_at_id", "is_published", "created_at", "id"),
+        Index("ix_blog_posts_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     excerpt = Column(Text, nullable=True)
     content = Column(Text, nullable=True)
     image_path = Column(String(500), nullable=True)
+    image_variants = Column(Text, nullable=True)  # JSON of resized copies of image_path by format
     author = Column(String(100), nullable=True)
     category = Column(String(100), nullable=True)
     is_published = Column(Boolean, default=False)
     published_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
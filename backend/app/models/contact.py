@@ -1,15 +1,18 @@
 """
 Contact models for contact information and submissions.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class ContactInfo(Base):
     """Contact information model for top bar and footer."""
     
     __tablename__ = "contact_info"
+    __table_args__ = (
+        Index("ix_contact_info_is_active_order", "is_active", "order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String(50), nullable=False)  # 'phone', 'email', 'address', 'hours', 'whatsapp'
@@ -19,13 +22,17 @@ class ContactInfo(Base):
     order = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
 
 class ContactSubmission(Base):
     """Contact form submission model."""
     
     __tablename__ = "contact_submissions"
+    __table_args__ = (
+        Index("ix_contact_submissions_is_read_created_at_id", "is_read", "created_at", "id"),
+        Index("ix_contact_submissions_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
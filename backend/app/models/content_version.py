@@ -0,0 +1,16 @@
+"""
+Content version model for cross-worker cache invalidation.
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ContentVersion(Base):
+    """Generation counter per content namespace, bumped on every admin write."""
+    
+    __tablename__ = "content_versions"
+    
+    namespace = Column(String(100), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
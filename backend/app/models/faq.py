@@ -1,15 +1,18 @@
 """
 FAQ model for frequently asked questions.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class FAQ(Base):
     """FAQ model for frequently asked questions section."""
     
     __tablename__ = "faqs"
+    __table_args__ = (
+        Index("ix_faqs_is_active_order", "is_active", "order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     question = Column(String(500), nullable=False)
@@ -17,5 +20,5 @@ class FAQ(Base):
     order = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
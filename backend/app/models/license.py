@@ -1,22 +1,26 @@
 """
 License model for licenses/certifications page.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class License(Base):
     """License model for licenses/certifications page."""
     
     __tablename__ = "licenses"
+    __table_args__ = (
+        Index("ix_licenses_is_active_order", "is_active", "order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     image_path = Column(String(500), nullable=False)
+    image_variants = Column(Text, nullable=True)  # JSON of resized copies of image_path by format
     description = Column(String(500), nullable=True)
     order = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
@@ -1,10 +1,10 @@
 """
 Portfolio project model for projects showcase.
 """
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, Index
 from sqlalchemy.sql import func
 import enum
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class ProjectStatus(str, enum.Enum):
@@ -18,14 +18,19 @@ class PortfolioProject(Base):
     """Portfolio project model for projects page."""
     
     __tablename__ = "portfolio_projects"
+    __table_args__ = (
+        Index("ix_portfolio_projects_is_active_order", "is_active", "order"),
+        Index("ix_portfolio_projects_status_is_active_order", "status", "is_active", "order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     image_path = Column(String(500), nullable=False)
+    image_variants = Column(Text, nullable=True)  # JSON of resized copies of image_path by format
     status = Column(Enum(ProjectStatus), nullable=False, default=ProjectStatus.FUTURE)
     order = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
@@ -1,15 +1,18 @@
 """
 Statistic model for homepage statistics/facts section.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Statistic(Base):
     """Statistic model for homepage facts/statistics section."""
     
     __tablename__ = "statistics"
+    __table_args__ = (
+        Index("ix_statistics_is_active_order", "is_active", "order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     label = Column(String(200), nullable=False)
@@ -18,5 +21,5 @@ class Statistic(Base):
     order = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
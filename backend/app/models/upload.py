@@ -0,0 +1,31 @@
+"""
+Upload blob and reference models for content-addressed upload storage.
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class UploadBlob(Base):
+    """A stored upload, one per distinct content (see app/uploads.py)."""
+    
+    __tablename__ = "upload_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)  # Of the bytes as uploaded
+    path = Column(String(500), unique=True, nullable=False)
+    size = Column(Integer, nullable=False)
+    image_variants = Column(Text, nullable=True)  # Reused by every row showing this image
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class UploadRef(Base):
+    """A row that points at a blob."""
+    
+    __tablename__ = "upload_refs"
+    __table_args__ = (
+        Index("ix_upload_refs_row", "table_name", "row_id"),
+    )
+    
+    blob_path = Column(String(500), primary_key=True)
+    table_name = Column(String(100), primary_key=True)
+    row_id = Column(Integer, primary_key=True)
@@ -0,0 +1,162 @@
+"""
+Process pool for CPU-bound media work (image re-encoding, variants,
+/media renders and video thumbnails).
+
+Pillow and OpenCV hold the GIL for most of a decode or encode, so running
+them on the event loop, or even in a thread, stalls every other request on
+the worker. Jobs run in PROCESS_POOL_WORKERS child processes instead (0 runs
+them in a thread, for development). At most PROCESS_POOL_MAX_QUEUE jobs may
+be queued or running per worker; beyond that, and after PROCESS_POOL_TIMEOUT
+seconds, requests fail fast with 503 rather than piling up. Per-stage
+counts and queue/run times are reported on /health.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from app.config import settings
+
+
+def timed_call(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    """Run fn(*args) and return its result with the seconds it took (runs in the child)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class StageStats:
+    """Counts and timings of one kind of job."""
+
+    def __init__(self):
+        self.jobs = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.queue_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        completed = max(self.completed, 1)
+        return {
+            "jobs": self.jobs,
+            "completed": self.completed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_queue_ms": round(self.queue_seconds / completed * 1000, 1),
+            "avg_run_ms": round(self.run_seconds / completed * 1000, 1),
+            "max_run_ms": round(self.max_run_seconds * 1000, 1),
+        }
+
+
+class ProcessingPool:
+    """Bounded, timed dispatch of CPU-bound jobs to a process pool."""
+
+    def __init__(self, workers: int, max_queue: int, timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.pending = 0
+        self.stats: Dict[str, StageStats] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # spawn: forking a worker that has threads and open connections isn't safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _finished(self, _future: asyncio.Future) -> None:
+        self.pending -= 1
+
+    async def run(self, stage: str, fn: Callable, *args: Any) -> Any:
+        """
+        Run fn(*args) in the pool and return its result.
+
+        fn and its arguments must be picklable (module-level functions).
+        Exceptions raised by fn are re-raised here.
+
+        Args:
+            stage: Name the job is counted under
+            fn: Function to run
+            args: Its arguments
+
+        Raises:
+            HTTPException: 503 if the queue is full, the job timed out
+                or a pool process died
+        """
+        stats = self.stats.setdefault(stage, StageStats())
+        if self.pending >= self.max_queue:
+            stats.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Media processing is busy, try again shortly",
+                headers={"Retry-After": "5"}
+            )
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        start = time.perf_counter()
+        if executor is None:
+            future = asyncio.ensure_future(asyncio.to_thread(timed_call, fn, args))
+        else:
+            future = loop.run_in_executor(executor, timed_call, fn, args)
+        # Counted until the job really ends, even if this request stops waiting for it
+        self.pending += 1
+        future.add_done_callback(self._finished)
+        stats.jobs += 1
+
+        try:
+            result, run_seconds = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Media processing took longer than {self.timeout:g} seconds"
+            )
+        except BrokenProcessPool:
+            stats.errors += 1
+            self._executor = None
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Media processing failed, try again"
+            )
+        except Exception:
+            stats.errors += 1
+            raise
+
+        stats.completed += 1
+        stats.run_seconds += run_seconds
+        stats.max_run_seconds = max(stats.max_run_seconds, run_seconds)
+        stats.queue_seconds += max(time.perf_counter() - start - run_seconds, 0.0)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool settings, jobs in flight and per-stage stats."""
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "stages": {stage: stats.snapshot() for stage, stats in self.stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool processes without waiting for queued jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+processing_pool = ProcessingPool(
+    settings.PROCESS_POOL_WORKERS,
+    settings.PROCESS_POOL_MAX_QUEUE,
+    settings.PROCESS_POOL_TIMEOUT
+)
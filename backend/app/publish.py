@@ -0,0 +1,170 @@
+"""
+Static publish step.
+Writes every public collection and page bundle to versioned JSON files
+(with precompressed .gz/.br siblings) so a web server can serve them
+without touching Python.
+
+Usage: python -m app.publish
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.routers.pages import PAGES, SECTION_LOADERS, build_page, load_page
+from app.utils.serialization import encode_json
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is listed in requirements.txt
+    brotli = None
+
+# Older versions kept on disk so clients holding a previous manifest still resolve
+KEEP_VERSIONS = 2
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write data to path via a temporary file and rename."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_versioned(directory: Path, name: str, body: bytes) -> str:
+    """
+    Write body as <name>.<hash>.json plus .gz/.br siblings.
+
+    Compressed siblings are written first so they exist by the time the
+    .json file appears. Unchanged content keeps its existing file.
+
+    Returns:
+        File name of the versioned JSON file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1(body).hexdigest()[:12]
+    filename = f"{name}.{digest}.json"
+    path = directory / filename
+    if path.exists():
+        # Mark as current so prune_versions() keeps it
+        os.utime(path)
+        return filename
+
+    atomic_write(directory / f"{filename}.gz", gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        atomic_write(directory / f"{filename}.br", brotli.compress(body))
+    atomic_write(path, body)
+    return filename
+
+
+def prune_versions(directory: Path, name: str) -> None:
+    """Delete all but the newest KEEP_VERSIONS versions of a published file."""
+    versions = sorted(
+        directory.glob(f"{name}.*.json"),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+    for stale in versions[KEEP_VERSIONS:]:
+        for path in (stale, stale.with_name(stale.name + ".gz"), stale.with_name(stale.name + ".br")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def publish(db: Optional[Session] = None, output_dir: Optional[str] = None) -> Dict:
+    """
+    Publish all public collections and page bundles.
+
+    Args:
+        db: Database session (a new one is opened if omitted)
+        output_dir: Target directory (defaults to settings.PUBLISH_DIR)
+
+    Returns:
+        The manifest that was written
+    """
+    root = Path(output_dir or settings.PUBLISH_DIR)
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
+    try:
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "collections": {},
+            "pages": {},
+        }
+        for name, loader in SECTION_LOADERS.items():
+            filename = write_versioned(root / "collections", name, encode_json(loader(db)))
+            manifest["collections"][name] = f"collections/{filename}"
+        for page, sections in PAGES.items():
+            filename = write_versioned(root / "pages", page, build_page(load_page(db, sections)).data)
+            manifest["pages"][page] = f"pages/{filename}"
+    finally:
+        if owns_session:
+            db.close()
+
+    # Manifest goes last so it only ever points at complete files
+    atomic_write(root / "manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+    for name in manifest["collections"]:
+        prune_versions(root / "collections", name)
+    for page in manifest["pages"]:
+        prune_versions(root / "pages", page)
+    return manifest
+
+
+class PublishScheduler:
+    """
+    Runs publish() in a background thread after admin writes.
+
+    Bursts of writes within the debounce window are coalesced into one publish.
+    """
+
+    def __init__(self, debounce_seconds: float = 1.0):
+        self.debounce_seconds = debounce_seconds
+        self._pending = False
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def schedule(self, *namespaces: str) -> None:
+        """Request a publish (signature matches ContentCache listeners)."""
+        if not set(namespaces) & set(SECTION_LOADERS):
+            # e.g. "users": nothing published depends on it
+            return
+        with self._lock:
+            self._pending = True
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="static-publisher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.debounce_seconds)
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                self._pending = False
+            try:
+                publish()
+            except Exception as e:
+                print(f"⚠ Warning: Static publish failed: {e}")
+
+
+publish_scheduler = PublishScheduler(debounce_seconds=settings.PUBLISH_DEBOUNCE_SECONDS)
+
+
+if __name__ == "__main__":
+    print("Publishing static content...")
+    result = publish()
+    for section, path in {**result["collections"], **result["pages"]}.items():
+        print(f"✓ {section}: {path}")
+    print(f"Static content published to {settings.PUBLISH_DIR}")
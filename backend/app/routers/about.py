@@ -2,35 +2,61 @@
 About content router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.about import AboutContent
 from app.schemas.about import AboutContentCreate, AboutContentUpdate, AboutContentResponse
-from app.utils.file_upload import save_uploaded_file, delete_file
+from app.utils.file_upload import save_uploaded_file, create_image_variants, delete_image_variants, delete_file
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/about", tags=["about"])
 
 
 @router.get("", response_model=List[AboutContentResponse])
 async def get_about_content(
+    request: Request,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get about content (public endpoint)."""
-    query = db.query(AboutContent)
+    query = select(AboutContent)
     if active_only:
-        query = query.filter(AboutContent.is_active == True)
-    content = query.first()
-    return [content] if content else []
+        query = query.where(AboutContent.is_active == True)
+    
+    def load(session: Session, query):
+        content = session.scalars(query).first()
+        return [AboutContentResponse.model_validate(content)] if content else []
+    
+    return await cached_collection(
+        request,
+        db,
+        "about",
+        {"active_only": active_only},
+        query,
+        AboutContent,
+        load
+    )
 
 
 @router.get("/{content_id}", response_model=AboutContentResponse)
-async def get_about_content_by_id(content_id: int, db: Session = Depends(get_db)):
+async def get_about_content_by_id(
+    content_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single about content by ID."""
-    content = db.query(AboutContent).filter(AboutContent.id == content_id).first()
+    query = select(AboutContent).where(AboutContent.id == content_id)
+    not_modified = await conditional_item(request, response, db, query, AboutContent)
+    if not_modified:
+        return not_modified
+    content = await db.scalar(query)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -46,24 +72,28 @@ async def create_about_content(
     description: str = Form(None),
     is_active: bool = Form(True),
     image: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create about content (admin only)."""
     image_path = None
+    image_variants = None
     if image:
-        image_path = await save_uploaded_file(image, "about")
+        image_path = await save_uploaded_file(image)
+        image_variants = await create_image_variants(image_path)
     
     content = AboutContent(
         title=title,
         subtitle=subtitle,
         description=description,
         image_path=image_path,
+        image_variants=image_variants,
         is_active=is_active
     )
     db.add(content)
-    db.commit()
-    db.refresh(content)
+    await db.commit()
+    content_cache.invalidate("about")
+    await db.refresh(content)
     return content
 
 
@@ -71,11 +101,11 @@ async def create_about_content(
 async def update_about_content(
     content_id: int,
     content_update: AboutContentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update about content (admin only)."""
-    content = db.query(AboutContent).filter(AboutContent.id == content_id).first()
+    content = await db.get(AboutContent, content_id)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -85,9 +115,12 @@ async def update_about_content(
     update_data = content_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(content, field, value)
+    if "image_path" in update_data:
+        content.image_variants = await create_image_variants(content.image_path)
     
-    db.commit()
-    db.refresh(content)
+    await db.commit()
+    content_cache.invalidate("about")
+    await db.refresh(content)
     return content
 
 
@@ -95,11 +128,11 @@ async def update_about_content(
 async def update_about_content_image(
     content_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update about content image (admin only)."""
-    content = db.query(AboutContent).filter(AboutContent.id == content_id).first()
+    content = await db.get(AboutContent, content_id)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,21 +141,24 @@ async def update_about_content_image(
     
     if content.image_path:
         delete_file(content.image_path)
+        delete_image_variants(content.image_variants)
     
-    content.image_path = await save_uploaded_file(image, "about")
-    db.commit()
-    db.refresh(content)
+    content.image_path = await save_uploaded_file(image)
+    content.image_variants = await create_image_variants(content.image_path)
+    await db.commit()
+    content_cache.invalidate("about")
+    await db.refresh(content)
     return content
 
 
 @router.delete("/{content_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_about_content(
     content_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete about content (admin only)."""
-    content = db.query(AboutContent).filter(AboutContent.id == content_id).first()
+    content = await db.get(AboutContent, content_id)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,8 +167,10 @@ async def delete_about_content(
     
     if content.image_path:
         delete_file(content.image_path)
+        delete_image_variants(content.image_variants)
     
-    db.delete(content)
-    db.commit()
+    await db.delete(content)
+    await db.commit()
+    content_cache.invalidate("about")
     return None
 
@@ -1,41 +1,77 @@
 """
 Blog posts router for CRUD operations.
 """
-from typing import List
+from typing import List, Optional, Union
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.database import get_db
+from sqlalchemy import select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.blog import BlogPost
-from app.schemas.blog import BlogPostCreate, BlogPostUpdate, BlogPostResponse
-from app.utils.file_upload import save_uploaded_file, delete_file
+from app.schemas.blog import BlogPostCreate, BlogPostUpdate, BlogPostResponse, BlogPostPage
+from app.utils.file_upload import save_uploaded_file, create_image_variants, delete_image_variants, delete_file
+from app.utils.http_cache import cached_collection, conditional_item
+from app.utils.pagination import keyset_query, page_items
 
 router = APIRouter(prefix="/api/blog", tags=["blog"])
 
 
-@router.get("", response_model=List[BlogPostResponse])
+@router.get("", response_model=Union[List[BlogPostResponse], BlogPostPage])
 async def get_blog_posts(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     published_only: bool = False,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all blog posts (public endpoint)."""
-    query = db.query(BlogPost)
+    """
+    Get all blog posts, newest first (public endpoint).
+
+    Without a cursor the response is a plain list paged by skip. Passing
+    cursor (empty for the first page) returns {"items", "next_cursor"}
+    instead; following next_cursor costs the same on every page.
+    """
+    query = select(BlogPost)
     if published_only:
-        query = query.filter(BlogPost.is_published == True)
-    query = query.order_by(desc(BlogPost.created_at))
-    posts = query.offset(skip).limit(limit).all()
-    return posts
+        query = query.where(BlogPost.is_published == True)
+    
+    def load(session: Session, query):
+        page = keyset_query(query, BlogPost, session.get_bind().dialect.name, cursor, skip, limit)
+        posts, next_cursor = page_items(session.execute(page).all(), limit)
+        items = [BlogPostResponse.model_validate(post) for post in posts]
+        if cursor is None:
+            return items
+        return BlogPostPage(items=items, next_cursor=next_cursor)
+    
+    return await cached_collection(
+        request,
+        db,
+        "blog",
+        {"skip": skip, "limit": limit, "published_only": published_only, "cursor": cursor},
+        query,
+        BlogPost,
+        load
+    )
 
 
 @router.get("/{post_id}", response_model=BlogPostResponse)
-async def get_blog_post(post_id: int, db: Session = Depends(get_db)):
+async def get_blog_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single blog post by ID."""
-    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    query = select(BlogPost).where(BlogPost.id == post_id)
+    not_modified = await conditional_item(request, response, db, query, BlogPost)
+    if not_modified:
+        return not_modified
+    post = await db.scalar(query)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,13 +89,15 @@ async def create_blog_post(
     category: str = Form(None),
     is_published: bool = Form(False),
     image: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new blog post (admin only)."""
     image_path = None
+    image_variants = None
     if image:
-        image_path = await save_uploaded_file(image, "blog")
+        image_path = await save_uploaded_file(image)
+        image_variants = await create_image_variants(image_path)
     
     published_at = datetime.utcnow() if is_published else None
     
@@ -68,14 +106,16 @@ async def create_blog_post(
         excerpt=excerpt,
         content=content,
         image_path=image_path,
+        image_variants=image_variants,
         author=author,
         category=category,
         is_published=is_published,
         published_at=published_at
     )
     db.add(post)
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    content_cache.invalidate("blog")
+    await db.refresh(post)
     return post
 
 
@@ -83,11 +123,11 @@ async def create_blog_post(
 async def update_blog_post(
     post_id: int,
     post_update: BlogPostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a blog post (admin only)."""
-    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    post = await db.get(BlogPost, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,9 +142,12 @@ async def update_blog_post(
     
     for field, value in update_data.items():
         setattr(post, field, value)
+    if "image_path" in update_data:
+        post.image_variants = await create_image_variants(post.image_path)
     
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    content_cache.invalidate("blog")
+    await db.refresh(post)
     return post
 
 
@@ -112,11 +155,11 @@ async def update_blog_post(
 async def update_blog_post_image(
     post_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update blog post image (admin only)."""
-    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    post = await db.get(BlogPost, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,21 +168,24 @@ async def update_blog_post_image(
     
     if post.image_path:
         delete_file(post.image_path)
+        delete_image_variants(post.image_variants)
     
-    post.image_path = await save_uploaded_file(image, "blog")
-    db.commit()
-    db.refresh(post)
+    post.image_path = await save_uploaded_file(image)
+    post.image_variants = await create_image_variants(post.image_path)
+    await db.commit()
+    content_cache.invalidate("blog")
+    await db.refresh(post)
     return post
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_blog_post(
     post_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a blog post (admin only)."""
-    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    post = await db.get(BlogPost, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -148,8 +194,10 @@ async def delete_blog_post(
     
     if post.image_path:
         delete_file(post.image_path)
+        delete_image_variants(post.image_variants)
     
-    db.delete(post)
-    db.commit()
+    await db.delete(post)
+    await db.commit()
+    content_cache.invalidate("blog")
     return None
 
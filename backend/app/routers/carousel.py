@@ -2,39 +2,63 @@
 Carousel slides router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.carousel import CarouselSlide
 from app.schemas.carousel import CarouselSlideCreate, CarouselSlideUpdate, CarouselSlideResponse
-from app.utils.file_upload import save_uploaded_file, delete_file
+from app.utils.file_upload import save_uploaded_file, create_image_variants, delete_image_variants, delete_file
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/carousel", tags=["carousel"])
 
 
 @router.get("", response_model=List[CarouselSlideResponse])
 async def get_carousel_slides(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all carousel slides (public endpoint)."""
-    query = db.query(CarouselSlide)
+    query = select(CarouselSlide)
     if active_only:
-        query = query.filter(CarouselSlide.is_active == True)
-    query = query.order_by(asc(CarouselSlide.order))
-    slides = query.offset(skip).limit(limit).all()
-    return slides
+        query = query.where(CarouselSlide.is_active == True)
+    
+    def load(session: Session, query):
+        slides = session.scalars(query.order_by(asc(CarouselSlide.order)).offset(skip).limit(limit)).all()
+        return [CarouselSlideResponse.model_validate(slide) for slide in slides]
+    
+    return await cached_collection(
+        request,
+        db,
+        "carousel",
+        {"skip": skip, "limit": limit, "active_only": active_only},
+        query,
+        CarouselSlide,
+        load
+    )
 
 
 @router.get("/{slide_id}", response_model=CarouselSlideResponse)
-async def get_carousel_slide(slide_id: int, db: Session = Depends(get_db)):
+async def get_carousel_slide(
+    slide_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single carousel slide by ID."""
-    slide = db.query(CarouselSlide).filter(CarouselSlide.id == slide_id).first()
+    query = select(CarouselSlide).where(CarouselSlide.id == slide_id)
+    not_modified = await conditional_item(request, response, db, query, CarouselSlide)
+    if not_modified:
+        return not_modified
+    slide = await db.scalar(query)
     if not slide:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,25 +76,28 @@ async def create_carousel_slide(
     order: int = Form(0),
     is_active: bool = Form(True),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new carousel slide (admin only)."""
     # Save uploaded image
-    image_path = await save_uploaded_file(image, "carousel")
+    image_path = await save_uploaded_file(image)
+    image_variants = await create_image_variants(image_path)
     
     slide = CarouselSlide(
         title=title,
         subtitle=subtitle,
         image_path=image_path,
+        image_variants=image_variants,
         button_text=button_text,
         button_link=button_link,
         order=order,
         is_active=is_active
     )
     db.add(slide)
-    db.commit()
-    db.refresh(slide)
+    await db.commit()
+    content_cache.invalidate("carousel")
+    await db.refresh(slide)
     return slide
 
 
@@ -78,11 +105,11 @@ async def create_carousel_slide(
 async def update_carousel_slide(
     slide_id: int,
     slide_update: CarouselSlideUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a carousel slide (admin only)."""
-    slide = db.query(CarouselSlide).filter(CarouselSlide.id == slide_id).first()
+    slide = await db.get(CarouselSlide, slide_id)
     if not slide:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -92,9 +119,12 @@ async def update_carousel_slide(
     update_data = slide_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(slide, field, value)
+    if "image_path" in update_data:
+        slide.image_variants = await create_image_variants(slide.image_path)
     
-    db.commit()
-    db.refresh(slide)
+    await db.commit()
+    content_cache.invalidate("carousel")
+    await db.refresh(slide)
     return slide
 
 
@@ -102,11 +132,11 @@ async def update_carousel_slide(
 async def update_carousel_slide_image(
     slide_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update carousel slide image (admin only)."""
-    slide = db.query(CarouselSlide).filter(CarouselSlide.id == slide_id).first()
+    slide = await db.get(CarouselSlide, slide_id)
     if not slide:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,22 +146,25 @@ async def update_carousel_slide_image(
     # Delete old image
     if slide.image_path:
         delete_file(slide.image_path)
+        delete_image_variants(slide.image_variants)
     
     # Save new image
-    slide.image_path = await save_uploaded_file(image, "carousel")
-    db.commit()
-    db.refresh(slide)
+    slide.image_path = await save_uploaded_file(image)
+    slide.image_variants = await create_image_variants(slide.image_path)
+    await db.commit()
+    content_cache.invalidate("carousel")
+    await db.refresh(slide)
     return slide
 
 
 @router.delete("/{slide_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_carousel_slide(
     slide_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a carousel slide (admin only)."""
-    slide = db.query(CarouselSlide).filter(CarouselSlide.id == slide_id).first()
+    slide = await db.get(CarouselSlide, slide_id)
     if not slide:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -141,8 +174,10 @@ async def delete_carousel_slide(
     # Delete associated image
     if slide.image_path:
         delete_file(slide.image_path)
+        delete_image_variants(slide.image_variants)
     
-    db.delete(slide)
-    db.commit()
+    await db.delete(slide)
+    await db.commit()
+    content_cache.invalidate("carousel")
     return None
 
@@ -1,18 +1,22 @@
 """
 Contact router for contact info and form submissions.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.contact import ContactInfo, ContactSubmission
 from app.schemas.contact import (
     ContactInfoCreate, ContactInfoUpdate, ContactInfoResponse,
-    ContactSubmissionCreate, ContactSubmissionResponse
+    ContactSubmissionCreate, ContactSubmissionResponse, ContactSubmissionPage
 )
+from app.utils.http_cache import cached_collection, conditional_item
+from app.utils.pagination import keyset_query, page_items
 
 router = APIRouter(prefix="/api/contact", tags=["contact"])
 
@@ -20,22 +24,43 @@ router = APIRouter(prefix="/api/contact", tags=["contact"])
 # Contact Info Endpoints
 @router.get("/info", response_model=List[ContactInfoResponse])
 async def get_contact_info(
+    request: Request,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get contact information (public endpoint)."""
-    query = db.query(ContactInfo)
+    query = select(ContactInfo)
     if active_only:
-        query = query.filter(ContactInfo.is_active == True)
-    query = query.order_by(asc(ContactInfo.order))
-    info = query.all()
-    return info
+        query = query.where(ContactInfo.is_active == True)
+    
+    def load(session: Session, query):
+        info = session.scalars(query.order_by(asc(ContactInfo.order))).all()
+        return [ContactInfoResponse.model_validate(item) for item in info]
+    
+    return await cached_collection(
+        request,
+        db,
+        "contact_info",
+        {"active_only": active_only},
+        query,
+        ContactInfo,
+        load
+    )
 
 
 @router.get("/info/{info_id}", response_model=ContactInfoResponse)
-async def get_contact_info_by_id(info_id: int, db: Session = Depends(get_db)):
+async def get_contact_info_by_id(
+    info_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single contact info by ID."""
-    info = db.query(ContactInfo).filter(ContactInfo.id == info_id).first()
+    query = select(ContactInfo).where(ContactInfo.id == info_id)
+    not_modified = await conditional_item(request, response, db, query, ContactInfo)
+    if not_modified:
+        return not_modified
+    info = await db.scalar(query)
     if not info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -47,14 +72,15 @@ async def get_contact_info_by_id(info_id: int, db: Session = Depends(get_db)):
 @router.post("/info", response_model=ContactInfoResponse, status_code=status.HTTP_201_CREATED)
 async def create_contact_info(
     info: ContactInfoCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create contact info (admin only)."""
     db_info = ContactInfo(**info.dict())
     db.add(db_info)
-    db.commit()
-    db.refresh(db_info)
+    await db.commit()
+    content_cache.invalidate("contact_info")
+    await db.refresh(db_info)
     return db_info
 
 
@@ -62,11 +88,11 @@ async def create_contact_info(
 async def update_contact_info(
     info_id: int,
     info_update: ContactInfoUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update contact info (admin only)."""
-    info = db.query(ContactInfo).filter(ContactInfo.id == info_id).first()
+    info = await db.get(ContactInfo, info_id)
     if not info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -77,27 +103,29 @@ async def update_contact_info(
     for field, value in update_data.items():
         setattr(info, field, value)
     
-    db.commit()
-    db.refresh(info)
+    await db.commit()
+    content_cache.invalidate("contact_info")
+    await db.refresh(info)
     return info
 
 
 @router.delete("/info/{info_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contact_info(
     info_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete contact info (admin only)."""
-    info = db.query(ContactInfo).filter(ContactInfo.id == info_id).first()
+    info = await db.get(ContactInfo, info_id)
     if not info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contact info not found"
         )
     
-    db.delete(info)
-    db.commit()
+    await db.delete(info)
+    await db.commit()
+    content_cache.invalidate("contact_info")
     return None
 
 
@@ -105,41 +133,53 @@ async def delete_contact_info(
 @router.post("/submit", response_model=ContactSubmissionResponse, status_code=status.HTTP_201_CREATED)
 async def submit_contact_form(
     submission: ContactSubmissionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Submit contact form (public endpoint)."""
     db_submission = ContactSubmission(**submission.dict())
     db.add(db_submission)
-    db.commit()
-    db.refresh(db_submission)
+    await db.commit()
+    await db.refresh(db_submission)
     return db_submission
 
 
-@router.get("/submissions", response_model=List[ContactSubmissionResponse])
+@router.get("/submissions", response_model=Union[List[ContactSubmissionResponse], ContactSubmissionPage])
 async def get_contact_submissions(
     skip: int = 0,
     limit: int = 100,
     unread_only: bool = False,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
-    """Get all contact form submissions (admin only)."""
-    query = db.query(ContactSubmission)
+    """
+    Get all contact form submissions, newest first (admin only).
+
+    Without a cursor the response is a plain list paged by skip. Passing
+    cursor (empty for the first page) returns {"items", "next_cursor"}
+    instead; following next_cursor costs the same on every page.
+    """
+    query = select(ContactSubmission)
     if unread_only:
-        query = query.filter(ContactSubmission.is_read == False)
-    query = query.order_by(ContactSubmission.created_at.desc())
-    submissions = query.offset(skip).limit(limit).all()
-    return submissions
+        query = query.where(ContactSubmission.is_read == False)
+    page = keyset_query(query, ContactSubmission, db.get_bind().dialect.name, cursor, skip, limit)
+    submissions, next_cursor = page_items((await db.execute(page)).all(), limit)
+    if cursor is None:
+        return submissions
+    return ContactSubmissionPage(
+        items=[ContactSubmissionResponse.model_validate(submission) for submission in submissions],
+        next_cursor=next_cursor
+    )
 
 
 @router.get("/submissions/{submission_id}", response_model=ContactSubmissionResponse)
 async def get_contact_submission(
     submission_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Get a single contact submission by ID (admin only)."""
-    submission = db.query(ContactSubmission).filter(ContactSubmission.id == submission_id).first()
+    submission = await db.get(ContactSubmission, submission_id)
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -151,11 +191,11 @@ async def get_contact_submission(
 @router.put("/submissions/{submission_id}/read", response_model=ContactSubmissionResponse)
 async def mark_submission_as_read(
     submission_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Mark a contact submission as read (admin only)."""
-    submission = db.query(ContactSubmission).filter(ContactSubmission.id == submission_id).first()
+    submission = await db.get(ContactSubmission, submission_id)
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,26 +203,26 @@ async def mark_submission_as_read(
         )
     
     submission.is_read = True
-    db.commit()
-    db.refresh(submission)
+    await db.commit()
+    await db.refresh(submission)
     return submission
 
 
 @router.delete("/submissions/{submission_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contact_submission(
     submission_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a contact submission (admin only)."""
-    submission = db.query(ContactSubmission).filter(ContactSubmission.id == submission_id).first()
+    submission = await db.get(ContactSubmission, submission_id)
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contact submission not found"
         )
     
-    db.delete(submission)
-    db.commit()
+    await db.delete(submission)
+    await db.commit()
     return None
 
@@ -2,38 +2,62 @@
 FAQ router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.faq import FAQ
 from app.schemas.faq import FAQCreate, FAQUpdate, FAQResponse
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/faqs", tags=["faqs"])
 
 
 @router.get("", response_model=List[FAQResponse])
 async def get_faqs(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all FAQs (public endpoint)."""
-    query = db.query(FAQ)
+    query = select(FAQ)
     if active_only:
-        query = query.filter(FAQ.is_active == True)
-    query = query.order_by(asc(FAQ.order))
-    faqs = query.offset(skip).limit(limit).all()
-    return faqs
+        query = query.where(FAQ.is_active == True)
+    
+    def load(session: Session, query):
+        faqs = session.scalars(query.order_by(asc(FAQ.order)).offset(skip).limit(limit)).all()
+        return [FAQResponse.model_validate(faq) for faq in faqs]
+    
+    return await cached_collection(
+        request,
+        db,
+        "faqs",
+        {"skip": skip, "limit": limit, "active_only": active_only},
+        query,
+        FAQ,
+        load
+    )
 
 
 @router.get("/{faq_id}", response_model=FAQResponse)
-async def get_faq(faq_id: int, db: Session = Depends(get_db)):
+async def get_faq(
+    faq_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single FAQ by ID."""
-    faq = db.query(FAQ).filter(FAQ.id == faq_id).first()
+    query = select(FAQ).where(FAQ.id == faq_id)
+    not_modified = await conditional_item(request, response, db, query, FAQ)
+    if not_modified:
+        return not_modified
+    faq = await db.scalar(query)
     if not faq:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -45,14 +69,15 @@ async def get_faq(faq_id: int, db: Session = Depends(get_db)):
 @router.post("", response_model=FAQResponse, status_code=status.HTTP_201_CREATED)
 async def create_faq(
     faq: FAQCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new FAQ (admin only)."""
     db_faq = FAQ(**faq.dict())
     db.add(db_faq)
-    db.commit()
-    db.refresh(db_faq)
+    await db.commit()
+    content_cache.invalidate("faqs")
+    await db.refresh(db_faq)
     return db_faq
 
 
@@ -60,11 +85,11 @@ async def create_faq(
 async def update_faq(
     faq_id: int,
     faq_update: FAQUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a FAQ (admin only)."""
-    faq = db.query(FAQ).filter(FAQ.id == faq_id).first()
+    faq = await db.get(FAQ, faq_id)
     if not faq:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,26 +100,28 @@ async def update_faq(
     for field, value in update_data.items():
         setattr(faq, field, value)
     
-    db.commit()
-    db.refresh(faq)
+    await db.commit()
+    content_cache.invalidate("faqs")
+    await db.refresh(faq)
     return faq
 
 
 @router.delete("/{faq_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_faq(
     faq_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a FAQ (admin only)."""
-    faq = db.query(FAQ).filter(FAQ.id == faq_id).first()
+    faq = await db.get(FAQ, faq_id)
     if not faq:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="FAQ not found"
         )
     
-    db.delete(faq)
-    db.commit()
+    await db.delete(faq)
+    await db.commit()
+    content_cache.invalidate("faqs")
     return None
 
@@ -2,39 +2,63 @@
 Licenses router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.license import License
 from app.schemas.license import LicenseCreate, LicenseUpdate, LicenseResponse
-from app.utils.file_upload import save_uploaded_file, delete_file
+from app.utils.file_upload import save_uploaded_file, create_image_variants, delete_image_variants, delete_file
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/licenses", tags=["licenses"])
 
 
 @router.get("", response_model=List[LicenseResponse])
 async def get_licenses(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all licenses (public endpoint)."""
-    query = db.query(License)
+    query = select(License)
     if active_only:
-        query = query.filter(License.is_active == True)
-    query = query.order_by(asc(License.order))
-    licenses = query.offset(skip).limit(limit).all()
-    return licenses
+        query = query.where(License.is_active == True)
+    
+    def load(session: Session, query):
+        licenses = session.scalars(query.order_by(asc(License.order)).offset(skip).limit(limit)).all()
+        return [LicenseResponse.model_validate(license) for license in licenses]
+    
+    return await cached_collection(
+        request,
+        db,
+        "licenses",
+        {"skip": skip, "limit": limit, "active_only": active_only},
+        query,
+        License,
+        load
+    )
 
 
 @router.get("/{license_id}", response_model=LicenseResponse)
-async def get_license(license_id: int, db: Session = Depends(get_db)):
+async def get_license(
+    license_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single license by ID."""
-    license = db.query(License).filter(License.id == license_id).first()
+    query = select(License).where(License.id == license_id)
+    not_modified = await conditional_item(request, response, db, query, License)
+    if not_modified:
+        return not_modified
+    license = await db.scalar(query)
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,22 +74,25 @@ async def create_license(
     order: int = Form(0),
     is_active: bool = Form(True),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new license (admin only)."""
-    image_path = await save_uploaded_file(image, "licenses")
+    image_path = await save_uploaded_file(image)
+    image_variants = await create_image_variants(image_path)
     
     license = License(
         title=title,
         image_path=image_path,
+        image_variants=image_variants,
         description=description,
         order=order,
         is_active=is_active
     )
     db.add(license)
-    db.commit()
-    db.refresh(license)
+    await db.commit()
+    content_cache.invalidate("licenses")
+    await db.refresh(license)
     return license
 
 
@@ -73,11 +100,11 @@ async def create_license(
 async def update_license(
     license_id: int,
     license_update: LicenseUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a license (admin only)."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.get(License, license_id)
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -87,9 +114,12 @@ async def update_license(
     update_data = license_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(license, field, value)
+    if "image_path" in update_data:
+        license.image_variants = await create_image_variants(license.image_path)
     
-    db.commit()
-    db.refresh(license)
+    await db.commit()
+    content_cache.invalidate("licenses")
+    await db.refresh(license)
     return license
 
 
@@ -97,11 +127,11 @@ async def update_license(
 async def update_license_image(
     license_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update license image (admin only)."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.get(License, license_id)
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,21 +140,24 @@ async def update_license_image(
     
     if license.image_path:
         delete_file(license.image_path)
+        delete_image_variants(license.image_variants)
     
-    license.image_path = await save_uploaded_file(image, "licenses")
-    db.commit()
-    db.refresh(license)
+    license.image_path = await save_uploaded_file(image)
+    license.image_variants = await create_image_variants(license.image_path)
+    await db.commit()
+    content_cache.invalidate("licenses")
+    await db.refresh(license)
     return license
 
 
 @router.delete("/{license_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_license(
     license_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a license (admin only)."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.get(License, license_id)
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -133,8 +166,10 @@ async def delete_license(
     
     if license.image_path:
         delete_file(license.image_path)
+        delete_image_variants(license.image_variants)
     
-    db.delete(license)
-    db.commit()
+    await db.delete(license)
+    await db.commit()
+    content_cache.invalidate("licenses")
     return None
 
@@ -0,0 +1,151 @@
+"""
+On-demand image resizing for anything under the uploads folder.
+
+GET /media/{path}?w=&h=&fmt=&q= renders the upload at the requested size
+(fitting inside w x h, never upscaling) and serves it from the media cache,
+so layouts can ask for new sizes without reprocessing the library. Only
+the sizes and qualities in MEDIA_WIDTHS, MEDIA_HEIGHTS and MEDIA_QUALITIES
+are accepted, which bounds what the cache can fill with.
+"""
+import hashlib
+from pathlib import Path
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from app.config import settings
+from app.media_cache import media_cache
+from app.processing import processing_pool
+from app.uploads import is_blob_path
+from app.utils.file_upload import VARIANT_EXTENSIONS, variant_formats
+from app.utils.http_cache import is_not_modified
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+CACHE_CONTROL = "public, max-age=86400"
+
+
+def check_allowed(name: str, value: Optional[int], allowed: List[int]) -> None:
+    """Reject a size or quality outside its whitelist."""
+    if value is not None and value not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be one of {', '.join(map(str, allowed))}"
+        )
+
+
+def negotiate_format(request: Request, fmt: Optional[str]) -> str:
+    """Return the requested format, or the first configured one the client accepts."""
+    formats = variant_formats()
+    if fmt is not None:
+        fmt = "jpeg" if fmt.lower() == "jpg" else fmt.lower()
+        if fmt not in formats:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"fmt must be one of {', '.join(formats)}"
+            )
+        return fmt
+    accept = request.headers.get("accept", "")
+    for name in formats:
+        if f"image/{name}" in accept:
+            return name
+    return "jpeg"
+
+
+def resolve_upload(path: str) -> Path:
+    """Map a request path to a file inside UPLOAD_DIR (404 for anything outside it)."""
+    root = Path(settings.UPLOAD_DIR).resolve()
+    source = (root / path).resolve()
+    if not source.is_relative_to(root) or not source.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    return source
+
+
+def source_version(source: Path) -> tuple:
+    """
+    What identifies a source's content besides its path: nothing for a
+    blob, whose name is its content hash (its mtime is refreshed whenever
+    the same content is uploaded again), size and mtime for anything else.
+    """
+    relative_path = source.relative_to(Path(settings.UPLOAD_DIR).resolve()).as_posix()
+    if is_blob_path(relative_path):
+        return ()
+    stat = source.stat()
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def render_media(
+    source: Path,
+    target: Path,
+    width: Optional[int],
+    height: Optional[int],
+    fmt: str,
+    quality: int
+) -> None:
+    """
+    Resize an image to fit inside width x height and save it (runs in the process pool).
+
+    Args:
+        source: Original image
+        target: File to write
+        width: Maximum width (None for no limit)
+        height: Maximum height (None for no limit)
+        fmt: avif, webp or jpeg
+        quality: Encoder quality
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as img:
+        box = (width or img.width, height or img.height)
+        # JPEG sources decode straight at a reduced scale when much larger than the box
+        # (not for rotated ones, whose box would have to be swapped first)
+        if img.getexif().get(0x0112, 1) == 1:
+            img.draft("RGB", box)
+        img = ImageOps.exif_transpose(img)
+        if img.width > box[0] or img.height > box[1]:
+            img = ImageOps.contain(img, box, Image.Resampling.LANCZOS)
+        if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA")
+        options = {"optimize": True, "progressive": True} if fmt == "jpeg" else {}
+        img.save(target, fmt.upper(), quality=quality, **options)
+
+
+@router.get("/{path:path}")
+async def get_media(
+    path: str,
+    request: Request,
+    w: Optional[int] = None,
+    h: Optional[int] = None,
+    fmt: Optional[str] = None,
+    q: Optional[int] = None
+):
+    """Serve an uploaded image resized to fit w x h (public endpoint)."""
+    if w is None and h is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="w or h is required")
+    check_allowed("w", w, settings.MEDIA_WIDTHS)
+    check_allowed("h", h, settings.MEDIA_HEIGHTS)
+    check_allowed("q", q, settings.MEDIA_QUALITIES)
+    image_format = negotiate_format(request, fmt)
+    quality = q or settings.IMAGE_VARIANT_QUALITY
+    source = resolve_upload(path)
+
+    # Replacing a file that isn't a blob renders afresh
+    seed = repr((path, *source_version(source), w, h, image_format, quality))
+    key = hashlib.sha256(seed.encode("utf-8")).hexdigest()
+    headers = {"ETag": f'"{key[:32]}"', "Cache-Control": CACHE_CONTROL}
+    if fmt is None:
+        headers["Vary"] = "Accept"
+    if is_not_modified(request, headers["ETag"], None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    async def render(target: Path) -> None:
+        await processing_pool.run("media", render_media, source, target, w, h, image_format, quality)
+
+    try:
+        data = await media_cache.get_or_render(key, VARIANT_EXTENSIONS[image_format], render)
+    except (OSError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not render image: {str(e)}"
+        )
+    return Response(content=data, media_type=f"image/{image_format}", headers=headers)
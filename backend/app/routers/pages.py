@@ -0,0 +1,194 @@
+"""
+Pages router returning every public section of a website page in one response.
+"""
+import hashlib
+from typing import Callable, Dict, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import asc, desc, select
+from app.database import SessionLocal, get_read_db
+from app.cache import content_cache
+from app.models.about import AboutContent
+from app.models.blog import BlogPost
+from app.models.carousel import CarouselSlide
+from app.models.contact import ContactInfo
+from app.models.faq import FAQ
+from app.models.license import License
+from app.models.partner import Partner
+from app.models.portfolio import PortfolioProject
+from app.models.service import Service
+from app.models.statistic import Statistic
+from app.schemas.about import AboutContentResponse
+from app.schemas.blog import BlogPostResponse
+from app.schemas.carousel import CarouselSlideResponse
+from app.schemas.contact import ContactInfoResponse
+from app.schemas.faq import FAQResponse
+from app.schemas.license import LicenseResponse
+from app.schemas.partner import PartnerResponse
+from app.schemas.portfolio import PortfolioProjectResponse
+from app.schemas.service import ServiceResponse
+from app.schemas.statistic import StatisticResponse
+from app.utils.http_cache import CollectionEntry, as_utc, make_entry, serve_entry
+from app.utils.serialization import encode_json
+
+router = APIRouter(prefix="/api/pages", tags=["pages"])
+
+# Same page size the public list endpoints use by default
+SECTION_LIMIT = 100
+
+
+def load_carousel(db: Session) -> list:
+    """Load active carousel slides."""
+    query = select(CarouselSlide).where(CarouselSlide.is_active == True)
+    slides = db.scalars(query.order_by(asc(CarouselSlide.order)).limit(SECTION_LIMIT)).all()
+    return [CarouselSlideResponse.model_validate(slide) for slide in slides]
+
+
+def load_services(db: Session) -> list:
+    """Load active services."""
+    query = select(Service).where(Service.is_active == True)
+    services = db.scalars(query.order_by(asc(Service.order)).limit(SECTION_LIMIT)).all()
+    return [ServiceResponse.model_validate(service) for service in services]
+
+
+def load_portfolio(db: Session) -> list:
+    """Load active portfolio projects."""
+    query = select(PortfolioProject).where(PortfolioProject.is_active == True)
+    projects = db.scalars(query.order_by(asc(PortfolioProject.order)).limit(SECTION_LIMIT)).all()
+    return [PortfolioProjectResponse.model_validate(project) for project in projects]
+
+
+def load_blog(db: Session) -> list:
+    """Load published blog posts."""
+    query = select(BlogPost).where(BlogPost.is_published == True)
+    posts = db.scalars(query.order_by(desc(BlogPost.created_at)).limit(SECTION_LIMIT)).all()
+    return [BlogPostResponse.model_validate(post) for post in posts]
+
+
+def load_faqs(db: Session) -> list:
+    """Load active FAQs."""
+    query = select(FAQ).where(FAQ.is_active == True)
+    faqs = db.scalars(query.order_by(asc(FAQ.order)).limit(SECTION_LIMIT)).all()
+    return [FAQResponse.model_validate(faq) for faq in faqs]
+
+
+def load_statistics(db: Session) -> list:
+    """Load active statistics."""
+    query = select(Statistic).where(Statistic.is_active == True)
+    statistics = db.scalars(query.order_by(asc(Statistic.order)).limit(SECTION_LIMIT)).all()
+    return [StatisticResponse.model_validate(statistic) for statistic in statistics]
+
+
+def load_licenses(db: Session) -> list:
+    """Load active licenses."""
+    query = select(License).where(License.is_active == True)
+    licenses = db.scalars(query.order_by(asc(License.order)).limit(SECTION_LIMIT)).all()
+    return [LicenseResponse.model_validate(license) for license in licenses]
+
+
+def load_partners(db: Session) -> list:
+    """Load active partners."""
+    query = select(Partner).where(Partner.is_active == True)
+    partners = db.scalars(query.order_by(asc(Partner.order)).limit(SECTION_LIMIT)).all()
+    return [PartnerResponse.model_validate(partner) for partner in partners]
+
+
+def load_contact_info(db: Session) -> list:
+    """Load active contact information."""
+    query = select(ContactInfo).where(ContactInfo.is_active == True)
+    info = db.scalars(query.order_by(asc(ContactInfo.order))).all()
+    return [ContactInfoResponse.model_validate(item) for item in info]
+
+
+def load_about(db: Session) -> list:
+    """Load active about content."""
+    content = db.scalars(select(AboutContent).where(AboutContent.is_active == True)).first()
+    return [AboutContentResponse.model_validate(content)] if content else []
+
+
+# Section name (also its content cache namespace) -> loader
+SECTION_LOADERS: Dict[str, Callable[[Session], list]] = {
+    "carousel": load_carousel,
+    "services": load_services,
+    "portfolio": load_portfolio,
+    "blog": load_blog,
+    "faqs": load_faqs,
+    "statistics": load_statistics,
+    "licenses": load_licenses,
+    "partners": load_partners,
+    "contact_info": load_contact_info,
+    "about": load_about,
+}
+
+# Page name -> sections rendered by js/frontend.js on that page
+PAGES: Dict[str, Tuple[str, ...]] = {
+    "home": ("carousel", "services", "blog", "statistics", "about", "faqs"),
+    "portfolio": ("portfolio",),
+    "services": ("services",),
+    "contact": ("contact_info",),
+    "licenses": ("licenses",),
+}
+
+
+def load_page(db: Session, sections: Tuple[str, ...]) -> Dict[str, list]:
+    """
+    Load every section of a page with one session.
+    Takes a sync Session; get_page calls it through AsyncSession.run_sync().
+    """
+    return {name: SECTION_LOADERS[name](db) for name in sections}
+
+
+def build_page(data: Dict[str, list]) -> CollectionEntry:
+    """
+    Serialize a loaded page once.
+
+    Returns:
+        CollectionEntry holding the encoded JSON body and its validators
+    """
+    body = encode_json(data)
+
+    timestamps = [
+        as_utc(item.updated_at or item.created_at)
+        for items in data.values()
+        for item in items
+    ]
+    last_modified = max(timestamps) if timestamps else None
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return make_entry(body, etag, last_modified)
+
+
+def refresh_page(sections: Tuple[str, ...]) -> CollectionEntry:
+    """Rebuild a page with its own session (for background cache refresh)."""
+    db = SessionLocal()
+    try:
+        data = load_page(db, sections)
+    finally:
+        db.close()
+    return build_page(data)
+
+
+@router.get("/{page}")
+async def get_page(page: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    """Get all public sections of a page in one response (public endpoint)."""
+    sections = PAGES.get(page)
+    if sections is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Page not found"
+        )
+
+    async def load() -> CollectionEntry:
+        data = await db.run_sync(load_page, sections)
+        # Return the connection to the pool before serializing and compressing
+        await db.close()
+        return build_page(data)
+
+    result = await content_cache.aget_or_load(
+        "pages",
+        {"page": page},
+        load,
+        tags=sections,
+        refresh=lambda: refresh_page(sections)
+    )
+    return serve_entry(request, result)
@@ -2,39 +2,63 @@
 Partners router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.partner import Partner
 from app.schemas.partner import PartnerCreate, PartnerUpdate, PartnerResponse
-from app.utils.file_upload import save_uploaded_file, delete_file
+from app.utils.file_upload import save_uploaded_file, create_image_variants, delete_image_variants, delete_file
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/partners", tags=["partners"])
 
 
 @router.get("", response_model=List[PartnerResponse])
 async def get_partners(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all partners (public endpoint)."""
-    query = db.query(Partner)
+    query = select(Partner)
     if active_only:
-        query = query.filter(Partner.is_active == True)
-    query = query.order_by(asc(Partner.order))
-    partners = query.offset(skip).limit(limit).all()
-    return partners
+        query = query.where(Partner.is_active == True)
+    
+    def load(session: Session, query):
+        partners = session.scalars(query.order_by(asc(Partner.order)).offset(skip).limit(limit)).all()
+        return [PartnerResponse.model_validate(partner) for partner in partners]
+    
+    return await cached_collection(
+        request,
+        db,
+        "partners",
+        {"skip": skip, "limit": limit, "active_only": active_only},
+        query,
+        Partner,
+        load
+    )
 
 
 @router.get("/{partner_id}", response_model=PartnerResponse)
-async def get_partner(partner_id: int, db: Session = Depends(get_db)):
+async def get_partner(
+    partner_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single partner by ID."""
-    partner = db.query(Partner).filter(Partner.id == partner_id).first()
+    query = select(Partner).where(Partner.id == partner_id)
+    not_modified = await conditional_item(request, response, db, query, Partner)
+    if not_modified:
+        return not_modified
+    partner = await db.scalar(query)
     if not partner:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,22 +74,25 @@ async def create_partner(
     order: int = Form(0),
     is_active: bool = Form(True),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new partner (admin only)."""
-    image_path = await save_uploaded_file(image, "partners")
+    image_path = await save_uploaded_file(image)
+    image_variants = await create_image_variants(image_path)
     
     partner = Partner(
         name=name,
         image_path=image_path,
+        image_variants=image_variants,
         website_url=website_url,
         order=order,
         is_active=is_active
     )
     db.add(partner)
-    db.commit()
-    db.refresh(partner)
+    await db.commit()
+    content_cache.invalidate("partners")
+    await db.refresh(partner)
     return partner
 
 
@@ -73,11 +100,11 @@ async def create_partner(
 async def update_partner(
     partner_id: int,
     partner_update: PartnerUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a partner (admin only)."""
-    partner = db.query(Partner).filter(Partner.id == partner_id).first()
+    partner = await db.get(Partner, partner_id)
     if not partner:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -87,9 +114,12 @@ async def update_partner(
     update_data = partner_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(partner, field, value)
+    if "image_path" in update_data:
+        partner.image_variants = await create_image_variants(partner.image_path)
     
-    db.commit()
-    db.refresh(partner)
+    await db.commit()
+    content_cache.invalidate("partners")
+    await db.refresh(partner)
     return partner
 
 
@@ -97,11 +127,11 @@ async def update_partner(
 async def update_partner_image(
     partner_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update partner image (admin only)."""
-    partner = db.query(Partner).filter(Partner.id == partner_id).first()
+    partner = await db.get(Partner, partner_id)
     if not partner:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,21 +140,24 @@ async def update_partner_image(
     
     if partner.image_path:
         delete_file(partner.image_path)
+        delete_image_variants(partner.image_variants)
     
-    partner.image_path = await save_uploaded_file(image, "partners")
-    db.commit()
-    db.refresh(partner)
+    partner.image_path = await save_uploaded_file(image)
+    partner.image_variants = await create_image_variants(partner.image_path)
+    await db.commit()
+    content_cache.invalidate("partners")
+    await db.refresh(partner)
     return partner
 
 
 @router.delete("/{partner_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_partner(
     partner_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a partner (admin only)."""
-    partner = db.query(Partner).filter(Partner.id == partner_id).first()
+    partner = await db.get(Partner, partner_id)
     if not partner:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -133,8 +166,10 @@ async def delete_partner(
     
     if partner.image_path:
         delete_file(partner.image_path)
+        delete_image_variants(partner.image_variants)
     
-    db.delete(partner)
-    db.commit()
+    await db.delete(partner)
+    await db.commit()
+    content_cache.invalidate("partners")
     return None
 
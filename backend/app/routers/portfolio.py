@@ -2,42 +2,66 @@
 Portfolio projects router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.portfolio import PortfolioProject, ProjectStatus
 from app.schemas.portfolio import PortfolioProjectCreate, PortfolioProjectUpdate, PortfolioProjectResponse
-from app.utils.file_upload import save_uploaded_file, delete_file
+from app.utils.file_upload import save_uploaded_file, create_image_variants, delete_image_variants, delete_file
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
 
 @router.get("", response_model=List[PortfolioProjectResponse])
 async def get_portfolio_projects(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
     status_filter: ProjectStatus = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all portfolio projects (public endpoint)."""
-    query = db.query(PortfolioProject)
+    query = select(PortfolioProject)
     if active_only:
-        query = query.filter(PortfolioProject.is_active == True)
+        query = query.where(PortfolioProject.is_active == True)
     if status_filter:
-        query = query.filter(PortfolioProject.status == status_filter)
-    query = query.order_by(asc(PortfolioProject.order))
-    projects = query.offset(skip).limit(limit).all()
-    return projects
+        query = query.where(PortfolioProject.status == status_filter)
+    
+    def load(session: Session, query):
+        projects = session.scalars(query.order_by(asc(PortfolioProject.order)).offset(skip).limit(limit)).all()
+        return [PortfolioProjectResponse.model_validate(project) for project in projects]
+    
+    return await cached_collection(
+        request,
+        db,
+        "portfolio",
+        {"skip": skip, "limit": limit, "active_only": active_only, "status_filter": status_filter},
+        query,
+        PortfolioProject,
+        load
+    )
 
 
 @router.get("/{project_id}", response_model=PortfolioProjectResponse)
-async def get_portfolio_project(project_id: int, db: Session = Depends(get_db)):
+async def get_portfolio_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single portfolio project by ID."""
-    project = db.query(PortfolioProject).filter(PortfolioProject.id == project_id).first()
+    query = select(PortfolioProject).where(PortfolioProject.id == project_id)
+    not_modified = await conditional_item(request, response, db, query, PortfolioProject)
+    if not_modified:
+        return not_modified
+    project = await db.scalar(query)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,23 +78,26 @@ async def create_portfolio_project(
     order: int = Form(0),
     is_active: bool = Form(True),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new portfolio project (admin only)."""
-    image_path = await save_uploaded_file(image, "portfolio")
+    image_path = await save_uploaded_file(image)
+    image_variants = await create_image_variants(image_path)
     
     project = PortfolioProject(
         title=title,
         description=description,
         image_path=image_path,
+        image_variants=image_variants,
         status=status,
         order=order,
         is_active=is_active
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    content_cache.invalidate("portfolio")
+    await db.refresh(project)
     return project
 
 
@@ -78,11 +105,11 @@ async def create_portfolio_project(
 async def update_portfolio_project(
     project_id: int,
     project_update: PortfolioProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a portfolio project (admin only)."""
-    project = db.query(PortfolioProject).filter(PortfolioProject.id == project_id).first()
+    project = await db.get(PortfolioProject, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -92,9 +119,12 @@ async def update_portfolio_project(
     update_data = project_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(project, field, value)
+    if "image_path" in update_data:
+        project.image_variants = await create_image_variants(project.image_path)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    content_cache.invalidate("portfolio")
+    await db.refresh(project)
     return project
 
 
@@ -102,11 +132,11 @@ async def update_portfolio_project(
 async def update_portfolio_project_image(
     project_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update portfolio project image (admin only)."""
-    project = db.query(PortfolioProject).filter(PortfolioProject.id == project_id).first()
+    project = await db.get(PortfolioProject, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,21 +145,24 @@ async def update_portfolio_project_image(
     
     if project.image_path:
         delete_file(project.image_path)
+        delete_image_variants(project.image_variants)
     
-    project.image_path = await save_uploaded_file(image, "portfolio")
-    db.commit()
-    db.refresh(project)
+    project.image_path = await save_uploaded_file(image)
+    project.image_variants = await create_image_variants(project.image_path)
+    await db.commit()
+    content_cache.invalidate("portfolio")
+    await db.refresh(project)
     return project
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_portfolio_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a portfolio project (admin only)."""
-    project = db.query(PortfolioProject).filter(PortfolioProject.id == project_id).first()
+    project = await db.get(PortfolioProject, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -138,8 +171,10 @@ async def delete_portfolio_project(
     
     if project.image_path:
         delete_file(project.image_path)
+        delete_image_variants(project.image_variants)
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
+    content_cache.invalidate("portfolio")
     return None
 
@@ -3,39 +3,67 @@ Services router for CRUD operations.
 """
 import json
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.service import Service
 from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
-from app.utils.file_upload import save_uploaded_file, save_uploaded_video, extract_video_thumbnail, delete_file
+from app.utils.file_upload import (
+    save_uploaded_file, save_uploaded_video, extract_video_thumbnail,
+    create_image_variants, delete_image_variants, delete_file
+)
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/services", tags=["services"])
 
 
 @router.get("", response_model=List[ServiceResponse])
 async def get_services(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all services (public endpoint)."""
-    query = db.query(Service)
+    query = select(Service)
     if active_only:
-        query = query.filter(Service.is_active == True)
-    query = query.order_by(asc(Service.order))
-    services = query.offset(skip).limit(limit).all()
-    return services
+        query = query.where(Service.is_active == True)
+    
+    def load(session: Session, query):
+        services = session.scalars(query.order_by(asc(Service.order)).offset(skip).limit(limit)).all()
+        return [ServiceResponse.model_validate(service) for service in services]
+    
+    return await cached_collection(
+        request,
+        db,
+        "services",
+        {"skip": skip, "limit": limit, "active_only": active_only},
+        query,
+        Service,
+        load
+    )
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
-async def get_service(service_id: int, db: Session = Depends(get_db)):
+async def get_service(
+    service_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single service by ID."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    query = select(Service).where(Service.id == service_id)
+    not_modified = await conditional_item(request, response, db, query, Service)
+    if not_modified:
+        return not_modified
+    service = await db.scalar(query)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,7 +82,7 @@ async def create_service(
     image: UploadFile = File(None),
     images_json: str = Form(None),  # JSON string of image paths
     video_file: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new service (admin only)."""
@@ -62,7 +90,7 @@ async def create_service(
     video_url_value = None
     if video_file and video_file.filename:
         # Upload video file
-        video_url_value = await save_uploaded_video(video_file, "services/videos")
+        video_url_value = await save_uploaded_video(video_file)
     elif video_url and video_url.strip():
         # Use provided URL (YouTube/Vimeo embed URL)
         video_url_value = video_url.strip()
@@ -85,7 +113,7 @@ async def create_service(
     
     # If single image is uploaded, use it (and add to images array)
     if image and image.filename:
-        uploaded_path = await save_uploaded_file(image, "services")
+        uploaded_path = await save_uploaded_file(image)
         if not image_path:
             image_path = uploaded_path
         # If images_json exists, add this image; otherwise create new array
@@ -114,19 +142,22 @@ async def create_service(
         else:
             # Use default placeholder image
             image_path = "services/default-placeholder.jpg"
+    image_variants = await create_image_variants(image_path)
     
     service = Service(
         title=title,
         description=description,
         image_path=image_path,
+        image_variants=image_variants,
         images=images_value,
         video_url=video_url_value,
         order=order,
         is_active=is_active
     )
     db.add(service)
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    content_cache.invalidate("services")
+    await db.refresh(service)
     return service
 
 
@@ -134,11 +165,11 @@ async def create_service(
 async def update_service(
     service_id: int,
     service_update: ServiceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a service (admin only)."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -148,9 +179,12 @@ async def update_service(
     update_data = service_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(service, field, value)
+    if "image_path" in update_data:
+        service.image_variants = await create_image_variants(service.image_path)
     
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    content_cache.invalidate("services")
+    await db.refresh(service)
     return service
 
 
@@ -158,11 +192,11 @@ async def update_service(
 async def update_service_image(
     service_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update service image (admin only)."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -171,24 +205,32 @@ async def update_service_image(
     
     if service.image_path:
         delete_file(service.image_path)
+        delete_image_variants(service.image_variants)
     
-    service.image_path = await save_uploaded_file(image, "services")
-    db.commit()
-    db.refresh(service)
+    service.image_path = await save_uploaded_file(image)
+    service.image_variants = await create_image_variants(service.image_path)
+    await db.commit()
+    content_cache.invalidate("services")
+    await db.refresh(service)
     return service
 
 
 @router.post("/upload-images")
 async def upload_service_images(
     images: List[UploadFile] = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Upload multiple images for services (admin only). Returns list of image paths."""
+    if len(images) > settings.MAX_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_UPLOAD_FILES} images can be uploaded at once"
+        )
     uploaded_paths = []
     for image in images:
         try:
-            path = await save_uploaded_file(image, "services")
+            path = await save_uploaded_file(image)
             uploaded_paths.append(path)
         except Exception as e:
             # Continue with other images even if one fails
@@ -200,11 +242,11 @@ async def upload_service_images(
 async def update_service_images(
     service_id: int,
     images_json: str = Form(...),  # JSON array of image paths
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update service images (admin only). Accepts JSON array of image paths."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -224,6 +266,7 @@ async def update_service_images(
             first_image = parsed[0] if isinstance(parsed[0], str) else parsed[0].get('path', '')
             if first_image and not service.image_path:
                 service.image_path = first_image
+                service.image_variants = await create_image_variants(first_image)
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -231,8 +274,9 @@ async def update_service_images(
         )
     
     service.images = images_json
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    content_cache.invalidate("services")
+    await db.refresh(service)
     return service
 
 
@@ -241,11 +285,11 @@ async def update_service_video(
     service_id: int,
     video_file: UploadFile = File(None),
     video_url: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update service video (admin only). Can upload file or provide URL."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -260,7 +304,7 @@ async def update_service_video(
     video_url_value = None
     if video_file and video_file.filename:
         # Upload video file
-        video_url_value = await save_uploaded_video(video_file, "services/videos")
+        video_url_value = await save_uploaded_video(video_file)
         
         # Extract thumbnail and update image if current image is placeholder
         if service.image_path == "services/default-placeholder.jpg":
@@ -269,7 +313,9 @@ async def update_service_video(
                 # Delete old placeholder if it exists
                 if service.image_path:
                     delete_file(service.image_path)
+                    delete_image_variants(service.image_variants)
                 service.image_path = thumbnail_path
+                service.image_variants = await create_image_variants(thumbnail_path)
             except Exception:
                 # If thumbnail extraction fails, keep existing image
                 pass
@@ -281,19 +327,20 @@ async def update_service_video(
         video_url_value = None
     
     service.video_url = video_url_value
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    content_cache.invalidate("services")
+    await db.refresh(service)
     return service
 
 
 @router.delete("/{service_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_service(
     service_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a service (admin only)."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -302,12 +349,14 @@ async def delete_service(
     
     if service.image_path:
         delete_file(service.image_path)
+        delete_image_variants(service.image_variants)
     
     # Delete video file if it's a local file (not URL)
     if service.video_url and not service.video_url.startswith(('http://', 'https://')):
         delete_file(service.video_url)
     
-    db.delete(service)
-    db.commit()
+    await db.delete(service)
+    await db.commit()
+    content_cache.invalidate("services")
     return None
 
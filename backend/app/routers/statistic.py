@@ -2,38 +2,62 @@
 Statistics router for CRUD operations.
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from app.database import get_db
+from sqlalchemy import asc, select
+from app.database import get_db, get_read_db
 from app.auth import get_current_active_superuser
+from app.cache import content_cache
 from app.models.user import User
 from app.models.statistic import Statistic
 from app.schemas.statistic import StatisticCreate, StatisticUpdate, StatisticResponse
+from app.utils.http_cache import cached_collection, conditional_item
 
 router = APIRouter(prefix="/api/statistics", tags=["statistics"])
 
 
 @router.get("", response_model=List[StatisticResponse])
 async def get_statistics(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all statistics (public endpoint)."""
-    query = db.query(Statistic)
+    query = select(Statistic)
     if active_only:
-        query = query.filter(Statistic.is_active == True)
-    query = query.order_by(asc(Statistic.order))
-    statistics = query.offset(skip).limit(limit).all()
-    return statistics
+        query = query.where(Statistic.is_active == True)
+    
+    def load(session: Session, query):
+        statistics = session.scalars(query.order_by(asc(Statistic.order)).offset(skip).limit(limit)).all()
+        return [StatisticResponse.model_validate(statistic) for statistic in statistics]
+    
+    return await cached_collection(
+        request,
+        db,
+        "statistics",
+        {"skip": skip, "limit": limit, "active_only": active_only},
+        query,
+        Statistic,
+        load
+    )
 
 
 @router.get("/{statistic_id}", response_model=StatisticResponse)
-async def get_statistic(statistic_id: int, db: Session = Depends(get_db)):
+async def get_statistic(
+    statistic_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get a single statistic by ID."""
-    statistic = db.query(Statistic).filter(Statistic.id == statistic_id).first()
+    query = select(Statistic).where(Statistic.id == statistic_id)
+    not_modified = await conditional_item(request, response, db, query, Statistic)
+    if not_modified:
+        return not_modified
+    statistic = await db.scalar(query)
     if not statistic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -45,14 +69,15 @@ async def get_statistic(statistic_id: int, db: Session = Depends(get_db)):
 @router.post("", response_model=StatisticResponse, status_code=status.HTTP_201_CREATED)
 async def create_statistic(
     statistic: StatisticCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Create a new statistic (admin only)."""
     db_statistic = Statistic(**statistic.dict())
     db.add(db_statistic)
-    db.commit()
-    db.refresh(db_statistic)
+    await db.commit()
+    content_cache.invalidate("statistics")
+    await db.refresh(db_statistic)
     return db_statistic
 
 
@@ -60,11 +85,11 @@ async def create_statistic(
 async def update_statistic(
     statistic_id: int,
     statistic_update: StatisticUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Update a statistic (admin only)."""
-    statistic = db.query(Statistic).filter(Statistic.id == statistic_id).first()
+    statistic = await db.get(Statistic, statistic_id)
     if not statistic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,26 +100,28 @@ async def update_statistic(
     for field, value in update_data.items():
         setattr(statistic, field, value)
     
-    db.commit()
-    db.refresh(statistic)
+    await db.commit()
+    content_cache.invalidate("statistics")
+    await db.refresh(statistic)
     return statistic
 
 
 @router.delete("/{statistic_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_statistic(
     statistic_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """Delete a statistic (admin only)."""
-    statistic = db.query(Statistic).filter(Statistic.id == statistic_id).first()
+    statistic = await db.get(Statistic, statistic_id)
     if not statistic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Statistic not found"
         )
     
-    db.delete(statistic)
-    db.commit()
+    await db.delete(statistic)
+    await db.commit()
+    content_cache.invalidate("statistics")
     return None
 
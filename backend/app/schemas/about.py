@@ -4,6 +4,7 @@ About content schemas.
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.image import ImageVariants
 
 
 class AboutContentBase(BaseModel):
@@ -32,6 +33,7 @@ class AboutContentUpdate(BaseModel):
 class AboutContentResponse(AboutContentBase):
     """About content response schema."""
     id: int
+    image_variants: ImageVariants = {}
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -2,8 +2,9 @@
 Blog post schemas.
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from app.schemas.image import ImageVariants
 
 
 class BlogPostBase(BaseModel):
@@ -37,6 +38,7 @@ class BlogPostUpdate(BaseModel):
 class BlogPostResponse(BlogPostBase):
     """Blog post response schema."""
     id: int
+    image_variants: ImageVariants = {}
     published_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -44,3 +46,9 @@ class BlogPostResponse(BlogPostBase):
     class Config:
         from_attributes = True
 
+
+class BlogPostPage(BaseModel):
+    """One page of blog posts with the cursor of the next page."""
+    items: List[BlogPostResponse]
+    next_cursor: Optional[str] = None
+
@@ -4,6 +4,7 @@ Carousel slide schemas.
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.image import ImageVariants
 
 
 class CarouselSlideBase(BaseModel):
@@ -36,6 +37,7 @@ class CarouselSlideUpdate(BaseModel):
 class CarouselSlideResponse(CarouselSlideBase):
     """Carousel slide response schema."""
     id: int
+    image_variants: ImageVariants = {}
     created_at: datetime
     updated_at: Optional[datetime] = None
 
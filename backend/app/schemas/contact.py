@@ -2,7 +2,7 @@
 Contact schemas.
 """
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -62,3 +62,9 @@ class ContactSubmissionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class ContactSubmissionPage(BaseModel):
+    """One page of contact submissions with the cursor of the next page."""
+    items: List[ContactSubmissionResponse]
+    next_cursor: Optional[str] = None
+
@@ -0,0 +1,26 @@
+"""
+Responsive image variant schemas.
+"""
+import json
+from typing import Annotated, Any, Dict, List
+from pydantic import BaseModel, BeforeValidator
+
+
+class ImageVariant(BaseModel):
+    """One resized copy of an uploaded image."""
+    path: str
+    width: int
+
+
+def parse_image_variants(value: Any) -> Any:
+    """Read the JSON stored in an image_variants column."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+# Format (avif, webp, jpeg) -> variants sorted by width, most preferred format first.
+# Each list maps directly to a srcset: "<path> <width>w, ..."
+ImageVariants = Annotated[Dict[str, List[ImageVariant]], BeforeValidator(parse_image_variants)]
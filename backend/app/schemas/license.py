@@ -4,6 +4,7 @@ License schemas.
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.image import ImageVariants
 
 
 class LicenseBase(BaseModel):
@@ -32,6 +33,7 @@ class LicenseUpdate(BaseModel):
 class LicenseResponse(LicenseBase):
     """License response schema."""
     id: int
+    image_variants: ImageVariants = {}
     created_at: datetime
     updated_at: Optional[datetime] = None
 
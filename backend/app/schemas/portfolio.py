@@ -4,6 +4,7 @@ Portfolio project schemas.
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.image import ImageVariants
 from app.models.portfolio import ProjectStatus
 
 
@@ -35,6 +36,7 @@ class PortfolioProjectUpdate(BaseModel):
 class PortfolioProjectResponse(PortfolioProjectBase):
     """Portfolio project response schema."""
     id: int
+    image_variants: ImageVariants = {}
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -4,6 +4,7 @@ Service schemas.
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from app.schemas.image import ImageVariants
 
 
 class ServiceBase(BaseModel):
@@ -36,6 +37,7 @@ class ServiceUpdate(BaseModel):
 class ServiceResponse(ServiceBase):
     """Service response schema."""
     id: int
+    image_variants: ImageVariants = {}
     created_at: datetime
     updated_at: Optional[datetime] = None
 
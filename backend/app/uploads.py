@@ -0,0 +1,209 @@
+"""
+Content-addressed upload storage.
+
+Uploads are stored once per distinct content, at blobs/<xx>/<sha256><ext>
+under UPLOAD_DIR, named by the SHA-256 of the bytes as uploaded. The same
+image uploaded for a service, a project and a post is one file, and an
+upload whose hash is already stored skips processing altogether (see
+save_uploaded_file and create_image_variants). A hash is stored under one
+extension only, that of whatever stored it first, since variants are named
+after the hash alone.
+
+upload_refs records which rows point at each blob. It is kept in step by a
+flush hook on every Session, so routers assign paths as before and never
+delete blobs themselves (delete_file leaves them alone). When the last row
+lets go of a blob, its upload_blobs row is deleted in the same transaction.
+Paths from before blobs existed aren't tracked.
+
+Files are only removed by running this module: blobs no row refers to
+(released by their last row, or uploaded and never used) are deleted with
+their variants once older than ORPHAN_MAX_AGE. They aren't removed on
+commit because an upload of the same content may have just been handed the
+path without referencing it yet; handing it out refreshes the file's mtime.
+
+Usage: python -m app.uploads [max_age_seconds]
+"""
+import json
+import sys
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import delete, event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.models.about import AboutContent
+from app.models.blog import BlogPost
+from app.models.carousel import CarouselSlide
+from app.models.license import License
+from app.models.partner import Partner
+from app.models.portfolio import PortfolioProject
+from app.models.service import Service
+from app.models.upload import UploadBlob, UploadRef
+
+BLOB_DIR = "blobs"
+
+# Model -> columns holding upload paths (Service.images is a JSON list of them)
+UPLOAD_COLUMNS: Dict[type, Tuple[str, ...]] = {
+    CarouselSlide: ("image_path",),
+    Service: ("image_path", "images", "video_url"),
+    PortfolioProject: ("image_path",),
+    BlogPost: ("image_path",),
+    AboutContent: ("image_path",),
+    Partner: ("image_path",),
+    License: ("image_path",),
+}
+
+# Unreferenced blobs younger than this may still be about to be saved on a row
+ORPHAN_MAX_AGE = 3600.0
+
+blobs = UploadBlob.__table__
+refs = UploadRef.__table__
+
+
+def blob_path(sha256: str, extension: str) -> str:
+    """Relative path of the blob with the given content hash."""
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256}{extension}"
+
+
+def is_blob_path(path: Optional[str]) -> bool:
+    """Whether a relative upload path is a content-addressed blob."""
+    return bool(path) and path.startswith(f"{BLOB_DIR}/")
+
+
+def remove_blob_files(path: str) -> None:
+    """Delete a blob's file and the image variants stored beside it."""
+    full_path = Path(settings.UPLOAD_DIR) / path
+    for variant in full_path.parent.glob(f"{full_path.stem}-*"):
+        variant.unlink(missing_ok=True)
+    full_path.unlink(missing_ok=True)
+
+
+async def stored_variants(path: str) -> Optional[str]:
+    """image_variants last saved for a blob, or None if it has none yet."""
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(UploadBlob.image_variants).where(UploadBlob.path == path))
+
+
+def referenced_paths(obj: Any) -> Set[str]:
+    """Blob paths referenced by a row's upload columns."""
+    paths = set()
+    for column in UPLOAD_COLUMNS[type(obj)]:
+        value = getattr(obj, column)
+        if column != "images":
+            paths.add(value)
+            continue
+        try:
+            images = json.loads(value) if value else []
+        except ValueError:
+            continue
+        if isinstance(images, list):
+            paths.update(image.get("path") if isinstance(image, dict) else image for image in images)
+    return {path for path in paths if isinstance(path, str) and is_blob_path(path)}
+
+
+def insert_ignoring_duplicates(conn: Connection, table, rows: Iterable[Dict[str, Any]]) -> None:
+    """INSERT rows, skipping any whose key already exists (another transaction may add it first)."""
+    rows = list(rows)
+    if not rows:
+        return
+    dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+    conn.execute(dialect.insert(table).on_conflict_do_nothing(), rows)
+
+
+def upload_columns_changed(obj: Any) -> bool:
+    """Whether a flushed row's upload columns or image_variants changed."""
+    state = inspect(obj)
+    columns = UPLOAD_COLUMNS[type(obj)] + ("image_variants",)
+    return any(state.attrs[column].history.has_changes() for column in columns)
+
+
+@event.listens_for(Session, "after_flush")
+def sync_upload_refs(session: Session, flush_context) -> None:
+    """
+    Bring upload_refs in line with the rows this flush wrote.
+
+    Newly referenced blobs get an upload_blobs row, a row's image_variants
+    is saved on the blob of its image_path, and the rows of blobs left
+    without references are deleted (their files stay until
+    remove_unreferenced_blobs).
+    """
+    changed: Dict[Any, bool] = {}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if type(obj) not in UPLOAD_COLUMNS:
+            continue
+        deleted = obj in session.deleted
+        if deleted or obj in session.new or upload_columns_changed(obj):
+            changed[obj] = deleted
+    if not changed:
+        return
+
+    conn = session.connection()
+    released = set()
+    for obj, deleted in changed.items():
+        table_name, row_id = obj.__tablename__, obj.id
+        current = set(conn.execute(
+            select(refs.c.blob_path).where(refs.c.table_name == table_name, refs.c.row_id == row_id)
+        ).scalars())
+        wanted = set() if deleted else referenced_paths(obj)
+
+        added = wanted - current
+        if added:
+            upload_dir = Path(settings.UPLOAD_DIR)
+            insert_ignoring_duplicates(conn, blobs, (
+                {"sha256": PurePosixPath(path).stem, "path": path, "size": (upload_dir / path).stat().st_size}
+                for path in added if (upload_dir / path).is_file()
+            ))
+            insert_ignoring_duplicates(conn, refs, (
+                {"blob_path": path, "table_name": table_name, "row_id": row_id} for path in added
+            ))
+        removed = current - wanted
+        if removed:
+            conn.execute(delete(refs).where(
+                refs.c.table_name == table_name, refs.c.row_id == row_id, refs.c.blob_path.in_(removed)
+            ))
+            released |= removed
+        if not deleted and obj.image_variants and is_blob_path(obj.image_path):
+            conn.execute(update(blobs).where(blobs.c.path == obj.image_path).values(image_variants=obj.image_variants))
+
+    if released:
+        still_used = set(conn.execute(
+            select(refs.c.blob_path).where(refs.c.blob_path.in_(released)).distinct()
+        ).scalars())
+        unused = released - still_used
+        if unused:
+            conn.execute(delete(blobs).where(blobs.c.path.in_(unused)))
+
+
+def remove_unreferenced_blobs(max_age: float = ORPHAN_MAX_AGE) -> int:
+    """
+    Delete blobs no row refers to that were stored over max_age seconds ago.
+
+    Returns:
+        Number of blobs deleted
+    """
+    blob_dir = Path(settings.UPLOAD_DIR) / BLOB_DIR
+    if not blob_dir.is_dir():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    with engine.begin() as conn:
+        referenced = set(conn.execute(select(refs.c.blob_path).distinct()).scalars())
+        for full_path in blob_dir.glob("*/*"):
+            # Variants are named <sha256>-<width>w.<ext> and go with their original
+            if "-" in full_path.stem or not full_path.is_file():
+                continue
+            path = full_path.relative_to(settings.UPLOAD_DIR).as_posix()
+            if path in referenced or full_path.stat().st_mtime > cutoff:
+                continue
+            conn.execute(delete(blobs).where(blobs.c.path == path))
+            remove_blob_files(path)
+            removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    max_age = float(sys.argv[1]) if len(sys.argv) > 1 else ORPHAN_MAX_AGE
+    print(f"Removed {remove_unreferenced_blobs(max_age)} unreferenced uploads")
@@ -0,0 +1,151 @@
+"""
+Response compression (gzip and Brotli) with Accept-Encoding negotiation.
+"""
+import gzip
+from typing import Iterable, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is listed in requirements.txt
+    brotli = None
+
+# Preferred first when the client weights several encodings equally
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "text/")
+
+# Cached bodies are compressed once per content version, so they can
+# afford higher levels than responses compressed on every request
+STORED_LEVELS = {"br": 9, "gzip": 9}
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+
+
+def compress(body: bytes, encoding: str, stored: bool = False) -> bytes:
+    """Compress body with the given content coding ("br" or "gzip")."""
+    level = (STORED_LEVELS if stored else DYNAMIC_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_variants(body: bytes) -> Tuple[Tuple[str, bytes], ...]:
+    """
+    Precompress a cacheable body in every supported encoding.
+
+    Returns:
+        (encoding, compressed body) pairs; empty for bodies below
+        settings.COMPRESSION_MIN_SIZE or when compression doesn't help
+    """
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return ()
+    variants = ((encoding, compress(body, encoding, stored=True)) for encoding in ENCODINGS)
+    return tuple((encoding, data) for encoding, data in variants if len(data) < len(body))
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """
+    Pick the content coding to use for a request.
+
+    Args:
+        accept_encoding: The request's Accept-Encoding header
+        available: Encodings that can be served, in order of preference
+
+    Returns:
+        The chosen encoding, or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def weak_etag(etag: str) -> str:
+    """Mark an ETag weak, as it no longer identifies the exact bytes sent."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON and text responses according to Accept-Encoding.
+
+    Responses that already carry a Content-Encoding (precompressed cached
+    collections) and non-text responses such as uploaded images pass through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), ENCODINGS)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks = []
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if start is not None and not chunks:
+                headers = Headers(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or start["status"] in (204, 304)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                if "etag" in headers:
+                    headers["ETag"] = weak_etag(headers["etag"])
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,28 +1,133 @@
 """
 File upload utilities for handling image uploads.
+
+Uploads are stored content-addressed (see app/uploads.py): a file whose
+bytes were uploaded before resolves to the stored copy without processing.
+
+The CPU-bound parts (re-encoding, resizing, video decoding) are module-level
+functions run in the process pool (see app/processing.py). Pillow and OpenCV
+are imported inside the functions that use them.
 """
+import hashlib
+import json
 import os
+import shutil
 import uuid
-from pathlib import Path
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional
 from fastapi import UploadFile, HTTPException, status
-from PIL import Image
 import aiofiles
-import cv2
-import numpy as np
 from app.config import settings
+from app.processing import processing_pool
+from app.uploads import BLOB_DIR, blob_path, is_blob_path, stored_variants
 
+# Content type -> stored extension of accepted videos
+VIDEO_EXTENSIONS = {
+    "video/mp4": ".mp4",
+    "video/webm": ".webm",
+    "video/ogg": ".ogv",
+    "video/quicktime": ".mov",
+    "video/x-msvideo": ".avi",
+}
 
-async def save_uploaded_file(
-    file: UploadFile,
-    subdirectory: str = "general"
-) -> str:
+
+def optimize_image(file_path: str) -> None:
+    """Re-encode an uploaded image in place as an optimized JPEG (runs in the process pool)."""
+    from PIL import Image
+
+    img = Image.open(file_path)
+    # Convert to RGB if necessary
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    # Save optimized version
+    img.save(file_path, "JPEG", quality=85, optimize=True)
+
+
+def temporary_path() -> Path:
+    """Hidden file in the blob folder for writing an upload before it is moved into place."""
+    blob_dir = Path(settings.UPLOAD_DIR) / BLOB_DIR
+    blob_dir.mkdir(parents=True, exist_ok=True)
+    return blob_dir / f".{uuid.uuid4()}.part"
+
+
+def place_blob(tmp_path: Path, relative_path: str) -> None:
+    """Move a finished temporary file to its blob path."""
+    file_path = Path(settings.UPLOAD_DIR) / relative_path
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_path, file_path)
+
+
+def existing_blob(digest: str) -> Optional[str]:
     """
-    Save an uploaded file and return its relative path.
+    Relative path of the blob already stored for a content hash, if any.
+
+    A hash is stored once, with the extension of whatever stored it first
+    (.jpg for uploads, the file's own for imported images), so two blobs
+    never share a name or variant files. Its mtime is refreshed, so it
+    counts as new if it is currently unreferenced (see
+    remove_unreferenced_blobs).
+    """
+    upload_dir = Path(settings.UPLOAD_DIR)
+    for file_path in (upload_dir / blob_path(digest, "")).parent.glob(f"{digest}.*"):
+        try:
+            os.utime(file_path)
+        except FileNotFoundError:
+            continue
+        return file_path.relative_to(upload_dir).as_posix()
+    return None
+
+
+async def stream_upload(file: UploadFile, target: Path, max_size: int, too_large: str) -> str:
+    """
+    Copy an upload to target in UPLOAD_CHUNK_SIZE pieces, hashing it on the way.
+
+    Only one chunk is held in memory at a time, and the copy stops as soon
+    as the running total passes max_size. The caller removes target if
+    this raises.
+
+    Args:
+        file: Uploaded file object
+        target: File to write
+        max_size: Largest accepted size in bytes
+        too_large: Error message when the upload is larger
+
+    Returns:
+        SHA-256 hex digest of the upload
+
+    Raises:
+        HTTPException: 413 if the upload is larger than max_size
+    """
+    def reject() -> HTTPException:
+        return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=too_large)
+
+    # The multipart parser already knows the size of a fully received part
+    if file.size is not None and file.size > max_size:
+        raise reject()
+
+    size = 0
+    digest = hashlib.sha256()
+    await file.seek(0)
+    async with aiofiles.open(target, "wb") as f:
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise reject()
+            digest.update(chunk)
+            await f.write(chunk)
+    return digest.hexdigest()
+
+
+async def save_uploaded_file(file: UploadFile) -> str:
+    """
+    Save an uploaded image and return its relative path.
+    
+    Images are re-encoded as JPEG and stored by the hash of the uploaded
+    bytes; an image stored before (uploaded or imported) returns the
+    stored copy's path.
     
     Args:
         file: Uploaded file object
-        subdirectory: Subdirectory within uploads folder
         
     Returns:
         Relative path to the saved file
@@ -30,16 +135,6 @@ async def save_uploaded_file(
     Raises:
         HTTPException: If file is invalid or too large
     """
-    # Validate file size
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    if file_size > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE} bytes"
-        )
-    
     # Validate file type (images only)
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(
@@ -47,53 +142,80 @@ async def save_uploaded_file(
             detail="Only image files are allowed"
         )
     
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix if file.filename else ".jpg"
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    
-    # Create upload directory if it doesn't exist
-    upload_dir = Path(settings.UPLOAD_DIR) / subdirectory
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Save file
-    file_path = upload_dir / unique_filename
-    
-    # Reset file pointer
-    await file.seek(0)
-    
-    async with aiofiles.open(file_path, "wb") as f:
-        await f.write(file_content)
-    
-    # Validate and optimize image
+    # Copy to a temporary file, validate and optimize it there, then move it into place
+    tmp_path = temporary_path()
     try:
-        img = Image.open(file_path)
-        # Convert to RGB if necessary
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-        # Save optimized version
-        img.save(file_path, "JPEG", quality=85, optimize=True)
-    except Exception as e:
-        # If image processing fails, delete the file
-        os.remove(file_path)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid image file: {str(e)}"
+        digest = await stream_upload(
+            file,
+            tmp_path,
+            settings.MAX_UPLOAD_SIZE,
+            f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE} bytes"
         )
+        existing = existing_blob(digest)
+        if existing:
+            return existing
+        relative_path = blob_path(digest, ".jpg")
+        try:
+            await processing_pool.run("upload", optimize_image, str(tmp_path))
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid image file: {str(e)}"
+            )
+        place_blob(tmp_path, relative_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
     
-    # Return relative path
-    return f"{subdirectory}/{unique_filename}"
+    return relative_path
 
 
-async def save_uploaded_video(
-    file: UploadFile,
-    subdirectory: str = "videos"
-) -> str:
+def file_digest(source_path: Path) -> str:
+    """SHA-256 hex digest of a file on disk."""
+    digest = hashlib.sha256()
+    with open(source_path, "rb") as f:
+        while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_image_file(source_path: Path) -> str:
+    """
+    Store an image from disk as a blob, byte for byte.
+
+    Unlike uploads, files are kept in their own format rather than
+    re-encoded to JPEG, so PNG transparency survives. Content already
+    uploaded resolves to the stored (re-encoded) copy.
+
+    Args:
+        source_path: Image to store
+
+    Returns:
+        Relative path to the stored file
+    """
+    digest = file_digest(source_path)
+    existing = existing_blob(digest)
+    if existing:
+        return existing
+    relative_path = blob_path(digest, source_path.suffix.lower())
+    tmp_path = temporary_path()
+    try:
+        shutil.copyfile(source_path, tmp_path)
+        place_blob(tmp_path, relative_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return relative_path
+
+
+async def save_uploaded_video(file: UploadFile) -> str:
     """
     Save an uploaded video file and return its relative path.
     
+    Videos are stored by the hash of their bytes, like images.
+    
     Args:
         file: Uploaded file object
-        subdirectory: Subdirectory within uploads folder
         
     Returns:
         Relative path to the saved file
@@ -101,51 +223,100 @@ async def save_uploaded_video(
     Raises:
         HTTPException: If file is invalid or too large
     """
-    # Validate file size (videos can be larger, allow up to 100MB)
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    max_video_size = 100 * 1024 * 1024  # 100MB
-    if file_size > max_video_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"Video file size exceeds maximum allowed size of {max_video_size / (1024*1024)}MB"
-        )
-    
     # Validate file type (videos)
-    allowed_video_types = [
-        "video/mp4",
-        "video/webm",
-        "video/ogg",
-        "video/quicktime",
-        "video/x-msvideo"
-    ]
-    
-    if not file.content_type or file.content_type not in allowed_video_types:
+    if not file.content_type or file.content_type not in VIDEO_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Only video files are allowed (MP4, WebM, OGG, MOV, AVI). Got: {file.content_type}"
         )
     
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix if file.filename else ".mp4"
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    # Save file
+    tmp_path = temporary_path()
+    max_video_size = settings.MAX_VIDEO_UPLOAD_SIZE
+    try:
+        digest = await stream_upload(
+            file,
+            tmp_path,
+            max_video_size,
+            f"Video file size exceeds maximum allowed size of {max_video_size / (1024*1024)}MB"
+        )
+        relative_path = existing_blob(digest)
+        if not relative_path:
+            relative_path = blob_path(digest, VIDEO_EXTENSIONS[file.content_type])
+            place_blob(tmp_path, relative_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
     
-    # Create upload directory if it doesn't exist
-    upload_dir = Path(settings.UPLOAD_DIR) / subdirectory
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    # Return relative path
+    return relative_path
+
+
+def make_video_thumbnail(video_path: str, output_subdirectory: str, frame_time: float) -> str:
+    """
+    Save one frame of a video as a JPEG thumbnail (runs in the process pool).
+
+    Raises:
+        FileNotFoundError: If the video file doesn't exist
+        ValueError: If the video can't be opened or decoded
+    """
+    import cv2
+    from PIL import Image
+
+    # Get full path to video file
+    full_video_path = Path(settings.UPLOAD_DIR) / video_path
+    if not full_video_path.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
     
-    # Save file
-    file_path = upload_dir / unique_filename
+    # Open video file
+    cap = cv2.VideoCapture(str(full_video_path))
+    if not cap.isOpened():
+        raise ValueError("Could not open video file")
     
-    # Reset file pointer
-    await file.seek(0)
+    # Get video properties
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     
-    async with aiofiles.open(file_path, "wb") as f:
-        await f.write(file_content)
+    # Calculate frame number (use 1 second or 10% of video, whichever is smaller)
+    target_frame = min(int(frame_time * fps), int(total_frames * 0.1))
+    if target_frame < 1:
+        target_frame = 1
+    
+    # Set video position to target frame
+    cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
+    
+    # Read frame
+    ret, frame = cap.read()
+    cap.release()
+    
+    if not ret or frame is None:
+        raise ValueError("Could not extract frame from video")
+    
+    # Convert BGR to RGB (OpenCV uses BGR, PIL uses RGB)
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    
+    # Convert to PIL Image
+    pil_image = Image.fromarray(frame_rgb)
+    
+    # Resize if too large (max width 800px, maintain aspect ratio)
+    max_width = 800
+    if pil_image.width > max_width:
+        ratio = max_width / pil_image.width
+        new_height = int(pil_image.height * ratio)
+        pil_image = pil_image.resize((max_width, new_height), Image.Resampling.LANCZOS)
+    
+    # Generate unique filename for thumbnail
+    unique_filename = f"{uuid.uuid4()}.jpg"
+    
+    # Create output directory
+    output_dir = Path(settings.UPLOAD_DIR) / output_subdirectory
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Save thumbnail
+    thumbnail_path = output_dir / unique_filename
+    pil_image.save(thumbnail_path, "JPEG", quality=85, optimize=True)
     
     # Return relative path
-    return f"{subdirectory}/{unique_filename}"
+    return f"{output_subdirectory}/{unique_filename}"
 
 
 async def extract_video_thumbnail(
@@ -168,73 +339,21 @@ async def extract_video_thumbnail(
         HTTPException: If video processing fails
     """
     try:
-        # Get full path to video file
-        full_video_path = Path(settings.UPLOAD_DIR) / video_path
-        if not full_video_path.exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Video file not found: {video_path}"
-            )
-        
-        # Open video file
-        cap = cv2.VideoCapture(str(full_video_path))
-        if not cap.isOpened():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not open video file"
-            )
-        
-        # Get video properties
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # Calculate frame number (use 1 second or 10% of video, whichever is smaller)
-        target_frame = min(int(frame_time * fps), int(total_frames * 0.1))
-        if target_frame < 1:
-            target_frame = 1
-        
-        # Set video position to target frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-        
-        # Read frame
-        ret, frame = cap.read()
-        cap.release()
-        
-        if not ret or frame is None:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not extract frame from video"
-            )
-        
-        # Convert BGR to RGB (OpenCV uses BGR, PIL uses RGB)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Convert to PIL Image
-        pil_image = Image.fromarray(frame_rgb)
-        
-        # Resize if too large (max width 800px, maintain aspect ratio)
-        max_width = 800
-        if pil_image.width > max_width:
-            ratio = max_width / pil_image.width
-            new_height = int(pil_image.height * ratio)
-            pil_image = pil_image.resize((max_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Generate unique filename for thumbnail
-        unique_filename = f"{uuid.uuid4()}.jpg"
-        
-        # Create output directory
-        output_dir = Path(settings.UPLOAD_DIR) / output_subdirectory
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save thumbnail
-        thumbnail_path = output_dir / unique_filename
-        pil_image.save(thumbnail_path, "JPEG", quality=85, optimize=True)
-        
-        # Return relative path
-        return f"{output_subdirectory}/{unique_filename}"
-        
+        return await processing_pool.run(
+            "video_thumbnail", make_video_thumbnail, video_path, output_subdirectory, frame_time
+        )
     except HTTPException:
         raise
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -242,16 +361,155 @@ async def extract_video_thumbnail(
         )
 
 
+# Pillow format name -> file extension of the derivatives
+VARIANT_EXTENSIONS = {"avif": ".avif", "webp": ".webp", "jpeg": ".jpg"}
+
+
+@lru_cache(maxsize=1)
+def variant_formats() -> List[str]:
+    """Configured IMAGE_VARIANT_FORMATS that this Pillow build can write."""
+    from PIL import Image
+
+    Image.init()
+    formats = []
+    for name in settings.IMAGE_VARIANT_FORMATS:
+        name = name.lower()
+        if name in VARIANT_EXTENSIONS and name.upper() in Image.SAVE:
+            formats.append(name)
+        else:
+            print(f"⚠ Warning: Image variant format '{name}' is not supported, skipping it")
+    return formats
+
+
+def make_image_variants(image_path: str) -> Dict[str, List[dict]]:
+    """
+    Write resized copies of an uploaded image next to it.
+
+    One file is written per configured width and format, named
+    <name>-<width>w.<ext>. Widths at or above the image's own width are
+    replaced by a single copy at its own width, so images are never upscaled.
+
+    Args:
+        image_path: Relative path of the original within the uploads folder
+
+    Returns:
+        Mapping of format to [{"path", "width"}] sorted by width, in
+        IMAGE_VARIANT_FORMATS order
+    """
+    from PIL import Image, ImageOps
+
+    source = Path(settings.UPLOAD_DIR) / image_path
+    stem = PurePosixPath(image_path).with_suffix("")
+    formats = variant_formats()
+    if not formats or not settings.IMAGE_VARIANT_WIDTHS:
+        return {}
+
+    written = []
+    try:
+        with Image.open(source) as original:
+            img = ImageOps.exif_transpose(original)
+            img.load()
+        widths = {width for width in settings.IMAGE_VARIANT_WIDTHS if width < img.width}
+        if img.width <= max(settings.IMAGE_VARIANT_WIDTHS):
+            widths.add(img.width)
+
+        variants = {name: [] for name in formats}
+        for width in sorted(widths):
+            resized = img
+            if width != img.width:
+                height = max(1, round(img.height * width / img.width))
+                resized = img.resize((width, height), Image.Resampling.LANCZOS)
+            for name in formats:
+                frame = resized
+                if name == "jpeg" and frame.mode not in ("RGB", "L"):
+                    frame = frame.convert("RGB")
+                elif frame.mode not in ("RGB", "RGBA", "L"):
+                    frame = frame.convert("RGBA")
+                path = f"{stem}-{width}w{VARIANT_EXTENSIONS[name]}"
+                options = {"optimize": True, "progressive": True} if name == "jpeg" else {}
+                frame.save(Path(settings.UPLOAD_DIR) / path, name.upper(), quality=settings.IMAGE_VARIANT_QUALITY, **options)
+                written.append(path)
+                variants[name].append({"path": path, "width": width})
+        return variants
+    except Exception:
+        for path in written:
+            delete_file(path)
+        raise
+
+
+def image_variants_json(image_path: Optional[str]) -> Optional[str]:
+    """
+    Create the responsive derivatives of an uploaded image.
+
+    Failures are reported but not raised; the row then has no variants
+    and clients fall back to image_path.
+
+    Args:
+        image_path: Relative path of the original within the uploads folder
+
+    Returns:
+        JSON for the owning row's image_variants column, or None
+    """
+    if not image_path or not (Path(settings.UPLOAD_DIR) / image_path).is_file():
+        return None
+    try:
+        variants = make_image_variants(image_path)
+    except Exception as e:
+        print(f"⚠ Warning: Could not create image variants for {image_path}: {e}")
+        return None
+    return json.dumps(variants) if variants else None
+
+
+async def create_image_variants(image_path: Optional[str]) -> Optional[str]:
+    """
+    image_variants_json() in the process pool. If the pool is busy the row
+    is left without variants; python -m app.image_variants fills them in.
+    A stored image that already has variants reuses them.
+    """
+    if is_blob_path(image_path):
+        variants = await stored_variants(image_path)
+        if variants is not None:
+            return variants
+    try:
+        return await processing_pool.run("variants", image_variants_json, image_path)
+    except HTTPException as e:
+        print(f"⚠ Warning: Could not create image variants for {image_path}: {e.detail}")
+        return None
+
+
+def delete_image_variants(image_variants: Optional[str]) -> None:
+    """
+    Delete the derivative files recorded in an image_variants column.
+
+    Args:
+        image_variants: JSON as returned by create_image_variants
+    """
+    if not image_variants:
+        return
+    try:
+        variants = json.loads(image_variants)
+    except ValueError:
+        return
+    for entries in variants.values():
+        for entry in entries:
+            delete_file(entry["path"])
+
+
 def delete_file(file_path: str) -> bool:
     """
     Delete a file from the uploads directory.
     
+    Stored blobs are left alone: they are deleted once no row refers to
+    them (see app/uploads.py).
+    
     Args:
         file_path: Relative path to the file
         
     Returns:
         True if file was deleted, False otherwise
     """
+    if is_blob_path(file_path):
+        return False
     try:
         full_path = Path(settings.UPLOAD_DIR) / file_path
         if full_path.exists():
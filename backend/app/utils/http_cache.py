@@ -0,0 +1,262 @@
+"""
+HTTP conditional request utilities (ETag, Last-Modified and 304 responses).
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from fastapi import Request, Response, status
+from sqlalchemy import Select, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.cache import CacheResult, content_cache
+from app.cache_backends import register_record_type
+from app.database import SessionLocal
+from app.utils.compression import compress_variants, negotiate_encoding, weak_etag
+from app.utils.serialization import encode_json
+
+
+@register_record_type
+class CollectionEntry(NamedTuple):
+    """Pre-serialized public response body together with its HTTP validators."""
+    data: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    # (encoding, body) pairs compressed once when the entry is built
+    variants: Tuple[Tuple[str, bytes], ...] = ()
+
+
+def make_entry(data: bytes, etag: str, last_modified: Optional[datetime]) -> CollectionEntry:
+    """Build a CollectionEntry with its precompressed variants."""
+    return CollectionEntry(data, etag, last_modified, compress_variants(data))
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Return a timezone-aware UTC datetime (SQLite stores naive UTC)."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def compute_validators(
+    db: Session,
+    query: Select,
+    model,
+    *key_parts: Any
+) -> Tuple[str, Optional[datetime]]:
+    """
+    Compute ETag and Last-Modified for a filtered query with one aggregate.
+
+    The row count and id sum are folded into the ETag so that deletions
+    change it even when they don't move the newest timestamp. Edits move
+    it because updated_at is set with microseconds (see utcnow() in
+    app/database.py). Takes a sync Session; async handlers call it through
+    AsyncSession.run_sync().
+
+    Args:
+        db: Database session
+        query: Filtered select (without ordering or pagination)
+        model: Model class the query selects from
+        key_parts: Extra values that distinguish this result set
+
+    Returns:
+        Tuple of (quoted strong ETag, Last-Modified or None if no rows)
+    """
+    count, id_sum, last_modified = db.execute(
+        query.with_only_columns(
+            func.count(model.id),
+            func.coalesce(func.sum(model.id), 0),
+            func.max(func.coalesce(model.updated_at, model.created_at))
+        ).order_by(None)
+    ).one()
+    last_modified = as_utc(last_modified)
+
+    seed = repr((key_parts, count, id_sum, last_modified.isoformat() if last_modified else None))
+    etag = '"' + hashlib.sha1(seed.encode("utf-8")).hexdigest() + '"'
+    return etag, last_modified
+
+
+def validator_headers(
+    etag: str,
+    last_modified: Optional[datetime],
+    result: Optional[CacheResult] = None
+) -> Dict[str, str]:
+    """
+    Build the caching headers sent with 200 and 304 responses.
+
+    Stale cache results also carry Age and a Warning (110 while a refresh
+    runs, 111 when the database could not be read).
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    if result is not None and result.stale:
+        headers["Age"] = str(int(result.age))
+        if result.error:
+            headers["Warning"] = '111 - "Revalidation Failed"'
+        else:
+            headers["Warning"] = '110 - "Response is Stale"'
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(
+    etag: str,
+    last_modified: Optional[datetime],
+    result: Optional[CacheResult] = None
+) -> Response:
+    """Build an empty 304 response carrying the validators."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified, result)
+    )
+
+
+def json_response(
+    entry: CollectionEntry,
+    result: Optional[CacheResult] = None,
+    encoding: Optional[str] = None
+) -> Response:
+    """
+    Serve a cached body as-is, skipping response_model validation.
+
+    With an encoding, the matching precompressed variant is sent instead
+    (under a weak ETag, as the bytes differ from the identity body).
+    """
+    body, etag = entry.data, entry.etag
+    headers = {}
+    if entry.variants:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        body = dict(entry.variants)[encoding]
+        etag = weak_etag(etag)
+        headers["Content-Encoding"] = encoding
+    headers.update(validator_headers(etag, entry.last_modified, result))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def serve_entry(request: Request, result: CacheResult) -> Response:
+    """Answer a request from a cached CollectionEntry (200 or 304)."""
+    entry = result.value
+    encoding = negotiate_encoding(
+        request.headers.get("accept-encoding"),
+        [name for name, _ in entry.variants]
+    )
+    if is_not_modified(request, entry.etag, entry.last_modified):
+        etag = weak_etag(entry.etag) if encoding is not None else entry.etag
+        return not_modified_response(etag, entry.last_modified, result)
+    return json_response(entry, result, encoding)
+
+
+async def cached_collection(
+    request: Request,
+    db: AsyncSession,
+    namespace: str,
+    params: dict,
+    query: Select,
+    model,
+    loader: Callable[[Session, Select], Any]
+) -> Response:
+    """
+    Serve a public collection from a pre-serialized snapshot with conditional GET.
+
+    The loader's result is validated, JSON-encoded and compressed once and the
+    bytes are kept in the content cache until the owning router writes. On a
+    cache hit the stored body (or its gzip/Brotli variant) and validators
+    answer the request without touching the database or Pydantic. On a miss an aggregate query produces the validators
+    first, so a matching If-None-Match/If-Modified-Since returns 304 without
+    loading any rows.
+
+    Snapshots past the freshness window are served while one background
+    refresh runs, and if the database fails the last-known-good snapshot is
+    served with a Warning instead of an error.
+
+    Args:
+        request: Incoming request (for conditional headers)
+        db: Async database session
+        namespace: Content cache namespace
+        params: Query parameters that shape the result
+        query: Filtered select (without ordering or pagination)
+        model: Model class the query selects from
+        loader: Callable taking a sync Session and the filtered select and
+            returning response models. It runs through AsyncSession.run_sync()
+            in the request and with its own Session for background refreshes.
+
+    Returns:
+        200 Response with the cached JSON body, or a 304 Response
+    """
+    key_parts = (namespace, sorted(params.items()))
+
+    def refresh() -> CollectionEntry:
+        with SessionLocal() as session:
+            etag, last_modified = compute_validators(session, query, model, *key_parts)
+            data = loader(session, query)
+        return make_entry(encode_json(data), etag, last_modified)
+
+    async def load(etag: str, last_modified: Optional[datetime]) -> CollectionEntry:
+        data = await db.run_sync(loader, query)
+        # Return the connection to the pool before serializing and compressing
+        await db.close()
+        return make_entry(encode_json(data), etag, last_modified)
+
+    result = await content_cache.alookup(namespace, params, refresh)
+    if result is None:
+        try:
+            etag, last_modified = await db.run_sync(compute_validators, query, model, *key_parts)
+        except SQLAlchemyError:
+            result = await content_cache.afallback(namespace, params)
+            if result is None:
+                raise
+        else:
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+            result = await content_cache.aget_or_load(
+                namespace,
+                params,
+                lambda: load(etag, last_modified),
+                refresh=refresh
+            )
+    return serve_entry(request, result)
+
+
+async def conditional_item(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    query: Select,
+    model
+) -> Optional[Response]:
+    """
+    Apply conditional GET to a single-row detail query.
+
+    Sets the validators on the response and returns a 304 Response when the
+    client's copy is current. Returns None when the row should be loaded
+    normally, including when it does not exist.
+    """
+    etag, last_modified = await db.run_sync(compute_validators, query, model)
+    if last_modified is None:
+        return None
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(validator_headers(etag, last_modified))
+    return None
@@ -0,0 +1,98 @@
+"""
+Keyset (cursor) pagination on (created_at, id) for newest-first lists.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, String, desc, tuple_, type_coerce
+
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Raises:
+        HTTPException: 400 if the cursor was not issued by this API
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(row_id, int):
+            raise ValueError(cursor)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return created_at, row_id
+
+
+def sort_key(created_column, dialect_name: str):
+    """
+    The created_at column as read and compared by the cursor.
+
+    SQLite keeps DATETIME values as text in whatever format they were written
+    with (CURRENT_TIMESTAMP has no microseconds, SQLAlchemy adds them), so
+    the cursor carries and compares the stored text to stay exact.
+    """
+    if dialect_name == "sqlite":
+        return type_coerce(created_column, String)
+    return created_column
+
+
+def keyset_query(
+    query: Select,
+    model,
+    dialect_name: str,
+    cursor: Optional[str],
+    skip: int,
+    limit: int
+) -> Select:
+    """
+    Order a filtered select newest first and cut one page out of it.
+
+    The sort key is added as a last column so each row comes back as
+    (instance, key). With a cursor the page starts right after the cursor
+    row through an index range on (created_at, id), so deep pages cost the
+    same as the first one; without one the legacy skip offset applies.
+
+    Args:
+        query: Filtered select of the model (without ordering or pagination)
+        model: Model class with created_at and id columns
+        dialect_name: Dialect of the session the query runs on
+        cursor: next_cursor of the previous page, or None / "" for the first page
+        skip: Offset used when no cursor is given
+        limit: Page size
+    """
+    key = sort_key(model.created_at, dialect_name)
+    query = query.add_columns(key.label("cursor_key")).order_by(desc(model.created_at), desc(model.id))
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if dialect_name != "sqlite":
+            created_at = datetime.fromisoformat(created_at)
+        return query.where(tuple_(key, model.id) < tuple_(created_at, row_id)).limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+def page_items(rows: Sequence, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split (instance, key) rows from keyset_query() into items and next_cursor.
+
+    next_cursor is None once a page comes back short (there is nothing after it).
+    """
+    items = [row[0] for row in rows]
+    if len(rows) < limit or not rows:
+        return items, None
+    last, key = rows[-1]
+    return items, encode_cursor(key, last.id)
@@ -0,0 +1,33 @@
+"""
+Fast JSON encoding for pre-serialized public responses.
+"""
+import json
+from typing import Any
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode Pydantic models the same way FastAPI's response_model does."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    Encode data (which may contain Pydantic models) to compact JSON bytes.
+
+    Args:
+        data: Lists, dicts and Pydantic response models
+
+    Returns:
+        UTF-8 encoded JSON body
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,99 @@
+"""
+Request body size limits, enforced before the body is parsed.
+
+FastAPI reads a whole multipart body into spooled temporary files before
+the endpoint runs, so save_uploaded_file's size check alone still lets a
+client send any amount first. This middleware answers a Content-Length over
+the route's limit with 413 without reading the body, and counts the bytes
+of bodies sent without one, cutting them off once they pass the limit.
+"""
+import json
+import re
+from typing import Iterable, List, Pattern, Tuple
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Allowance for form fields and multipart framing on top of the file sizes
+FORM_OVERHEAD = 1024 * 1024
+
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+
+class UploadLimitMiddleware:
+    """
+    Reject request bodies larger than the limit for their path.
+
+    Args:
+        app: The wrapped application
+        default_limit: Limit in bytes for paths not listed in limits
+        limits: (path regex, limit in bytes) pairs; the first match applies
+    """
+
+    def __init__(self, app: ASGIApp, default_limit: int, limits: Iterable[Tuple[str, int]] = ()):
+        self.app = app
+        self.default_limit = default_limit
+        self.limits: List[Tuple[Pattern, int]] = [(re.compile(pattern), limit) for pattern, limit in limits]
+
+    def limit_for(self, path: str) -> int:
+        for pattern, limit in self.limits:
+            if pattern.fullmatch(path):
+                return limit
+        return self.default_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in BODY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await send_too_large(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # The app sees a disconnect and stops parsing; its response is replaced below
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message) -> None:
+            nonlocal started
+            if exceeded and not started:
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            if not exceeded or started:
+                raise
+        if exceeded and not started:
+            await send_too_large(send, limit)
+
+
+async def send_too_large(send: Send, limit: int) -> None:
+    """Send a 413 response and ask the client to close the connection."""
+    body = json.dumps({"detail": f"Request body exceeds maximum allowed size of {limit} bytes"}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"connection", b"close"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
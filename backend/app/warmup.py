@@ -0,0 +1,100 @@
+"""
+Content cache warm-up after a deploy or worker restart.
+
+Every public page bundle and collection the website requests is fetched
+once through the app itself, so the cache holds the same serialized and
+compressed entries real requests would create. /health reports the worker
+as not ready until this has finished, so the load balancer holds traffic
+until then.
+"""
+import time
+from typing import Dict, List
+from starlette.types import ASGIApp
+from app.models.portfolio import ProjectStatus
+from app.routers.pages import PAGES
+
+# Public collections requested by js/api-client.js when a page bundle misses
+COLLECTION_PATHS = [
+    "/api/carousel?active_only=true",
+    "/api/services?active_only=true",
+    "/api/portfolio?active_only=true",
+    *(f"/api/portfolio?active_only=true&status_filter={status.value}" for status in ProjectStatus),
+    "/api/blog?published_only=true",
+    "/api/faqs?active_only=true",
+    "/api/about?active_only=true",
+    "/api/contact/info?active_only=true",
+    "/api/statistics?active_only=true",
+    "/api/partners?active_only=true",
+    "/api/licenses?active_only=true",
+]
+
+
+def warmup_paths() -> List[str]:
+    """Every page bundle followed by the public collections."""
+    return [f"/api/pages/{page}" for page in PAGES] + COLLECTION_PATHS
+
+
+class Readiness:
+    """Whether this worker has finished warming up and should receive traffic."""
+
+    def __init__(self):
+        self.ready = False
+        self.duration: float = 0.0
+        self.failed: List[str] = []
+
+
+readiness = Readiness()
+
+
+async def asgi_get(app: ASGIApp, url: str) -> int:
+    """Run one GET request through the ASGI app in-process and return its status."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": query.encode("ascii"),
+        "root_path": "",
+        "headers": [(b"host", b"warmup")],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+    }
+    status_code = 500
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def warm_up(app: ASGIApp) -> Dict[str, int]:
+    """
+    Load every public page bundle and collection into the content cache,
+    then mark the worker ready. Failures are reported but don't keep the
+    worker out of rotation; those requests are simply served cold.
+
+    Returns:
+        Mapping of path to response status
+    """
+    start = time.perf_counter()
+    statuses = {}
+    for path in warmup_paths():
+        try:
+            statuses[path] = await asgi_get(app, path)
+        except Exception as e:
+            print(f"⚠ Warning: Could not warm up {path}: {e}")
+            statuses[path] = 500
+    readiness.failed = [path for path, code in statuses.items() if code != 200]
+    readiness.duration = time.perf_counter() - start
+    readiness.ready = True
+    return statuses
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark request latency while one slow database request is running.
+
+"Before" replays the original handler style (async def handlers calling a
+sync Session, which blocks the event loop); "after" is the current app on
+AsyncSession. In both cases a stream of detail requests runs alone and then
+alongside one slow query; with the async layer p99 should stay flat.
+On a single CPU the slow query still competes for the core, so some
+tail latency remains even when the event loop is never blocked.
+
+Usage: python benchmarks/bench_concurrency.py [concurrency] [slow_rows]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+SLOW_ROWS = int(sys.argv[2]) if len(sys.argv) > 2 else 3_000_000
+
+_tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["UPLOAD_DIR"] = f"{_tmp_dir}/uploads"
+os.environ["PUBLISH_DIR"] = f"{_tmp_dir}/public"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal, engine, get_db
+from app.main import app
+from app.models.service import Service
+from app.schemas.service import ServiceResponse
+
+# Recursive CTE that keeps SQLite busy for roughly a second
+SLOW_SQL = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) "
+    "SELECT count(*) FROM c"
+)
+
+baseline = FastAPI()
+
+
+def get_sync_db():
+    """Sync session dependency, as the original handlers used."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@baseline.get("/api/services/{service_id}", response_model=ServiceResponse)
+async def baseline_service(service_id: int, db: Session = Depends(get_sync_db)):
+    service = db.query(Service).filter(Service.id == service_id).first()
+    if not service:
+        raise HTTPException(status_code=404)
+    return service
+
+
+@baseline.get("/slow")
+async def baseline_slow(db: Session = Depends(get_sync_db)):
+    return {"count": db.execute(SLOW_SQL, {"n": SLOW_ROWS}).scalar()}
+
+
+@app.get("/slow", include_in_schema=False)
+async def async_slow(db: AsyncSession = Depends(get_db)):
+    return {"count": (await db.execute(SLOW_SQL, {"n": SLOW_ROWS})).scalar()}
+
+
+def seed() -> None:
+    """Create a handful of services for the detail requests."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add_all(
+            Service(title=f"Service {i}", description="Topoqrafik planalma", image_path=f"services/{i}.jpg", order=i)
+            for i in range(50)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def fast_requests(client: httpx.AsyncClient, until: asyncio.Event, latencies: list) -> None:
+    """Issue detail requests back to back until the event is set."""
+    i = 0
+    while not until.is_set():
+        start = time.perf_counter()
+        response = await client.get(f"/api/services/{i % 50 + 1}")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        i += 1
+
+
+async def measure(target: FastAPI, with_slow: bool) -> list:
+    """Return fast-request latencies (ms) over the slow request, or 1 s alone."""
+    latencies: list = []
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        workers = [asyncio.create_task(fast_requests(client, done, latencies)) for _ in range(CONCURRENCY)]
+        await asyncio.sleep(0.1)
+        latencies.clear()
+        if with_slow:
+            (await client.get("/slow")).raise_for_status()
+        else:
+            await asyncio.sleep(1.0)
+        done.set()
+        await asyncio.gather(*workers)
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main():
+    seed()
+    print(f"{CONCURRENCY} concurrent detail requests, slow query over {SLOW_ROWS} rows")
+    print(f"{'case':<34}{'requests':>10}{'p50 (ms)':>11}{'p99 (ms)':>11}{'max (ms)':>11}")
+    for label, target in (("before (sync Session)", baseline), ("after (AsyncSession)", app)):
+        for with_slow in (False, True):
+            latencies = await measure(target, with_slow)
+            case = f"{label}, {'with slow query' if with_slow else 'idle'}"
+            print(
+                f"{case:<34}{len(latencies):>10}{statistics.median(latencies):>11.2f}"
+                f"{percentile(latencies, 99):>11.2f}{max(latencies):>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark /media resizing: a cold render against a cache hit, a burst of
+concurrent requests for one uncached size, and a sweep over every allowed
+width with a small cache budget.
+
+Exits with status 1 if the burst caused more than one render, or if the
+cache ends up over its byte budget.
+
+Usage: python benchmarks/bench_media.py [concurrency] [budget_kb]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+BUDGET_BYTES = (int(sys.argv[2]) if len(sys.argv) > 2 else 512) * 1024
+
+
+
+async def timed(client, url: str) -> float:
+    start = time.perf_counter()
+    response = await client.get(url)
+    assert response.status_code == 200, (url, response.text)
+    return (time.perf_counter() - start) * 1000
+
+
+async def main() -> int:
+    # Set up here rather than at import: process pool children re-import this module
+    tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+    os.environ["UPLOAD_DIR"] = f"{tmp_dir}/uploads"
+    os.environ["PUBLISH_DIR"] = f"{tmp_dir}/public"
+    os.environ["MEDIA_CACHE_DIR"] = f"{tmp_dir}/media"
+    os.environ["MEDIA_CACHE_MAX_BYTES"] = str(BUDGET_BYTES)
+    os.environ["WARMUP_ON_STARTUP"] = "false"
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    import httpx
+    from PIL import Image
+    from app.config import settings
+    from app.main import app
+    from app.media_cache import media_cache
+    from app.processing import processing_pool
+
+    def renders() -> int:
+        return processing_pool.stats["media"].jobs
+
+    Path(settings.UPLOAD_DIR, "bench").mkdir(parents=True)
+    gradient = Image.linear_gradient("L").resize((3000, 2000))
+    noise = Image.effect_noise((3000, 2000), 20)
+    photo = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_180)))
+    photo.save(Path(settings.UPLOAD_DIR, "bench/photo.jpg"), quality=90)
+    failures = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        first = await timed(client, "/media/bench/photo.jpg?h=160&fmt=jpeg")
+        print(f"first render: {first:8.1f} ms (includes starting the process pool)")
+        url = "/media/bench/photo.jpg?w=640&fmt=webp"
+        cold = await timed(client, url)
+        hits = [await timed(client, url) for _ in range(50)]
+        print(f"cold render:  {cold:8.1f} ms")
+        print(f"cache hit:    {statistics.median(hits):8.1f} ms (median of 50)")
+
+        before = renders()
+        start = time.perf_counter()
+        await asyncio.gather(*(timed(client, "/media/bench/photo.jpg?w=800&fmt=webp") for _ in range(CONCURRENCY)))
+        burst_renders = renders() - before
+        print(f"{CONCURRENCY} concurrent:{(time.perf_counter() - start) * 1000:8.1f} ms, {burst_renders} render(s)")
+        if burst_renders != 1:
+            failures.append(f"{CONCURRENCY} concurrent requests caused {burst_renders} renders")
+
+        for width in settings.MEDIA_WIDTHS:
+            await timed(client, f"/media/bench/photo.jpg?w={width}&fmt=jpeg")
+        count, total = media_cache._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM media_files").fetchone()
+        on_disk = sum(path.stat().st_size for path in media_cache.directory.glob("*/*") if path.is_file())
+        print(f"after sweep:  {count} files, {total / 1024:.0f} KB indexed, {on_disk / 1024:.0f} KB on disk "
+              f"(budget {BUDGET_BYTES / 1024:.0f} KB)")
+        if on_disk > BUDGET_BYTES:
+            failures.append(f"cache holds {on_disk} bytes, over its budget of {BUDGET_BYTES}")
+    processing_pool.shutdown()
+
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    if not failures:
+        print("✓ One render per burst and cache within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
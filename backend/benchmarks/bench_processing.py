@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark how image uploads affect other requests on the same worker.
+
+While a batch of concurrent image uploads runs, a cached public GET is
+scheduled every 10 ms and its latency recorded from when it was due, so
+time the event loop spent blocked counts against it. Each mode runs in a
+fresh interpreter:
+
+- inline: image work on the event loop, as save_uploaded_file used to do
+- thread: the pool's fallback (PROCESS_POOL_WORKERS=0)
+- pool:   PROCESS_POOL_WORKERS child processes (the default)
+
+Exits with status 1 if the pool mode's p99 latency exceeds the budget or
+any of its uploads fail.
+
+Usage: python benchmarks/bench_processing.py [uploads] [p99_budget_ms] [workers]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+UPLOADS = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+P99_BUDGET_MS = float(sys.argv[2]) if len(sys.argv) > 2 else 100.0
+WORKERS = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter; prints one JSON line
+WORKER = """
+import asyncio, io, json, statistics, sys, time
+import httpx
+from PIL import Image
+from app.config import settings
+from app.db_init import init_db
+from app.main import app
+from app.processing import processing_pool
+
+mode, uploads = sys.argv[1], int(sys.argv[2])
+if mode == "inline":
+    async def run_inline(stage, fn, *args):
+        return fn(*args)
+    processing_pool.run = run_inline
+
+def photo():
+    gradient = Image.linear_gradient("L").resize((2400, 1600))
+    noise = Image.effect_noise((2400, 1600), 20)
+    buffer = io.BytesIO()
+    Image.merge("RGB", (gradient, noise, gradient)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+async def main():
+    init_db()
+    body = photo()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+        login = await client.post("/api/auth/login/json", json={
+            "username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD})
+        headers = {"Authorization": "Bearer " + login.json()["access_token"]}
+
+        async def upload():
+            try:
+                response = await client.post("/api/carousel", data={"title": "Bench"},
+                                             files={"image": ("photo.png", body, "image/png")}, headers=headers)
+                return response.status_code == 201
+            except Exception:
+                # e.g. "database is locked" when a blocked loop holds a write transaction open
+                return False
+
+        # Start the pool (and cache the GET) before measuring
+        await upload()
+        await client.get("/api/faqs?active_only=true")
+
+        latencies = []
+        done = asyncio.Event()
+
+        async def ping():
+            due = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/api/faqs?active_only=true")
+                now = time.perf_counter()
+                latencies.append((now - due) * 1000)
+                # Pings missed while the loop was blocked aren't sent late in a burst
+                due = max(due + 0.01, now)
+
+        pinger = asyncio.create_task(ping())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(upload() for _ in range(uploads)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await pinger
+    processing_pool.shutdown()
+    latencies.sort()
+    print(json.dumps({
+        "uploads_s": elapsed,
+        "failed": results.count(False),
+        "pings": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+        "max_ms": latencies[-1],
+    }))
+
+asyncio.run(main())
+"""
+
+
+def run_mode(mode: str) -> dict:
+    """Run one mode in a fresh interpreter with its own database and uploads."""
+    tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_dir}/bench.db",
+        "UPLOAD_DIR": f"{tmp_dir}/uploads",
+        "PUBLISH_DIR": f"{tmp_dir}/public",
+        "PUBLISH_ON_WRITE": "false",
+        "WARMUP_ON_STARTUP": "false",
+        "PROCESS_POOL_WORKERS": "0" if mode == "thread" else str(WORKERS),
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, mode, str(UPLOADS)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"{mode} run failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    print(f"{UPLOADS} concurrent uploads (2400x1600), {WORKERS} pool workers, {os.cpu_count()} CPUs")
+    print(f"{'mode':<10}{'uploads (s)':>13}{'failed':>8}{'pings':>8}{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}")
+    results = {}
+    for mode in ("inline", "thread", "pool"):
+        result = results[mode] = run_mode(mode)
+        print(
+            f"{mode:<10}{result['uploads_s']:>13.2f}{result['failed']:>8}{result['pings']:>8}"
+            f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['max_ms']:>10.1f}"
+        )
+
+    print()
+    pool = results["pool"]
+    failures = []
+    if pool["p99_ms"] > P99_BUDGET_MS:
+        failures.append(f"p99 latency during uploads {pool['p99_ms']:.1f} ms exceeds budget of {P99_BUDGET_MS:.0f} ms")
+    if pool["failed"]:
+        failures.append(f"{pool['failed']} uploads failed")
+    for failure in failures:
+        print(f"✗ {failure}")
+    if not failures:
+        print(f"✓ p99 latency during uploads within budget ({P99_BUDGET_MS:.0f} ms)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request CPU of public list endpoints before and after
+pre-serialized JSON snapshots.
+
+"Before" replays the original handlers (query + response_model validation on
+every request); "after" is the current app serving cached snapshot bytes.
+
+Usage: python benchmarks/bench_snapshots.py [rows] [requests]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+_tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["UPLOAD_DIR"] = f"{_tmp_dir}/uploads"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import asc, desc
+from sqlalchemy.orm import Session
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models.blog import BlogPost
+from app.models.service import Service
+from app.schemas.blog import BlogPostResponse
+from app.schemas.service import ServiceResponse
+
+baseline = FastAPI()
+
+
+def get_sync_db():
+    """Sync session dependency, as the original handlers used."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@baseline.get("/api/services", response_model=List[ServiceResponse])
+async def baseline_services(limit: int = 100, active_only: bool = False, db: Session = Depends(get_sync_db)):
+    query = db.query(Service)
+    if active_only:
+        query = query.filter(Service.is_active == True)
+    return query.order_by(asc(Service.order)).limit(limit).all()
+
+
+@baseline.get("/api/blog", response_model=List[BlogPostResponse])
+async def baseline_blog(limit: int = 100, published_only: bool = False, db: Session = Depends(get_sync_db)):
+    query = db.query(BlogPost)
+    if published_only:
+        query = query.filter(BlogPost.is_published == True)
+    return query.order_by(desc(BlogPost.created_at)).limit(limit).all()
+
+
+def seed(rows: int) -> None:
+    """Fill services and blog_posts with rows of realistic size."""
+    Base.metadata.create_all(bind=engine)
+    paragraph = "Geodezi ölçmə işləri və topoqrafik planalma. " * 40
+    db = SessionLocal()
+    try:
+        db.add_all(
+            Service(title=f"Service {i}", description=paragraph, image_path=f"services/{i}.jpg", order=i)
+            for i in range(rows)
+        )
+        db.add_all(
+            BlogPost(title=f"Post {i}", excerpt=paragraph[:200], content=paragraph, is_published=True)
+            for i in range(rows)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def cpu_per_request(client: TestClient, url: str, requests: int) -> float:
+    """Return mean CPU milliseconds per request (after one warm-up request)."""
+    client.get(url).raise_for_status()
+    start = time.process_time()
+    for _ in range(requests):
+        client.get(url)
+    return (time.process_time() - start) * 1000 / requests
+
+
+def main():
+    seed(ROWS)
+    before_client = TestClient(baseline)
+    after_client = TestClient(app)
+
+    print(f"{ROWS} rows per table, {REQUESTS} requests per case, limit={ROWS}")
+    print(f"{'endpoint':<40}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for url in (f"/api/services?active_only=true&limit={ROWS}", f"/api/blog?published_only=true&limit={ROWS}"):
+        before = cpu_per_request(before_client, url, REQUESTS)
+        after = cpu_per_request(after_client, url, REQUESTS)
+        print(f"{url.split('?')[0]:<40}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
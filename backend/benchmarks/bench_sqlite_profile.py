@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent reads and writes on SQLite with and without the
+engine profile from app.database (WAL, synchronous=NORMAL, mmap, cache,
+busy_timeout, temp_store).
+
+"Before" is the original engine (rollback journal, default pragmas);
+"after" uses engine_options() and apply_engine_profile(). Reader processes
+run detail and list queries while writer processes insert contact form
+submissions, as uvicorn workers would.
+
+Usage: python benchmarks/bench_sqlite_profile.py [seconds] [readers] [writers]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+READERS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+WRITERS = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+_tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["UPLOAD_DIR"] = f"{_tmp_dir}/uploads"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, apply_engine_profile, engine_options
+from app.models.contact import ContactSubmission
+from app.models.service import Service
+
+
+def make_engine(url: str, profile: bool):
+    if not profile:
+        return create_engine(url, connect_args={"check_same_thread": False})
+    engine = create_engine(url, **engine_options(url))
+    apply_engine_profile(engine)
+    return engine
+
+
+def seed(url: str, profile: bool) -> None:
+    """Create the schema and 1000 services."""
+    engine = make_engine(url, profile)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            Service(title=f"Service {i}", description="Topoqrafik planalma " * 20, image_path=f"s/{i}.jpg", order=i)
+            for i in range(1000)
+        )
+        db.commit()
+    engine.dispose()
+
+
+def reader(url: str, profile: bool, deadline: float, results) -> None:
+    Session = sessionmaker(bind=make_engine(url, profile))
+    ops = errors = 0
+    i = 0
+    while time.time() < deadline:
+        try:
+            with Session() as db:
+                db.get(Service, i % 1000 + 1)
+                db.scalars(select(Service).order_by(Service.order).limit(20)).all()
+            ops += 1
+        except OperationalError:
+            errors += 1
+        i += 1
+    results.put(("read", ops, errors))
+
+
+def writer(url: str, profile: bool, deadline: float, results) -> None:
+    Session = sessionmaker(bind=make_engine(url, profile))
+    ops = errors = 0
+    while time.time() < deadline:
+        try:
+            with Session() as db:
+                db.add_all(
+                    ContactSubmission(name="Bench", email="bench@example.com", message="Salam " * 50)
+                    for _ in range(10)
+                )
+                db.commit()
+            ops += 1
+        except OperationalError:
+            errors += 1
+    results.put(("write", ops, errors))
+
+
+def run(profile: bool) -> dict:
+    url = f"sqlite:///{_tmp_dir}/bench-{'after' if profile else 'before'}.db"
+    seed(url, profile)
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    deadline = time.time() + SECONDS
+    procs = [ctx.Process(target=reader, args=(url, profile, deadline, results)) for _ in range(READERS)]
+    procs += [ctx.Process(target=writer, args=(url, profile, deadline, results)) for _ in range(WRITERS)]
+    for proc in procs:
+        proc.start()
+    totals = {"read": [0, 0], "write": [0, 0]}
+    for _ in procs:
+        kind, ops, errors = results.get()
+        totals[kind][0] += ops
+        totals[kind][1] += errors
+    for proc in procs:
+        proc.join()
+    return totals
+
+
+def main():
+    print(f"{READERS} reader and {WRITERS} writer processes, {SECONDS:.0f} s per profile")
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'read errors':>14}{'write errors':>14}")
+    for label, profile in (("before", False), ("after", True)):
+        totals = run(profile)
+        print(
+            f"{label:<10}{totals['read'][0] / SECONDS:>12.0f}{totals['write'][0] / SECONDS:>12.0f}"
+            f"{totals['read'][1]:>14}{totals['write'][1]:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
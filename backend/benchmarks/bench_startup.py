@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark worker cold start: import time of app.main, lifespan startup
+time and peak RSS, each measured in a fresh interpreter as a new uvicorn
+worker would start.
+
+"Before" imports OpenCV, NumPy and Pillow up front, as app.utils.file_upload
+used to; "after" is the current app, which loads them on first upload.
+Exits with status 1 if the current app exceeds the import time or RSS
+budget, or if importing it loads any of those modules.
+
+Usage: python benchmarks/bench_startup.py [workers] [import_budget_ms] [rss_budget_mb]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+IMPORT_BUDGET_MS = float(sys.argv[2]) if len(sys.argv) > 2 else 2000.0
+RSS_BUDGET_MB = float(sys.argv[3]) if len(sys.argv) > 3 else 100.0
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("cv2", "numpy", "PIL")
+
+_tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+ENV = {
+    **os.environ,
+    "DATABASE_URL": f"sqlite:///{_tmp_dir}/bench.db",
+    "UPLOAD_DIR": f"{_tmp_dir}/uploads",
+    "PUBLISH_DIR": f"{_tmp_dir}/public",
+}
+
+# Runs in the child interpreter; prints one JSON line
+WORKER = """
+import asyncio, json, resource, sys, time
+eager = sys.argv[1] == "eager"
+start = time.perf_counter()
+if eager:
+    import cv2, numpy, PIL.Image
+import app.main
+imported = time.perf_counter()
+
+async def startup():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        pass
+
+asyncio.run(startup())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (time.perf_counter() - imported) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def start_worker(mode: str) -> dict:
+    """Start one fresh interpreter and return its measurements."""
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER, mode],
+        cwd=BACKEND_DIR, env=ENV, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    # First start creates the database, so later ones see a current schema
+    start_worker("lazy")
+    print(f"{WORKERS} cold starts per case")
+    print(f"{'case':<30}{'import (ms)':>13}{'startup (ms)':>14}{'RSS (MB)':>10}")
+    results = {}
+    for label, mode in (("before (eager cv2/numpy/PIL)", "eager"), ("after (lazy)", "lazy")):
+        runs = [start_worker(mode) for _ in range(WORKERS)]
+        results[mode] = runs
+        print(
+            f"{label:<30}{statistics.median(r['import_ms'] for r in runs):>13.1f}"
+            f"{statistics.median(r['startup_ms'] for r in runs):>14.1f}"
+            f"{max(r['rss_mb'] for r in runs):>10.1f}"
+        )
+
+    runs = results["lazy"]
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    rss_mb = max(r["rss_mb"] for r in runs)
+    heavy = sorted({name for r in runs for name in r["heavy"]})
+    failures = []
+    if import_ms > IMPORT_BUDGET_MS:
+        failures.append(f"import time {import_ms:.0f} ms exceeds budget of {IMPORT_BUDGET_MS:.0f} ms")
+    if rss_mb > RSS_BUDGET_MB:
+        failures.append(f"RSS {rss_mb:.1f} MB exceeds budget of {RSS_BUDGET_MB:.0f} MB")
+    if heavy:
+        failures.append(f"importing app.main loaded {', '.join(heavy)}")
+
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    if not failures:
+        print(f"✓ Within budget ({IMPORT_BUDGET_MS:.0f} ms import, {RSS_BUDGET_MB:.0f} MB RSS)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
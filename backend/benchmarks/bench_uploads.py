@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory use and early rejection of large uploads.
+
+- a video upload under the limit, with the peak Python memory allocated
+  while it is received and saved
+- a body whose Content-Length is over the limit, which should get a 413
+  before any of it is read
+- the same body sent without a Content-Length, which should be cut off
+  shortly after passing the limit
+
+Exits with status 1 if the upload's peak memory exceeds the budget, or if
+an oversized body gets anything but a 413 or is read well past the limit.
+
+Usage: python benchmarks/bench_uploads.py [video_mb] [memory_budget_mb]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+VIDEO_MB = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+MEMORY_BUDGET = (int(sys.argv[2]) if len(sys.argv) > 2 else 16) * 1024 * 1024
+
+MB = 1024 * 1024
+BOUNDARY = "geoline-bench-boundary"
+
+
+class MultipartBody:
+    """A title field and a zero-filled video part, generated in 1 MB pieces."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.sent = 0
+        self.head = (
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"title\"\r\n\r\nBench\r\n"
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"video_file\"; filename=\"bench.mp4\"\r\n"
+            "Content-Type: video/mp4\r\n\r\n"
+        ).encode("utf-8")
+        self.tail = f"\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.head) + self.size + len(self.tail)
+
+    async def __aiter__(self):
+        for piece in self.pieces():
+            self.sent += len(piece)
+            yield piece
+
+    def pieces(self):
+        yield self.head
+        remaining = self.size
+        while remaining:
+            chunk = min(remaining, MB)
+            yield bytes(chunk)
+            remaining -= chunk
+        yield self.tail
+
+
+async def main() -> int:
+    # Set up here rather than at import: process pool children re-import this module
+    tmp_dir = tempfile.mkdtemp(prefix="geoline-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+    os.environ["UPLOAD_DIR"] = f"{tmp_dir}/uploads"
+    os.environ["PUBLISH_DIR"] = f"{tmp_dir}/public"
+    os.environ["PUBLISH_ON_WRITE"] = "false"
+    os.environ["WARMUP_ON_STARTUP"] = "false"
+    os.environ["PROCESS_POOL_WORKERS"] = "0"
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    import httpx
+    from app.config import settings
+    from app.db_init import init_db
+    from app.main import app
+
+    init_db()
+    limit = settings.MAX_VIDEO_UPLOAD_SIZE
+    failures = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300) as client:
+        login = await client.post("/api/auth/login/json", json={
+            "username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD})
+        headers = {
+            "Authorization": "Bearer " + login.json()["access_token"],
+            "Content-Type": f"multipart/form-data; boundary={BOUNDARY}",
+        }
+
+        async def post(body: MultipartBody, content_length: bool):
+            request_headers = dict(headers)
+            if content_length:
+                request_headers["Content-Length"] = str(len(body))
+            start = time.perf_counter()
+            response = await client.post("/api/services", content=body, headers=request_headers)
+            return response, (time.perf_counter() - start) * 1000
+
+        body = MultipartBody(VIDEO_MB * MB)
+        tracemalloc.start()
+        response, elapsed = await post(body, content_length=True)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{VIDEO_MB} MB video:       {response.status_code}, {elapsed:8.1f} ms, "
+              f"peak allocated {peak / MB:.1f} MB (budget {MEMORY_BUDGET / MB:.0f} MB)")
+        if response.status_code != 201:
+            failures.append(f"video upload returned {response.status_code}: {response.text}")
+        if peak > MEMORY_BUDGET:
+            failures.append(f"video upload allocated {peak / MB:.1f} MB at peak")
+
+        oversized = limit * 2
+        for content_length in (True, False):
+            body = MultipartBody(oversized)
+            response, elapsed = await post(body, content_length)
+            label = "with Content-Length" if content_length else "chunked"
+            print(f"{oversized // MB} MB {label + ':':<21}{response.status_code}, {elapsed:8.1f} ms, "
+                  f"{body.sent / MB:.1f} MB read (limit {limit / MB:.0f} MB)")
+            if response.status_code != 413:
+                failures.append(f"oversized body {label} returned {response.status_code}")
+            # Content-Length is checked before reading; a chunked body may overrun by a chunk
+            allowed = 0 if content_length else limit + settings.MAX_UPLOAD_SIZE + 2 * MB
+            if body.sent > allowed:
+                failures.append(f"oversized body {label}: {body.sent} bytes read, expected at most {allowed}")
+
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    if not failures:
+        print("✓ Upload memory within budget and oversized bodies rejected early")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Check that concurrent workers can migrate the same database at startup.
+
+Starts several interpreters that call run_migrations() at the same moment,
+against a new database and against one from before schema_migrations
+existed, then starts the app with uvicorn --workers on a new database, where
+every worker migrates in its lifespan. Runs on a temporary SQLite file, and
+on PostgreSQL when CHECK_POSTGRES_URL is set (scratch databases are created
+through it and dropped afterwards).
+
+Exits with status 1 if any process or worker fails, or the schema isn't
+fully recorded.
+
+Usage: python benchmarks/check_migrations.py [processes]
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MIGRATE = "from app.migrations import run_migrations; run_migrations()"
+# Prints whether every migration is recorded in schema_migrations
+VERIFY = (
+    "from app.migrations import applied_versions, discover_migrations; from app.database import engine; "
+    "applied = applied_versions(engine); "
+    "print(all(migration.version in applied for migration in discover_migrations()))"
+)
+
+
+def run(code: str, database_url: str, count: int = 1) -> list:
+    """Run code in count interpreters at once; return (returncode, output) of each."""
+    env = {**os.environ, "DATABASE_URL": database_url}
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        for _ in range(count)
+    ]
+    return [(process.wait(), process.stdout.read()) for process in processes]
+
+
+def make_legacy(database_url: str) -> None:
+    """Migrate a database, then drop schema_migrations as if it predated it."""
+    run(MIGRATE, database_url)
+    run(
+        "from sqlalchemy import text; from app.database import engine\n"
+        "with engine.begin() as conn: conn.execute(text('DROP TABLE schema_migrations'))",
+        database_url
+    )
+
+
+def race(label: str, database_url: str) -> bool:
+    """Migrate database_url from PROCESSES interpreters at once."""
+    results = run(MIGRATE, database_url, PROCESSES)
+    failures = [output.strip().splitlines()[-1] for code, output in results if code != 0]
+    complete = run(VERIFY, database_url)[0][1].strip().endswith("True")
+    if failures or not complete:
+        print(f"  ✗ {label}: {len(failures)} of {PROCESSES} processes failed, schema recorded: {complete}")
+        for failure in failures:
+            print(f"      {failure}")
+        return False
+    print(f"  ✓ {label}: {PROCESSES} processes")
+    return True
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_workers(label: str, database_url: str, tmp_dir: str) -> bool:
+    """Start the app with PROCESSES uvicorn workers, each migrating database_url at startup."""
+    port = free_port()
+    env = {
+        **os.environ, "DATABASE_URL": database_url, "UPLOAD_DIR": f"{tmp_dir}/uploads",
+        "PUBLISH_DIR": f"{tmp_dir}/public", "WARMUP_ON_STARTUP": "false", "PROCESS_POOL_WORKERS": "0",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(PROCESSES)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    deadline = time.monotonic() + 60
+    started = 0
+    output = []
+    try:
+        # uvicorn restarts a worker whose startup failed, so watch the log rather than /health
+        while started < PROCESSES and time.monotonic() < deadline:
+            line = server.stdout.readline()
+            if not line:
+                break
+            output.append(line.rstrip())
+            started += "Application startup complete" in line
+        if started == PROCESSES:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=10) as response:
+                healthy = response.status == 200
+        else:
+            healthy = False
+    except OSError:
+        healthy = False
+    finally:
+        server.terminate()
+        server.wait()
+    failed = [line for line in output if "startup failed" in line or line.startswith("sqlalchemy.exc")]
+    complete = run(VERIFY, database_url)[0][1].strip().endswith("True")
+    if failed or not healthy or not complete:
+        print(f"  ✗ {label}: {started} of {PROCESSES} workers started, schema recorded: {complete}")
+        for line in failed:
+            print(f"      {line}")
+        return False
+    print(f"  ✓ {label}: {PROCESSES} workers")
+    return True
+
+
+def check_sqlite() -> bool:
+    tmp_dir = tempfile.mkdtemp(prefix="geoline-migrations-")
+    legacy = f"sqlite:///{tmp_dir}/legacy.db"
+    make_legacy(legacy)
+    print("SQLite:")
+    return (
+        race("new database", f"sqlite:///{tmp_dir}/new.db")
+        & race("before schema_migrations", legacy)
+        & start_workers("uvicorn --workers", f"sqlite:///{tmp_dir}/workers.db", tmp_dir)
+    )
+
+
+def check_postgres(server_url: str) -> bool:
+    sys.path.insert(0, str(BACKEND_DIR))
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+
+    admin = create_engine(server_url, isolation_level="AUTOCOMMIT")
+    names = ("geoline_migrations_new", "geoline_migrations_legacy", "geoline_migrations_workers")
+    try:
+        with admin.connect() as conn:
+            for name in names:
+                conn.execute(text(f"DROP DATABASE IF EXISTS {name}"))
+                conn.execute(text(f"CREATE DATABASE {name}"))
+        new, legacy, workers = (make_url(server_url).set(database=name).render_as_string(hide_password=False) for name in names)
+        make_legacy(legacy)
+        print("PostgreSQL (CHECK_POSTGRES_URL):")
+        return (
+            race("new database", new)
+            & race("before schema_migrations", legacy)
+            & start_workers("uvicorn --workers", workers, tempfile.mkdtemp(prefix="geoline-migrations-"))
+        )
+    finally:
+        with admin.connect() as conn:
+            for name in names:
+                conn.execute(text(f"DROP DATABASE IF EXISTS {name}"))
+        admin.dispose()
+
+
+def main() -> int:
+    ok = check_sqlite()
+    url = os.environ.get("CHECK_POSTGRES_URL")
+    if url:
+        ok &= check_postgres(url)
+    else:
+        print("PostgreSQL: skipped (set CHECK_POSTGRES_URL)")
+    print()
+    print("✓ Concurrent migrations succeeded" if ok else "✗ Concurrent migrations failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Check the query plans of every list and detail query the routers emit.
+
+Seeds a large database, requests each endpoint with the content cache
+cleared, captures every SELECT the request runs and prints its
+EXPLAIN QUERY PLAN. Exits with status 1 if a hot-path query (public
+filtered lists, detail pages, page bundles and the admin submissions inbox)
+scans a whole table or sorts through a temp B-tree, so an index that stops
+covering a query is caught before it reaches production.
+
+Admin lists without filters read whole tables by design; their plans are
+printed but don't fail the check.
+
+Usage: python benchmarks/check_query_plans.py [rows_per_table]
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+_tmp_dir = tempfile.mkdtemp(prefix="geoline-plans-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/plans.db"
+os.environ["UPLOAD_DIR"] = f"{_tmp_dir}/uploads"
+os.environ["PUBLISH_DIR"] = f"{_tmp_dir}/public"
+os.environ["PUBLISH_ON_WRITE"] = "false"
+os.environ["WARMUP_ON_STARTUP"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Boolean, Integer, event, insert
+from app.auth import create_access_token, get_password_hash
+from app.cache import content_cache
+from app.database import async_engine, engine, read_engine
+from app.main import app
+from app.models.about import AboutContent
+from app.models.blog import BlogPost
+from app.models.carousel import CarouselSlide
+from app.models.contact import ContactInfo, ContactSubmission
+from app.models.faq import FAQ
+from app.models.license import License
+from app.models.partner import Partner
+from app.models.portfolio import PortfolioProject, ProjectStatus
+from app.models.service import Service
+from app.models.statistic import Statistic
+from app.models.user import User
+from app.utils.pagination import encode_cursor
+
+CONTENT_MODELS = (
+    AboutContent, BlogPost, CarouselSlide, ContactInfo, ContactSubmission, FAQ,
+    License, Partner, PortfolioProject, Service, Statistic,
+)
+
+# (path, hot path?) - hot paths fail the check on a full scan or temp B-tree
+# Cursor of a row deep in the seeded tables
+DEEP_CURSOR = encode_cursor("2024-01-05 00:00:00.000000", 5_000)
+
+CASES = (
+    ("/api/carousel?active_only=true", True),
+    ("/api/services?active_only=true", True),
+    ("/api/portfolio?active_only=true", True),
+    ("/api/portfolio?active_only=true&status_filter=completed", True),
+    ("/api/blog?published_only=true", True),
+    (f"/api/blog?published_only=true&cursor={DEEP_CURSOR}", True),
+    ("/api/faqs?active_only=true", True),
+    ("/api/about?active_only=true", True),
+    ("/api/contact/info?active_only=true", True),
+    ("/api/statistics?active_only=true", True),
+    ("/api/partners?active_only=true", True),
+    ("/api/licenses?active_only=true", True),
+    ("/api/carousel/7", True),
+    ("/api/services/7", True),
+    ("/api/portfolio/7", True),
+    ("/api/blog/7", True),
+    ("/api/faqs/7", True),
+    ("/api/about/7", True),
+    ("/api/contact/info/7", True),
+    ("/api/statistics/7", True),
+    ("/api/partners/7", True),
+    ("/api/licenses/7", True),
+    ("/api/pages/home", True),
+    ("/api/pages/portfolio", True),
+    ("/api/pages/contact", True),
+    ("/api/pages/licenses", True),
+    ("/api/contact/submissions", True),
+    ("/api/contact/submissions?unread_only=true", True),
+    (f"/api/contact/submissions?cursor={DEEP_CURSOR}", True),
+    (f"/api/contact/submissions?unread_only=true&cursor={DEEP_CURSOR}", True),
+    ("/api/contact/submissions/7", True),
+    ("/api/auth/me", True),
+    ("/api/carousel", False),
+    ("/api/services", False),
+    ("/api/portfolio", False),
+    ("/api/blog", False),
+    ("/api/faqs", False),
+    ("/api/about", False),
+    ("/api/contact/info", False),
+    ("/api/statistics", False),
+    ("/api/partners", False),
+    ("/api/licenses", False),
+)
+
+# Small bookkeeping tables that are always read whole
+ALLOWED_SCANS = {"content_versions"}
+
+# "SCAN blog_posts" without an index; "SCAN t USING INDEX ..." walks an
+# index in order and stops at the LIMIT, so it passes
+FULL_SCAN = re.compile(r"^SCAN (\w+)\b(?! USING (?:COVERING )?INDEX| USING INTEGER PRIMARY KEY)")
+TEMP_BTREE = "USE TEMP B-TREE"
+
+captured: list = []
+
+
+def capture(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        captured.append((statement, parameters))
+
+
+def seed_value(column, i: int):
+    """Value for one column of seed row i, or None to leave the default."""
+    if column.name == "created_at":
+        return datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    if column.name == "is_read":
+        return i % 10 != 0
+    if isinstance(column.type, Boolean):
+        return i % 4 != 0
+    if column.name == "order":
+        return i % 100
+    if column.name == "status":
+        return list(ProjectStatus)[i % len(ProjectStatus)]
+    if column.nullable or column.primary_key:
+        return None
+    if isinstance(column.type, Integer):
+        return i
+    return f"{column.name} {i}"
+
+
+def seed() -> str:
+    """Fill every content table with ROWS rows and return an admin token."""
+    with engine.begin() as conn:
+        for model in CONTENT_MODELS:
+            rows = []
+            for i in range(ROWS):
+                row = {}
+                for column in model.__table__.columns:
+                    value = seed_value(column, i)
+                    if value is not None:
+                        row[column.key] = value
+                rows.append(row)
+            conn.execute(insert(model), rows)
+        conn.execute(insert(User), [{
+            "username": "plans",
+            "email": "plans@geoline.com",
+            "hashed_password": get_password_hash("plans"),
+            "is_active": True,
+            "is_superuser": True,
+        }])
+    return create_access_token({"sub": "plans"})
+
+
+def explain(statement: str, parameters) -> list:
+    """Return the EXPLAIN QUERY PLAN detail lines of a statement."""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def problems(plan: list) -> list:
+    """Plan lines that mean a full table scan or a temp B-tree sort."""
+    found = []
+    for line in plan:
+        match = FULL_SCAN.match(line)
+        if match and match.group(1) not in ALLOWED_SCANS:
+            found.append(line)
+        elif TEMP_BTREE in line:
+            found.append(line)
+    return found
+
+
+def main() -> int:
+    print(f"Seeding {ROWS} rows per table in {_tmp_dir}")
+    with TestClient(app) as client:
+        token = seed()
+        headers = {"Authorization": f"Bearer {token}"}
+        for target in {engine, async_engine.sync_engine, read_engine.sync_engine}:
+            event.listen(target, "before_cursor_execute", capture)
+
+        failures = 0
+        for path, hot in CASES:
+            content_cache.clear()
+            captured.clear()
+            response = client.get(path, headers=headers)
+            if response.status_code != 200:
+                print(f"FAIL {path}: HTTP {response.status_code}")
+                failures += 1
+                continue
+
+            print(f"\n{path}{'' if hot else ' (not hot path)'}")
+            for statement, parameters in captured:
+                plan = explain(statement, parameters)
+                bad = problems(plan)
+                verdict = "FAIL" if bad and hot else "warn" if bad else "ok"
+                failures += verdict == "FAIL"
+                print(f"  [{verdict}] {' '.join(statement.split())[:110]}")
+                for line in plan:
+                    print(f"         {line}")
+
+    print()
+    if failures:
+        print(f"{failures} hot-path queries with a full scan or temp B-tree")
+        return 1
+    print("All hot-path queries use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
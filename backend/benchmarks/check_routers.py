@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Exercise every router against SQLite and PostgreSQL.
+
+Each backend runs in its own interpreter (settings are read at import):
+a temporary SQLite file with each CACHE_BACKEND (memory, disk, fakeredis),
+then PostgreSQL - CHECK_POSTGRES_URL if set, otherwise a throwaway cluster
+started with initdb/pg_ctl from PATH on a free port. The sweep creates the schema through the migrations, then
+creates, reads (with conditional GET), updates and deletes through every
+content router, pages through the keyset endpoints and checks auth.
+
+Exits with status 1 if any backend fails; PostgreSQL is skipped with a
+note when neither a URL nor initdb is available, unless --postgres is given.
+
+Usage: python benchmarks/check_routers.py [--postgres]
+"""
+import io
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def check(database_url: str) -> None:
+    """Run the sweep in this process against database_url."""
+    tmp_dir = tempfile.mkdtemp(prefix="geoline-routers-")
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["UPLOAD_DIR"] = f"{tmp_dir}/uploads"
+    os.environ["PUBLISH_DIR"] = f"{tmp_dir}/public"
+    os.environ["WARMUP_ON_STARTUP"] = "false"
+    os.environ["CACHE_DISK_PATH"] = f"{tmp_dir}/content-cache.db"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from fastapi.testclient import TestClient
+    from PIL import Image
+    from app.db_init import init_db
+    from app.main import app
+    from app.config import settings
+
+    def image():
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 48), (200, 10, 10)).save(buffer, "PNG")
+        buffer.seek(0)
+        return ("image.png", buffer, "image/png")
+
+    with TestClient(app) as client:
+        init_db()
+        login = client.post(
+            "/api/auth/login/json",
+            json={"username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD}
+        )
+        assert login.status_code == 200, login.text
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        def crud(base, create, changes, public_list):
+            created = client.post(base, headers=headers, **create)
+            assert created.status_code == 201, (base, created.text)
+            url = f"{base}/{created.json()['id']}"
+            detail = client.get(url)
+            assert detail.status_code == 200, (url, detail.text)
+            if "etag" in detail.headers:
+                assert client.get(url, headers={"If-None-Match": detail.headers["etag"]}).status_code == 304
+            assert any(item["id"] == created.json()["id"] for item in client.get(public_list).json()), public_list
+            updated = client.put(url, json=changes, headers=headers)
+            assert updated.status_code == 200, (url, updated.text)
+            assert all(updated.json()[key] == value for key, value in changes.items()), updated.json()
+            assert client.delete(url, headers=headers).status_code == 204
+            assert client.get(url).status_code == 404
+            print(f"  ✓ {base}")
+
+        crud("/api/faqs", {"json": {"question": "Q", "answer": "A"}}, {"question": "Q2"}, "/api/faqs?active_only=true")
+        crud("/api/statistics", {"json": {"label": "L", "value": 1}}, {"label": "L2"}, "/api/statistics?active_only=true")
+        crud("/api/contact/info", {"json": {"type": "phone", "label": "Tel", "value": "1"}}, {"value": "2"},
+             "/api/contact/info?active_only=true")
+        crud("/api/blog", {"data": {"title": "B", "is_published": "true"}}, {"title": "B2"}, "/api/blog?published_only=true")
+        crud("/api/about", {"data": {"title": "A"}}, {"title": "A2"}, "/api/about?active_only=true")
+        crud("/api/services", {"data": {"title": "S"}, "files": {"image": image()}}, {"title": "S2"},
+             "/api/services?active_only=true")
+        crud("/api/carousel", {"data": {"title": "C"}, "files": {"image": image()}}, {"title": "C2"},
+             "/api/carousel?active_only=true")
+        crud("/api/partners", {"data": {"name": "P"}, "files": {"image": image()}}, {"name": "P2"},
+             "/api/partners?active_only=true")
+        crud("/api/licenses", {"data": {"title": "L"}, "files": {"image": image()}}, {"title": "L2"},
+             "/api/licenses?active_only=true")
+        crud("/api/portfolio", {"data": {"title": "P", "status": "completed"}, "files": {"image": image()}},
+             {"title": "P2"}, "/api/portfolio?active_only=true&status_filter=completed")
+
+        for i in range(7):
+            assert client.post("/api/contact/submit", json={"name": "N", "email": "n@geoline.com", "message": str(i)}).status_code == 201
+            client.post("/api/blog", data={"title": f"Post {i}", "is_published": "true"}, headers=headers)
+        for path, extra in (("/api/blog", {"published_only": "true"}), ("/api/contact/submissions", {})):
+            everything = [item["id"] for item in client.get(path, params=extra, headers=headers).json()]
+            paged, cursor = [], ""
+            while True:
+                page = client.get(path, params={**extra, "limit": 3, "cursor": cursor}, headers=headers).json()
+                paged += [item["id"] for item in page["items"]]
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+            assert paged == everything, (path, paged, everything)
+            print(f"  ✓ {path} keyset pages")
+
+        for page in ("home", "portfolio", "services", "contact", "licenses"):
+            assert client.get(f"/api/pages/{page}").status_code == 200, page
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        assert client.get("/api/contact/submissions").status_code == 401
+        assert client.get("/health").json()["status"] == "healthy"
+        print("  ✓ pages, auth and health")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_child(label: str, database_url: str, cache_backend: str = "memory") -> bool:
+    print(f"{label}:")
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", database_url],
+        cwd=BACKEND_DIR, env={**os.environ, "CACHE_BACKEND": cache_backend}
+    )
+    return result.returncode == 0
+
+
+def run_postgres() -> bool:
+    """Run the sweep against CHECK_POSTGRES_URL or a temporary local cluster."""
+    url = os.environ.get("CHECK_POSTGRES_URL")
+    if url:
+        return run_child("PostgreSQL (CHECK_POSTGRES_URL)", url)
+
+    data_dir = Path(tempfile.mkdtemp(prefix="geoline-pg-"))
+    port = free_port()
+    subprocess.run(
+        ["initdb", "-D", str(data_dir / "data"), "-U", "postgres", "-A", "trust", "-E", "UTF8", "--locale=C", "--no-sync"],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    subprocess.run(
+        ["pg_ctl", "-D", str(data_dir / "data"), "-l", str(data_dir / "server.log"), "-w",
+         "-o", f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1 -c fsync=off", "start"],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    try:
+        return run_child("PostgreSQL (temporary cluster)", f"postgresql+psycopg://postgres@127.0.0.1:{port}/postgres")
+    finally:
+        subprocess.run(["pg_ctl", "-D", str(data_dir / "data"), "-m", "fast", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main() -> int:
+    ok = True
+    for cache_backend in ("memory", "disk", "fakeredis"):
+        sqlite_dir = tempfile.mkdtemp(prefix="geoline-routers-")
+        ok = run_child(f"SQLite, {cache_backend} cache", f"sqlite:///{sqlite_dir}/cms.db", cache_backend) and ok
+
+    if os.environ.get("CHECK_POSTGRES_URL") or shutil.which("initdb"):
+        ok = run_postgres() and ok
+    elif "--postgres" in sys.argv:
+        print("✗ PostgreSQL: set CHECK_POSTGRES_URL or put initdb/pg_ctl on PATH")
+        ok = False
+    else:
+        print("PostgreSQL: skipped (set CHECK_POSTGRES_URL or put initdb/pg_ctl on PATH)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        check(sys.argv[2])
+    else:
+        sys.exit(main())
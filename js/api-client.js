@@ -4,10 +4,13 @@
  */
 
 const API_BASE_URL = 'http://localhost:8000';
+// Serve page bundles from files written by backend/app/publish.py instead of the API
+const USE_STATIC_CONTENT = false;
 
 class FrontendAPIClient {
     constructor() {
         this.baseURL = API_BASE_URL;
+        this.pageData = null;
     }
 
     /**
@@ -87,18 +90,95 @@ class FrontendAPIClient {
         return `${this.baseURL}/uploads/${imagePath}`;
     }
 
+    /**
+     * URL of an upload resized on demand by /media. Sizes and qualities must be
+     * among the backend's MEDIA_WIDTHS, MEDIA_HEIGHTS and MEDIA_QUALITIES.
+     */
+    getMediaUrl(imagePath, { w, h, fmt, q } = {}) {
+        if (!imagePath) return '';
+        if (imagePath.startsWith('http')) return imagePath;
+        const params = new URLSearchParams();
+        if (w) params.set('w', w);
+        if (h) params.set('h', h);
+        if (fmt) params.set('fmt', fmt);
+        if (q) params.set('q', q);
+        return `${this.baseURL}/media/${imagePath}?${params}`;
+    }
+
+    /**
+     * <source> elements for a <picture>, one per format in image_variants
+     * (most preferred first), so the browser downloads only the width it renders.
+     */
+    getPictureSources(imageVariants, sizes = '100vw') {
+        if (!imageVariants) return '';
+        return Object.entries(imageVariants).map(([format, variants]) => {
+            const srcset = variants.map(variant => `${this.getImageUrl(variant.path)} ${variant.width}w`).join(', ');
+            return `<source type="image/${format}" srcset="${srcset}" sizes="${sizes}">`;
+        }).join('');
+    }
+
+    /**
+     * Load every section of a page in one request.
+     * Section getters below are served from the bundle once it is loaded
+     * and fall back to their own endpoint otherwise.
+     */
+    async loadPage(page) {
+        let bundle = null;
+        if (USE_STATIC_CONTENT) {
+            bundle = await this.getStaticPage(page);
+        }
+        if (!bundle) {
+            bundle = await this.get(`/api/pages/${page}`);
+        }
+        // get() returns [] on failure
+        this.pageData = Array.isArray(bundle) ? null : bundle;
+    }
+
+    /**
+     * Load a published page bundle via the static manifest (null if unavailable)
+     */
+    async getStaticPage(page) {
+        try {
+            const manifestResponse = await fetch(`${this.baseURL}/static/manifest.json`, { cache: 'no-cache' });
+            if (!manifestResponse.ok) return null;
+            const manifest = await manifestResponse.json();
+            const path = manifest.pages && manifest.pages[page];
+            if (!path) return null;
+
+            // Versioned files never change, so the browser cache can keep them
+            const response = await fetch(`${this.baseURL}/static/${path}`);
+            return response.ok ? await response.json() : null;
+        } catch (error) {
+            console.error(`Static content error (${page}):`, error);
+            return null;
+        }
+    }
+
+    /**
+     * Get a section from the loaded page bundle (undefined if not bundled)
+     */
+    getPageSection(name) {
+        if (this.pageData && name in this.pageData) {
+            return this.pageData[name];
+        }
+        return undefined;
+    }
+
     // Carousel endpoints
     async getCarouselSlides() {
-        return await this.get('/api/carousel', { active_only: true });
+        return this.getPageSection('carousel') ?? await this.get('/api/carousel', { active_only: true });
     }
 
     // Services endpoints
     async getServices() {
-        return await this.get('/api/services', { active_only: true });
+        return this.getPageSection('services') ?? await this.get('/api/services', { active_only: true });
     }
 
     // Portfolio endpoints
     async getPortfolioProjects(statusFilter = null) {
+        if (!statusFilter && this.getPageSection('portfolio')) {
+            return this.getPageSection('portfolio');
+        }
         const params = { active_only: true };
         if (statusFilter) {
             params.status_filter = statusFilter;
@@ -108,23 +188,23 @@ class FrontendAPIClient {
 
     // Blog endpoints
     async getBlogPosts() {
-        return await this.get('/api/blog', { published_only: true });
+        return this.getPageSection('blog') ?? await this.get('/api/blog', { published_only: true });
     }
 
     // FAQ endpoints
     async getFAQs() {
-        return await this.get('/api/faqs', { active_only: true });
+        return this.getPageSection('faqs') ?? await this.get('/api/faqs', { active_only: true });
     }
 
     // About endpoints
     async getAboutContent() {
-        const content = await this.get('/api/about', { active_only: true });
+        const content = this.getPageSection('about') ?? await this.get('/api/about', { active_only: true });
         return content.length > 0 ? content[0] : null;
     }
 
     // Contact endpoints
     async getContactInfo() {
-        return await this.get('/api/contact/info', { active_only: true });
+        return this.getPageSection('contact_info') ?? await this.get('/api/contact/info', { active_only: true });
     }
 
     async submitContactForm(data) {
@@ -133,7 +213,7 @@ class FrontendAPIClient {
 
     // Statistics endpoints
     async getStatistics() {
-        return await this.get('/api/statistics', { active_only: true });
+        return this.getPageSection('statistics') ?? await this.get('/api/statistics', { active_only: true });
     }
 
     // Partners endpoints
@@ -143,7 +223,7 @@ class FrontendAPIClient {
 
     // Licenses endpoints
     async getLicenses() {
-        return await this.get('/api/licenses', { active_only: true });
+        return this.getPageSection('licenses') ?? await this.get('/api/licenses', { active_only: true });
     }
 }
 
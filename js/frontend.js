@@ -32,13 +32,13 @@ document.addEventListener('DOMContentLoaded', () => {
     if (currentPage === 'index.html' || currentPage === '') {
         loadHomePageContent();
     } else if (currentPage === 'portfolio.html') {
-        loadPortfolioContent();
+        frontendAPI.loadPage('portfolio').then(loadPortfolioContent);
     } else if (currentPage === 'service.html') {
-        loadServicesPageContent();
+        frontendAPI.loadPage('services').then(loadServicesPageContent);
     } else if (currentPage === 'contact.html') {
-        loadContactPageContent();
+        frontendAPI.loadPage('contact').then(loadContactPageContent);
     } else if (currentPage === 'team.html') {
-        loadLicensesContent();
+        frontendAPI.loadPage('licenses').then(loadLicensesContent);
     }
 });
 
@@ -47,6 +47,7 @@ document.addEventListener('DOMContentLoaded', () => {
  */
 async function loadHomePageContent() {
     try {
+        await frontendAPI.loadPage('home');
         await Promise.all([
             loadCarousel(),
             loadServices(),
@@ -95,7 +96,10 @@ async function loadCarousel() {
             const slideDiv = document.createElement('div');
             slideDiv.className = `carousel-item${index === 0 ? ' active' : ''}`;
             slideDiv.innerHTML = `
-                <img src="${imageUrl}" alt="${slide.title}">
+                <picture>
+                    ${frontendAPI.getPictureSources(slide.image_variants)}
+                    <img src="${imageUrl}" alt="${slide.title}">
+                </picture>
                 <div class="carousel-caption">
                     ${slide.subtitle ? `<p class="animated fadeInRight">${slide.subtitle}</p>` : ''}
                     <h1 class="animated fadeInLeft">${slide.title}</h1>
@@ -1315,7 +1319,10 @@ async function loadLicensesContent() {
             licenseDiv.innerHTML = `
                 <div class="team-item license-frame">
                     <div class="team-img">
-                        <img src="${imageUrl}" alt="${license.title}">
+                        <picture>
+                            ${frontendAPI.getPictureSources(license.image_variants, '(min-width: 768px) 50vw, 100vw')}
+                            <img src="${imageUrl}" alt="${license.title}">
+                        </picture>
                     </div>
                 </div>
             `;